@@ -0,0 +1,135 @@
+"""
+Benchmark del filtro ?category= del feed.
+Compara la consulta anterior (JOIN con Category + DISTINCT) con la ruta
+desnormalizada sobre core_postcat_feed_idx que usa PostListCreateView.
+
+Usa una base SQLite temporal; no toca data/db.sqlite3.
+
+Uso:
+    uv run python benchmark_category_filter.py --posts 1000000
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentimind.settings')
+
+PAGE_SIZE = 20
+BATCH = 20000
+
+
+def populate(n_posts, taxonomy, seed=42):
+    """Inserta n_posts con 1-3 categorias cada uno (distribucion sesgada)."""
+    from django.db import connection, transaction
+    from core.models import Post, Category, PostCategory
+
+    rng = random.Random(seed)
+    category_ids = {name: Category.objects.get_or_create(name=name)[0].id for name in taxonomy}
+    names = list(taxonomy)
+    # Categorias frecuentes y raras: la ultima aparece ~1% de las veces
+    weights = [1.0 / (i + 1) for i in range(len(names))]
+
+    post_sql = (
+        f'INSERT INTO {Post._meta.db_table} '
+        '(id, content, primary_category, primary_confidence, classification_status, created_at) '
+        'VALUES (%s, %s, %s, %s, %s, %s)'
+    )
+    pc_sql = (
+        f'INSERT INTO {PostCategory._meta.db_table} '
+        '(post_id, category_id, confidence, created_at) VALUES (%s, %s, %s, %s)'
+    )
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for offset in range(0, n_posts, BATCH):
+        posts, post_categories = [], []
+        for post_id in range(offset + 1, min(offset + BATCH, n_posts) + 1):
+            created_at = (start + timedelta(seconds=post_id * 30)).isoformat(sep=' ')
+            chosen = set(rng.choices(names, weights=weights, k=rng.randint(1, 3)))
+            primary = next(iter(chosen))
+            posts.append((post_id, f"post {post_id}", primary, 0.9, 'done', created_at))
+            for name in chosen:
+                post_categories.append((post_id, category_ids[name], 0.8, created_at))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(post_sql, posts)
+            cursor.executemany(pc_sql, post_categories)
+        print(f"  {min(offset + BATCH, n_posts):>9,} posts insertados", end='\r')
+    print()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def time_query(build, repeat):
+    """Mediana en ms de evaluar la pagina retornada por build()."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(build())
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def query_plan(queryset):
+    from django.db import connection
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del filtro por categoria del feed")
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='sentimind-bench-')
+    os.environ['SQLITE_PATH'] = os.path.join(tmp_dir, 'bench.sqlite3')
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from core.application.ai_service import MiningEngine
+    from core.models import Post
+    from core.infrastructure.views import filter_by_category
+
+    print(f"Base temporal: {os.environ['SQLITE_PATH']}")
+    call_command('migrate', verbosity=0)
+    print(f"Generando {args.posts:,} posts...")
+    populate(args.posts, MiningEngine.TAXONOMY)
+
+    print("=" * 80)
+    print(f"{'Categoria':14s} {'JOIN+DISTINCT (ms)':>20s} {'Indice desnorm. (ms)':>22s} {'Mejora':>8s}")
+    print("=" * 80)
+
+    base = Post.objects.all()
+    for category in MiningEngine.TAXONOMY:
+        def old():
+            return (base.filter(categories__name=category).distinct()
+                    .order_by('-created_at', '-id').values_list('id', flat=True)[:PAGE_SIZE])
+
+        def new():
+            return (filter_by_category(base, category)
+                    .order_by('-category_created_at', '-category_post_id')
+                    .values_list('id', flat=True)[:PAGE_SIZE])
+
+        old_ms = time_query(old, args.repeat)
+        new_ms = time_query(new, args.repeat)
+        print(f"{category:14s} {old_ms:20.2f} {new_ms:22.2f} {old_ms / max(new_ms, 1e-6):7.1f}x")
+
+    category = MiningEngine.TAXONOMY[-1]
+    print("\nPlan JOIN+DISTINCT:")
+    for step in query_plan(base.filter(categories__name=category).distinct().order_by('-created_at', '-id')[:PAGE_SIZE]):
+        print(f"   {step}")
+    print("Plan indice desnormalizado:")
+    for step in query_plan(filter_by_category(base, category).order_by('-category_created_at', '-category_post_id')[:PAGE_SIZE]):
+        print(f"   {step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmark de inferencia de MiningEngine.
+Mide arranque en frio, latencia p50/p95/p99, textos/segundo y memoria
+(RSS antes y despues, y pico de cada configuracion) variando longitud de
+texto, tamaño de batch e hilos de torch.
+
+El pico de RSS de cada configuracion se mide reiniciando el pico del
+proceso (VmHWM, /proc/self/clear_refs) antes de ejecutarla; donde el
+sistema no lo permite (fuera de Linux) se reporta como null: ru_maxrss es
+el maximo de todo el proceso y repetiria el de la configuracion mas grande.
+
+Uso:
+    uv run python benchmark_inference.py
+    uv run python benchmark_inference.py --batch-sizes 1,8 --threads 1,4 --lengths short,long
+    uv run python benchmark_inference.py --baseline benchmark_results/baseline.json
+
+Con --baseline, termina con codigo 1 si alguna configuracion empeora mas
+que --tolerance respecto a la linea base (regresion).
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import resource
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentimind.settings')
+
+import django
+django.setup()
+
+from evaluate_model import EVALUATION_DATASET
+
+
+ENGINES = {
+    'nli': 'core.application.ai_service.MiningEngine',
+    'embedding': 'core.application.embedding_engine.EmbeddingEngine',
+    'cascade': 'core.application.cascade_engine.CascadeEngine',
+}
+
+# Frases de relleno para los textos sinteticos largos
+FILLER = [
+    "Hoy fue un dia largo en el trabajo y todavia tengo muchas cosas pendientes.",
+    "Mis amigos dicen que deberia tomarme las cosas con mas calma.",
+    "No se si reir o llorar con todo lo que ha pasado esta semana.",
+    "Al final del dia lo importante es la familia y la salud.",
+]
+
+
+def load_engine(name):
+    module_path, class_name = ENGINES[name].rsplit('.', 1)
+    module = __import__(module_path, fromlist=[class_name])
+    return getattr(module, class_name)
+
+
+def build_texts(length):
+    """Textos del dataset de evaluacion, alargados segun length."""
+    base = [text for text, _ in EVALUATION_DATASET]
+    if length == 'short':
+        return base
+    repeats = {'medium': 2, 'long': 8}[length]
+    return [
+        " ".join([text] + [FILLER[(i + j) % len(FILLER)] for j in range(repeats)])
+        for i, text in enumerate(base)
+    ]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def current_rss_mb():
+    """RSS actual del proceso (Linux: /proc/self/statm); None si no se puede leer."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * resource.getpagesize() / (1024 * 1024)
+
+
+def reset_peak_rss() -> bool:
+    """Reinicia el pico de RSS del proceso (VmHWM); False si el sistema no lo permite."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_mb():
+    """Pico de RSS desde el ultimo reset_peak_rss() (VmHWM de /proc/self/status)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _round_mb(value):
+    return round(value, 1) if value is not None else None
+
+
+def measure_cold_start(engine):
+    """Carga del modelo + primera inferencia, en el proceso actual."""
+    engine.unload()
+    started = time.perf_counter()
+    engine.get_classifier()
+    load_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    engine.analyze_batch([engine.WARMUP_TEXT])
+    first_inference_seconds = time.perf_counter() - started
+    return {
+        'load_seconds': round(load_seconds, 3),
+        'first_inference_seconds': round(first_inference_seconds, 3),
+        # Precision efectiva (spec del registro o fallback), no la de INFERENCE_PRECISION
+        'precision': engine.readiness()['precision'],
+    }
+
+
+def run_config(engine, texts, batch_size, iterations):
+    """Latencias por texto (ms), throughput y memoria para un tamaño de batch."""
+    peak_available = reset_peak_rss()
+    rss_before = current_rss_mb()
+    per_text_ms = []
+    total_texts = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            t0 = time.perf_counter()
+            if batch_size == 1:
+                engine.analyze(batch[0])
+            else:
+                engine.analyze_batch(batch)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            per_text_ms.extend([elapsed_ms / len(batch)] * len(batch))
+            total_texts += len(batch)
+    wall = time.perf_counter() - started
+
+    per_text_ms.sort()
+    return {
+        'texts': total_texts,
+        'p50_ms': round(percentile(per_text_ms, 50), 2),
+        'p95_ms': round(percentile(per_text_ms, 95), 2),
+        'p99_ms': round(percentile(per_text_ms, 99), 2),
+        'texts_per_second': round(total_texts / wall, 3) if wall else 0.0,
+        'rss_before_mb': _round_mb(rss_before),
+        'rss_after_mb': _round_mb(current_rss_mb()),
+        'peak_rss_mb': _round_mb(peak_rss_mb()) if peak_available else None,
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Lista de regresiones (p95 o throughput peor que baseline +/- tolerance)."""
+    previous = {run['key']: run for run in baseline.get('runs', [])}
+    regressions = []
+    for run in results['runs']:
+        old = previous.get(run['key'])
+        if old is None:
+            continue
+        if run['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{run['key']}: p95 {old['p95_ms']}ms -> {run['p95_ms']}ms")
+        if run['texts_per_second'] < old['texts_per_second'] * (1 - tolerance):
+            regressions.append(
+                f"{run['key']}: throughput {old['texts_per_second']} -> {run['texts_per_second']} textos/s"
+            )
+    return regressions
+
+
+def _format_mb(value):
+    return f"{value:.0f}" if value is not None else "n/d"
+
+
+def csv_list(value, cast=str):
+    return [cast(v.strip()) for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inferencia de MiningEngine")
+    parser.add_argument('--engines', default='nli', help="Motores: nli,embedding,cascade")
+    parser.add_argument('--lengths', default='short,medium,long', help="Longitudes: short,medium,long")
+    parser.add_argument('--batch-sizes', default='1,4,8', help="Tamaños de batch")
+    parser.add_argument('--threads', default='', help="Hilos de torch (por defecto, los de torch)")
+    parser.add_argument('--iterations', type=int, default=1, help="Pasadas por configuracion")
+    parser.add_argument('--output', default='benchmark_results/inference.json')
+    parser.add_argument('--baseline', help="JSON de una ejecucion anterior para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Margen de regresion (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    import torch
+
+    thread_counts = csv_list(args.threads, int) or [torch.get_num_threads()]
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'cpu_count': os.cpu_count(),
+            'machine': platform.machine(),
+        },
+        'cold_start': {},
+        'runs': [],
+    }
+
+    print("=" * 80)
+    print("BENCHMARK DE INFERENCIA")
+    print("=" * 80)
+
+    for engine_name in csv_list(args.engines):
+        engine = load_engine(engine_name)
+        cold = measure_cold_start(engine)
+        results['cold_start'][engine_name] = cold
+        print(f"\n[{engine_name}:{cold['precision']}] arranque en frio: carga {cold['load_seconds']:.1f}s, "
+              f"primera inferencia {cold['first_inference_seconds']:.2f}s")
+
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            for length in csv_list(args.lengths):
+                texts = build_texts(length)
+                for batch_size in csv_list(args.batch_sizes, int):
+                    stats = run_config(engine, texts, batch_size, args.iterations)
+                    key = f"{engine_name}/{length}/b{batch_size}/t{threads}"
+                    results['runs'].append({
+                        'key': key, 'engine': engine_name, 'length': length,
+                        'batch_size': batch_size, 'threads': threads, **stats
+                    })
+                    print(f"  {key:32s} p50={stats['p50_ms']:8.1f}ms  p95={stats['p95_ms']:8.1f}ms  "
+                          f"p99={stats['p99_ms']:8.1f}ms  {stats['texts_per_second']:7.2f} textos/s  "
+                          f"rss={_format_mb(stats['rss_before_mb'])}->{_format_mb(stats['rss_after_mb'])}MB "
+                          f"pico={_format_mb(stats['peak_rss_mb'])}MB")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados guardados: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESIONES respecto a {args.baseline}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print(f"\nSin regresiones respecto a {args.baseline} (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
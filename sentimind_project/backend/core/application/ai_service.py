@@ -3,7 +3,48 @@ Motor de Minería de Texto basado en Transformers.
 Usa el modelo XLM-RoBERTa cargado localmente.
 """
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import gc
+import hashlib
+import inspect
+import json
+import logging
 import os
+import random
+import re
+import threading
+import time
+
+from core.application import model_artifacts
+from core.application.metrics import record_stage, timed
+
+
+logger = logging.getLogger(__name__)
+
+# Fin de oracion (. ! ? …) seguido de espacio, o salto de linea
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+|\s*\n+\s*')
+
+
+class LoadedModel:
+    """
+    Un modelo zero-shot del registro ya cargado: pipeline, precision efectiva
+    y etiquetas que recibe el modelo (en el orden de TAXONOMY).
+
+    analyze_batch toma una referencia al modelo activo al empezar, asi que un
+    cambio de modelo no afecta a las peticiones que ya estan en curso.
+    """
+
+    def __init__(self, name: str, model_name: str, pipeline, precision: str, method: str,
+                 hypothesis_template: str, labels: list, taxonomy: list):
+        self.name = name
+        self.model_name = model_name
+        self.pipeline = pipeline
+        self.precision = precision
+        self.method = method
+        self.hypothesis_template = hypothesis_template
+        self.labels = labels
+        self.to_taxonomy = dict(zip(labels, taxonomy))
+        self.artifact = None
+        self.stats = None
 
 
 class MiningEngine:
@@ -38,52 +79,286 @@ class MiningEngine:
     
     # Máximo de emociones a retornar
     MAX_EMOTIONS = 3
+    
+    # Pares premisa/hipotesis procesados por cada forward del modelo
+    PAIRS_PER_FORWARD = 48
+
+    # Textos largos: se parten por oraciones en fragmentos de hasta
+    # MAX_TOKENS_PER_CHUNK tokens y se clasifican como mucho
+    # MAX_CHUNKS_PER_TEXT fragmentos por texto. Los scores de los fragmentos
+    # se combinan con CHUNK_AGGREGATION: mean (promedio ponderado por
+    # longitud) o max (la emocion mas fuerte en cualquier fragmento).
+    MAX_TOKENS_PER_CHUNK = int(os.environ.get("MAX_TOKENS_PER_CHUNK", "256"))
+    MAX_CHUNKS_PER_TEXT = int(os.environ.get("MAX_CHUNKS_PER_TEXT", "4"))
+    CHUNK_AGGREGATION = os.environ.get("CHUNK_AGGREGATION", "mean").lower()
+    
+    # Modelo principal y modelo de respaldo
+    MODEL_NAME = "joeddav/xlm-roberta-large-xnli"
+    FALLBACK_MODEL_NAME = "facebook/bart-large-mnli"
+
+    # Precision de inferencia en CPU: fp32 | int8 | onnx (env INFERENCE_PRECISION)
+    PRECISIONS = ("fp32", "int8", "onnx")
+    PRECISION = os.environ.get("INFERENCE_PRECISION", "fp32").lower()
+
+    # Texto usado por warmup() para la inferencia de prueba
+    WARMUP_TEXT = "Hoy es un buen día para probar el modelo"
+
+    # Fraccion de textos analizados que se registran en el log DEBUG
+    LOG_TEXT_SAMPLE_RATE = float(os.environ.get("LOG_TEXT_SAMPLE_RATE", "0.01"))
 
     _classifier = None
+    _model_name = None
+    _precision = None
+    _method = None
+    _active = None
+    _load_lock = threading.Lock()
+    _ready = False
+    _warmup_seconds = None
+    _warmup_error = None
 
     @classmethod
     def get_classifier(cls):
         if cls._classifier is None:
-            print("[AI] Cargando modelo neuronal multilingue XLM-RoBERTa... (esto pasa solo una vez)")
-            
-            # Modelo multilingüe potente
-            model_name = "joeddav/xlm-roberta-large-xnli"
-            
+            # Lock: el warm-up en segundo plano y la primera peticion no deben
+            # cargar el modelo dos veces
+            with cls._load_lock:
+                if cls._classifier is None:
+                    cls._load_classifier()
+        return cls._classifier
+
+    @classmethod
+    def _load_classifier(cls):
+        # El modelo inicial y sus respaldos salen del registro (MODEL_REGISTRY_FILE)
+        from core.application.model_registry import ModelRegistry
+        cls._install(ModelRegistry.get_instance().load_initial())
+
+    @classmethod
+    def default_registry(cls) -> dict:
+        """Registro usado sin MODEL_REGISTRY_FILE: XLM-RoBERTa con BART como respaldo."""
+        return {
+            "xlm-roberta": {
+                "model": cls.MODEL_NAME,
+                "method": "xlm-roberta-local",
+                "load": "eager",
+                "fallback": "bart-large-mnli",
+            },
+            "bart-large-mnli": {
+                "model": cls.FALLBACK_MODEL_NAME,
+                "method": "bart-large-mnli-local",
+                "use_fast": True,
+                "load": "lazy",
+            },
+        }
+
+    @classmethod
+    def load_model(cls, name: str, spec: dict) -> LoadedModel:
+        """
+        Carga el modelo `name` del registro segun su spec (ver
+        core.application.model_registry). No lo activa.
+
+        Si hay un artefacto local (bundle_model) se carga desde el, sin red;
+        con MODEL_OFFLINE es obligatorio.
+        """
+        model_name = spec["model"]
+        source, local_only, manifest = model_artifacts.resolve(name, model_name)
+        # XLM-RoBERTa usa el tokenizer de sentencepiece (use_fast=False); el
+        # artefacto trae el tokenizer rapido ya convertido
+        use_fast = manifest["tokenizer"] == "fast" if manifest else spec.get("use_fast", False)
+        logger.info("Cargando tokenizer para %s desde %s", model_name, source)
+        tokenizer = AutoTokenizer.from_pretrained(source, use_fast=use_fast, local_files_only=local_only)
+
+        logger.info("Cargando modelo %s (%s)", model_name, spec.get("precision") or cls.PRECISION)
+        classifier, precision = cls._build_pipeline(
+            source, tokenizer, spec.get("precision") or cls.PRECISION, local_files_only=local_only
+        )
+        label_map = spec.get("labels", {})
+        model = LoadedModel(
+            name=name,
+            model_name=model_name,
+            pipeline=classifier,
+            precision=precision,
+            method=f"{spec.get('method', name)}:{precision}",
+            hypothesis_template=spec.get("hypothesis_template", cls.HYPOTHESIS_TEMPLATE),
+            labels=[label_map.get(label, label) for label in cls.TAXONOMY],
+            taxonomy=cls.TAXONOMY,
+        )
+        model.artifact = os.path.basename(source) if manifest else None
+        logger.info("Modelo %s cargado (precision: %s)", model_name, precision,
+                    extra={"model_method": model.method})
+        return model
+
+    @classmethod
+    def swap(cls, model: LoadedModel):
+        """Activa un modelo ya cargado; las peticiones en curso terminan con el anterior."""
+        with cls._load_lock:
+            cls._install(model)
+        cls._ready = True
+
+    @classmethod
+    def _install(cls, model: LoadedModel):
+        cls._classifier = model.pipeline
+        cls._model_name = model.model_name
+        cls._precision = model.precision
+        cls._method = model.method
+        # Ultima asignacion: analyze_batch solo lee _active
+        cls._active = model
+
+    @classmethod
+    def _build_pipeline(cls, model_name: str, tokenizer, precision: str, local_files_only: bool = False) -> tuple:
+        """
+        Construye el pipeline zero-shot con la precision pedida y retorna
+        (pipeline, precision efectiva):
+        - fp32: modelo original en CPU.
+        - int8: cuantizacion dinamica int8 de las capas Linear (torch).
+        - onnx: exportacion a ONNX Runtime via optimum; si no esta instalado,
+          se usa int8.
+        """
+        if precision not in cls.PRECISIONS:
+            logger.warning("Precision '%s' no soportada, usando fp32", precision)
+            precision = "fp32"
+        
+        if precision == "onnx":
             try:
-                # Cargar tokenizer con sentencepiece (use_fast=False)
-                print(f"[AI] Cargando tokenizer para {model_name}...")
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_name, 
-                    use_fast=False,
-                    local_files_only=False
-                )
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                from optimum.pipelines import pipeline as ort_pipeline
                 
-                print(f"[AI] Cargando modelo {model_name}...")
-                cls._classifier = pipeline(
+                model = ORTModelForSequenceClassification.from_pretrained(
+                    model_name, export=True, local_files_only=local_files_only
+                )
+                return _instrument_pipeline(ort_pipeline(
                     "zero-shot-classification",
-                    model=model_name,
+                    model=model,
                     tokenizer=tokenizer,
-                    device=-1  # CPU
-                )
-                print(f"[OK] Modelo {model_name} cargado exitosamente!")
-                
-            except Exception as e:
-                print(f"[WARN] Error cargando XLM-RoBERTa: {e}")
-                print("[AI] Intentando con modelo BART (fallback)...")
-                
-                try:
-                    model_name = "facebook/bart-large-mnli"
-                    cls._classifier = pipeline(
-                        "zero-shot-classification",
-                        model=model_name,
-                        device=-1
-                    )
-                    print(f"[OK] Modelo fallback {model_name} cargado!")
-                except Exception as e2:
-                    print(f"[ERROR] Error tambien con fallback: {e2}")
-                    raise RuntimeError(f"No se pudo cargar ningún modelo: {e}, {e2}")
-                
-        return cls._classifier
+                    accelerator="ort"
+                )), "onnx"
+            except ImportError:
+                logger.warning("optimum[onnxruntime] no esta instalado, usando int8")
+                precision = "int8"
+        
+        model = AutoModelForSequenceClassification.from_pretrained(model_name, local_files_only=local_files_only)
+        model.eval()
+        
+        if precision == "int8":
+            import torch
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        
+        return _instrument_pipeline(pipeline(
+            "zero-shot-classification",
+            model=model,
+            tokenizer=tokenizer,
+            device=-1  # CPU
+        )), precision
+
+    @classmethod
+    def unload(cls):
+        """Descarga el modelo (para recargarlo con otra configuracion)."""
+        with cls._load_lock:
+            cls._classifier = None
+            cls._model_name = None
+            cls._precision = None
+            cls._method = None
+            cls._active = None
+            cls._ready = False
+        from core.application.model_registry import ModelRegistry
+        ModelRegistry.discard(cls)
+        gc.collect()
+
+    @classmethod
+    def warmup(cls, standby: bool = True):
+        """
+        Carga el modelo y ejecuta una inferencia de prueba para inicializar
+        los kernels perezosos. Al terminar, is_ready() retorna True.
+
+        standby=False no carga los modelos eager del registro: en los workers
+        de gunicorn con preload_app ya los cargo el master (preload) y
+        cargarlos aqui crearia una copia privada por worker.
+        """
+        started = time.monotonic()
+        try:
+            cls.get_classifier()
+            cls.analyze_batch([cls.WARMUP_TEXT])
+        except Exception as e:
+            cls._warmup_error = str(e)
+            logger.exception("Fallo el warm-up del modelo: %s", e)
+            raise
+        cls._warmup_error = None
+        cls._warmup_seconds = time.monotonic() - started
+        cls._ready = True
+        logger.info("Modelo listo para inferencia (%.1fs de warm-up)", cls._warmup_seconds,
+                    extra={"model_method": cls._method})
+        if standby and cls._active is not None:
+            # Modelos "eager" del registro: en memoria para cambiar sin arranque en frio
+            from core.application.model_registry import ModelRegistry
+            ModelRegistry.get_instance().load_standby()
+
+    @classmethod
+    def preload(cls):
+        """
+        Carga el modelo sin ejecutar inferencia, para el master de gunicorn
+        (preload_app). Los workers heredan los pesos por fork y, como nunca
+        se escriben, las paginas quedan compartidas (copy-on-write) entre
+        todos ellos. La inferencia de prueba se hace en cada worker tras el
+        fork (warmup), porque el pool de OpenMP de torch no sobrevive al fork.
+
+        Los modelos eager del registro tambien se cargan aqui, por la misma
+        razon: cargados tras el fork serian una copia por worker.
+        """
+        pipelines = [cls.get_classifier()]
+        if cls._active is not None:
+            from core.application.model_registry import ModelRegistry
+            registry = ModelRegistry.get_instance()
+            registry.preload_standby()
+            pipelines = [model.pipeline for model in registry.loaded_models()]
+        for classifier in pipelines:
+            model = classifier.model
+            # Los modelos de ONNX Runtime no son nn.Module (sus pesos viven en la sesion ORT)
+            if hasattr(model, 'parameters'):
+                model.eval()
+                for param in model.parameters():
+                    param.requires_grad_(False)
+        logger.info("Modelo %s precargado en el proceso master", cls._model_name)
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """True cuando el modelo esta cargado y ya ejecuto una inferencia."""
+        return cls._ready
+
+    @classmethod
+    def readiness(cls) -> dict:
+        """Estado del warm-up para el endpoint de readiness."""
+        return {
+            "ready": cls._ready,
+            "model": cls._model_name,
+            "precision": cls._precision,
+            "warmup_seconds": round(cls._warmup_seconds, 2) if cls._warmup_seconds is not None else None,
+            "error": cls._warmup_error,
+        }
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        """
+        Huella de la configuracion que determina el resultado de analyze().
+        Cambia si cambian el modelo, TAXONOMY, HYPOTHESIS_TEMPLATE, los umbrales
+        o la fragmentacion de textos largos.
+        """
+        model = cls._active
+        config = {
+            "model": cls._model_name or cls.MODEL_NAME,
+            "precision": cls._precision or cls.PRECISION,
+            "taxonomy": cls.TAXONOMY,
+            "hypothesis_template": model.hypothesis_template if model else cls.HYPOTHESIS_TEMPLATE,
+            "relative_threshold": cls.RELATIVE_THRESHOLD,
+            "max_emotions": cls.MAX_EMOTIONS,
+            "max_tokens_per_chunk": cls.MAX_TOKENS_PER_CHUNK,
+            "max_chunks_per_text": cls.MAX_CHUNKS_PER_TEXT,
+            "chunk_aggregation": cls.CHUNK_AGGREGATION,
+        }
+        if model is not None and model.labels != cls.TAXONOMY:
+            config["labels"] = model.labels
+        payload = json.dumps(config, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
     @classmethod
     def analyze(cls, text: str) -> dict:
@@ -98,18 +373,185 @@ class MiningEngine:
                 "all_scores": {...}
             }
         """
-        print(f"[AI] Analizando: '{text[:50]}...'")
+        return cls.analyze_batch([text])[0]
+
+    @classmethod
+    def analyze_batch(cls, texts: list) -> list:
+        """
+        Analiza varios textos en una sola llamada al pipeline.
+        
+        Los pares premisa/hipotesis de todos los textos se agrupan en
+        forwards de hasta PAIRS_PER_FORWARD pares, en lugar de uno por par.
+        Los textos largos se parten en fragmentos (ver split_texts) y los
+        fragmentos se ordenan por longitud, para que cada forward agrupe
+        pares de tamaño parecido y se desperdicie menos padding.
+        
+        Returns:
+            list: un dict por texto, en el mismo orden y con el mismo
+            formato que analyze().
+        """
+        if not texts:
+            return []
         
-        classifier = cls.get_classifier()
+        cls.get_classifier()
+        results = cls.analyze_with(cls._active, texts)
+        cls._ready = True
+        return results
+
+    @classmethod
+    def analyze_with(cls, model: LoadedModel, texts: list) -> list:
+        """analyze_batch() con un modelo concreto del registro (activo o candidato)."""
+        started = time.perf_counter()
+        chunks, owners, weights = cls.split_texts(texts, model.pipeline.tokenizer)
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
         
         # Inferencia con multi_label=True para detectar múltiples emociones
-        result = classifier(
-            text, 
-            cls.TAXONOMY, 
-            hypothesis_template=cls.HYPOTHESIS_TEMPLATE,
-            multi_label=True
+        outputs = model.pipeline(
+            [chunks[i] for i in order],
+            model.labels,
+            hypothesis_template=model.hypothesis_template,
+            multi_label=True,
+            batch_size=min(cls.PAIRS_PER_FORWARD, len(chunks) * len(cls.TAXONOMY))
         )
+        # El pipeline retorna un dict (no una lista) cuando recibe un solo texto
+        if isinstance(outputs, dict):
+            outputs = [outputs]
         
+        with timed('result_build'):
+            chunk_scores = [None] * len(chunks)
+            for i, output in zip(order, outputs):
+                # Etiquetas del modelo -> etiquetas de TAXONOMY
+                labels = (model.to_taxonomy.get(label, label) for label in output['labels'])
+                chunk_scores[i] = dict(zip(labels, output['scores']))
+            results = [
+                cls._build_result(ranked, model.method)
+                for ranked in cls.merge_chunk_scores(len(texts), chunk_scores, owners, weights)
+            ]
+        elapsed = time.perf_counter() - started
+        if model.stats is not None:
+            model.stats.observe(elapsed, len(texts))
+        cls._log_results(texts, results, elapsed)
+        return results
+
+    @classmethod
+    def split_texts(cls, texts: list, tokenizer) -> tuple:
+        """
+        Parte cada texto en fragmentos de hasta MAX_TOKENS_PER_CHUNK tokens.
+
+        Returns:
+            tuple: (chunks, owners, weights); owners[i] es el indice del
+            texto al que pertenece chunks[i] y weights[i] su longitud en
+            caracteres.
+        """
+        chunks, owners, weights = [], [], []
+        for index, text in enumerate(texts):
+            for chunk in cls._chunk_text(text, tokenizer):
+                chunks.append(chunk)
+                owners.append(index)
+                weights.append(max(len(chunk), 1))
+        return chunks, owners, weights
+
+    @classmethod
+    def _chunk_text(cls, text: str, tokenizer) -> list:
+        """
+        Agrupa las oraciones de text en fragmentos dentro del presupuesto de
+        tokens. Una oracion mas larga que el presupuesto se corta por tokens.
+        Si salen mas de MAX_CHUNKS_PER_TEXT fragmentos se conservan
+        MAX_CHUNKS_PER_TEXT repartidos a lo largo del texto (incluidos el
+        primero y el ultimo), asi el coste por texto queda acotado.
+        """
+        budget = cls.MAX_TOKENS_PER_CHUNK
+        # Cada token ocupa al menos un caracter: un texto corto cabe seguro
+        if len(text) <= budget:
+            return [text]
+
+        sentences = [s for s in _SENTENCE_BOUNDARY.split(text) if s.strip()]
+        if not sentences:
+            return [text]
+        token_ids = tokenizer(sentences, add_special_tokens=False)['input_ids']
+        if sum(len(ids) for ids in token_ids) <= budget:
+            return [text]
+
+        chunks, current, current_tokens = [], [], 0
+        for sentence, ids in zip(sentences, token_ids):
+            if current and current_tokens + len(ids) > budget:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            if len(ids) > budget:
+                chunks.extend(
+                    tokenizer.decode(ids[start:start + budget])
+                    for start in range(0, len(ids), budget)
+                )
+                continue
+            current.append(sentence)
+            current_tokens += len(ids)
+        if current:
+            chunks.append(" ".join(current))
+
+        limit = max(cls.MAX_CHUNKS_PER_TEXT, 1)
+        if len(chunks) > limit:
+            if limit == 1:
+                return chunks[:1]
+            step = (len(chunks) - 1) / (limit - 1)
+            chunks = [chunks[round(i * step)] for i in range(limit)]
+        return chunks
+
+    @classmethod
+    def merge_chunk_scores(cls, count: int, chunk_scores: list, owners: list, weights: list) -> list:
+        """
+        Combina los scores {etiqueta: score} de los fragmentos de cada texto
+        segun CHUNK_AGGREGATION.
+
+        Returns:
+            list: count dicts {"labels": [...], "scores": [...]} ordenados por
+            score descendente, el formato que espera _build_result().
+        """
+        merged = [{} for _ in range(count)]
+        totals = [0] * count
+        for scores, owner, weight in zip(chunk_scores, owners, weights):
+            target = merged[owner]
+            if cls.CHUNK_AGGREGATION == "max":
+                for label, score in scores.items():
+                    target[label] = max(target.get(label, 0.0), score)
+            else:
+                totals[owner] += weight
+                for label, score in scores.items():
+                    target[label] = target.get(label, 0.0) + score * weight
+
+        ranked_results = []
+        for scores, total in zip(merged, totals):
+            if total:
+                scores = {label: value / total for label, value in scores.items()}
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            ranked_results.append({
+                "labels": [label for label, _ in ranked],
+                "scores": [score for _, score in ranked],
+            })
+        return ranked_results
+
+    @classmethod
+    def _log_results(cls, texts: list, results: list, elapsed: float):
+        """
+        Registra en DEBUG una muestra (LOG_TEXT_SAMPLE_RATE) de los textos
+        analizados, en lugar de una linea por texto.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        latency_ms = round(elapsed * 1000 / len(texts), 1)
+        for text, result in zip(texts, results):
+            if random.random() < cls.LOG_TEXT_SAMPLE_RATE:
+                logger.debug("Texto analizado", extra={
+                    "text_preview": text[:50],
+                    "main_sentiment": result["main_sentiment"],
+                    "confidence": result["confidence_score"],
+                    "model_method": result["method"],
+                    "latency_ms": latency_ms,
+                    "batch_size": len(texts),
+                })
+
+    @classmethod
+    def _build_result(cls, result: dict, method: str = None) -> dict:
+        """Convierte la salida cruda del pipeline al formato de analyze()."""
         # Crear diccionario de scores
         all_scores = dict(zip(result['labels'], result['scores']))
         
@@ -133,13 +575,54 @@ class MiningEngine:
                 "confidence": round(result['scores'][0], 2)
             }]
         
-        print(f"[OK] Resultado: {detected_categories[0]['name']} ({detected_categories[0]['confidence']})")
-        
         return {
             "emotions": detected_categories,
             "main_sentiment": result['labels'][0],
             "confidence_score": round(result['scores'][0], 2),
             "all_scores": {k: round(v, 2) for k, v in all_scores.items()},
-            "method": "xlm-roberta-local"
+            "method": method or cls._method or f"xlm-roberta-local:{cls.PRECISION}"
         }
 
+
+def _instrument_pipeline(classifier):
+    """
+    Envuelve las etapas del pipeline de transformers para medir por separado
+    tokenizacion (preprocess), forward del modelo (_forward) y post-proceso.
+    El pipeline llama a estos metodos a traves de self, asi que basta con
+    reemplazarlos en la instancia.
+    """
+    preprocess, forward, postprocess = classifier.preprocess, classifier._forward, classifier.postprocess
+
+    def timed_preprocess(*args, **kwargs):
+        started = time.perf_counter()
+        result = preprocess(*args, **kwargs)
+        if not inspect.isgenerator(result):
+            record_stage('tokenization', time.perf_counter() - started)
+            return result
+        # Zero-shot es un ChunkPipeline: preprocess genera un par por etiqueta
+        return _timed_generator(result, 'tokenization')
+
+    def timed_forward(*args, **kwargs):
+        with timed('forward'):
+            return forward(*args, **kwargs)
+
+    def timed_postprocess(*args, **kwargs):
+        with timed('postprocess'):
+            return postprocess(*args, **kwargs)
+
+    classifier.preprocess = timed_preprocess
+    classifier._forward = timed_forward
+    classifier.postprocess = timed_postprocess
+    return classifier
+
+
+def _timed_generator(generator, stage: str):
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(generator)
+        except StopIteration:
+            return
+        finally:
+            record_stage(stage, time.perf_counter() - started)
+        yield item
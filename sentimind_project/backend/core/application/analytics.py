@@ -0,0 +1,167 @@
+"""
+Analitica de emociones sobre tablas de agregados (rollups).
+
+Cada escritura de PostCategory suma su conteo y su confianza en
+EmotionRollup (por hora y por dia, UTC) y en AuthorEmotionRollup, dentro de
+la misma transaccion. Los dashboards leen solo esas tablas: el coste de una
+consulta depende del rango pedido y del numero de categorias, no del total
+de posts.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connections, router
+from django.db.models import Sum
+
+from core.models import EmotionRollup, AuthorEmotionRollup
+
+
+GRANULARITIES = {
+    EmotionRollup.GRANULARITY_HOUR: timedelta(hours=1),
+    EmotionRollup.GRANULARITY_DAY: timedelta(days=1),
+}
+
+# Maximo de franjas por consulta de distribucion (31 dias por hora, 1 año por dia)
+MAX_BUCKETS = 744
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    """Inicio (UTC) de la franja hour/day que contiene moment."""
+    moment = moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if granularity == EmotionRollup.GRANULARITY_DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def record_post_categories(post_categories, sign: int = 1):
+    """
+    Suma (sign=1) o resta (sign=-1) filas de PostCategory en los rollups.
+
+    Cada fila necesita post.author_id, category_id, created_at y confidence.
+    Los deltas se agrupan en memoria y se aplican con un upsert por tabla
+    (INSERT ... ON CONFLICT DO UPDATE), asi que un batch de N posts cuesta
+    dos sentencias y no N por categoria.
+    """
+    bucket_deltas = {}
+    author_deltas = {}
+    for pc in post_categories:
+        for granularity in GRANULARITIES:
+            key = (granularity, truncate(pc.created_at, granularity), pc.category_id)
+            _add(bucket_deltas, key, sign, pc.confidence)
+        if pc.post.author_id is not None:
+            _add(author_deltas, (pc.post.author_id, pc.category_id), sign, pc.confidence)
+
+    if bucket_deltas:
+        _upsert(EmotionRollup, ['granularity', 'bucket', 'category'], bucket_deltas)
+    if author_deltas:
+        _upsert(AuthorEmotionRollup, ['author', 'category'], author_deltas)
+
+
+def _add(deltas: dict, key: tuple, sign: int, confidence: float):
+    count, confidence_sum = deltas.get(key, (0, 0.0))
+    deltas[key] = (count + sign, confidence_sum + sign * confidence)
+
+
+def _upsert(model, key_fields: list, deltas: dict):
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    key_columns = [qn(model._meta.get_field(name).column) for name in key_fields]
+    columns = key_columns + [qn('count'), qn('confidence_sum')]
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET "
+        f"{qn('count')} = {table}.{qn('count')} + excluded.{qn('count')}, "
+        f"{qn('confidence_sum')} = {table}.{qn('confidence_sum')} + excluded.{qn('confidence_sum')}"
+    )
+    params = [
+        [connection.ops.adapt_datetimefield_value(value) if isinstance(value, datetime) else value
+         for value in key] + [count, confidence_sum]
+        for key, (count, confidence_sum) in deltas.items()
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def emotion_distribution(granularity: str, since: datetime, until: datetime, category: str = None) -> list:
+    """
+    Distribucion de emociones por franja en [since, until):
+
+        [{"bucket": "2026-01-05T14:00:00Z", "total": 12,
+          "categories": {"Alegría": {"count": 7, "avg_confidence": 0.81}, ...}}, ...]
+
+    Solo aparecen las franjas con posts.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity debe ser una de: {', '.join(GRANULARITIES)}")
+    since, until = truncate(since, granularity), until.astimezone(dt_timezone.utc)
+    if since >= until:
+        raise ValueError("since debe ser anterior a until")
+    if (until - since) / GRANULARITIES[granularity] > MAX_BUCKETS:
+        raise ValueError(f"El rango no puede superar {MAX_BUCKETS} franjas de {granularity}")
+
+    rows = EmotionRollup.objects.filter(
+        granularity=granularity, bucket__gte=since, bucket__lt=until, count__gt=0
+    )
+    if category:
+        rows = rows.filter(category__name=category)
+
+    buckets = {}
+    for bucket, name, count, confidence_sum in rows.order_by('bucket').values_list(
+        'bucket', 'category__name', 'count', 'confidence_sum'
+    ):
+        entry = buckets.setdefault(bucket, {"bucket": _isoformat(bucket), "total": 0, "categories": {}})
+        entry["total"] += count
+        entry["categories"][name] = {"count": count, "avg_confidence": round(confidence_sum / count, 4)}
+    return list(buckets.values())
+
+
+def top_categories(days: int = 7, limit: int = 5, now: datetime = None) -> list:
+    """Categorias con mas posts en los ultimos `days` dias (UTC, incluido hoy)."""
+    today = truncate(now or datetime.now(dt_timezone.utc), EmotionRollup.GRANULARITY_DAY)
+    since = today - timedelta(days=days - 1)
+    rows = (
+        EmotionRollup.objects
+        .filter(granularity=EmotionRollup.GRANULARITY_DAY, bucket__gte=since)
+        .values('category__name')
+        .annotate(total=Sum('count'), confidence=Sum('confidence_sum'))
+        .filter(total__gt=0)
+        .order_by('-total', 'category__name')[:limit]
+    )
+    return [
+        {
+            "category": row['category__name'],
+            "count": row['total'],
+            "avg_confidence": round(row['confidence'] / row['total'], 4),
+        }
+        for row in rows
+    ]
+
+
+def author_profile(author_id: int) -> dict:
+    """Perfil emocional de un autor: conteo, proporcion y confianza media por categoria."""
+    rows = list(
+        AuthorEmotionRollup.objects
+        .filter(author_id=author_id, count__gt=0)
+        .order_by('-count', 'category__name')
+        .values_list('category__name', 'count', 'confidence_sum')
+    )
+    total = sum(count for _, count, _ in rows)
+    return {
+        "author": author_id,
+        "total": total,
+        "categories": [
+            {
+                "category": name,
+                "count": count,
+                "share": round(count / total, 4),
+                "avg_confidence": round(confidence_sum / count, 4),
+            }
+            for name, count, confidence_sum in rows
+        ],
+    }
+
+
+def _isoformat(moment: datetime) -> str:
+    return moment.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
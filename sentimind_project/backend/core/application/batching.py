@@ -0,0 +1,192 @@
+"""
+Planificador de micro-batching para la inferencia.
+Agrupa las peticiones concurrentes de analisis en un solo forward batched.
+"""
+import logging
+import queue
+import threading
+import time
+
+from core.application.ai_service import MiningEngine
+from core.application.metrics import add_timings, current_timings, end_request, start_request
+
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """
+    Peticion de analisis en espera de su resultado. timings es el dict de
+    etapas de la peticion HTTP que la encolo: el batch se ejecuta en el hilo
+    del batcher, fuera de su contexto, y le devuelve ahi sus tiempos.
+    """
+
+    __slots__ = ('text', 'timings', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.timings = current_timings()
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class InferenceBatcher:
+    """
+    Agrupa llamadas concurrentes a MiningEngine.analyze en micro-batches.
+
+    Cada hilo que llama a analyze() encola su texto y espera. Un hilo de
+    fondo toma el primer texto de la cola, sigue recogiendo textos durante
+    max_wait_ms (o hasta max_batch_size) y ejecuta una sola llamada a
+    analyze_batch; luego entrega a cada llamador su propio resultado.
+
+    Patrón Singleton por proceso (ver get_instance).
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, engine=MiningEngine, max_batch_size: int = 8, max_wait_ms: float = 25):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        # Contadores (protegidos por _stats_lock)
+        self._stats_lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        """Retorna el batcher del proceso, configurado desde settings."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from django.conf import settings
+                    from core.application.engines import get_engine
+                    cls._instance = cls(
+                        engine=get_engine(),
+                        max_batch_size=getattr(settings, 'INFERENCE_BATCH_MAX_SIZE', 8),
+                        max_wait_ms=getattr(settings, 'INFERENCE_BATCH_MAX_WAIT_MS', 25),
+                    )
+        return cls._instance
+
+    def analyze(self, text: str, timeout: float = None) -> dict:
+        """
+        Encola el texto y bloquea hasta que su batch haya sido procesado.
+
+        Returns:
+            dict: el mismo formato que MiningEngine.analyze().
+        """
+        self._ensure_worker()
+        request = _PendingRequest(text)
+
+        with self._stats_lock:
+            self._submitted += 1
+        self._queue.put(request)
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+        if not request.done.wait(timeout):
+            raise TimeoutError(f"La inferencia no termino en {timeout}s")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self) -> dict:
+        """Contadores de throughput y profundidad de cola."""
+        with self._stats_lock:
+            uptime = time.monotonic() - self._started_at
+            processed = self._completed + self._failed
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "batches": self._batches,
+                "avg_batch_size": round(processed / self._batches, 2) if self._batches else 0.0,
+                "avg_queue_wait_ms": round(self._wait_seconds / processed * 1000, 2) if processed else 0.0,
+                "texts_per_second": round(self._completed / uptime, 3) if uptime else 0.0,
+                "busy_texts_per_second": round(self._completed / self._busy_seconds, 3) if self._busy_seconds else 0.0,
+                "uptime_seconds": round(uptime, 1),
+            }
+
+    def _ensure_worker(self):
+        # El hilo se arranca en la primera peticion y no al construir la
+        # instancia, para no heredar hilos a traves de un fork de gunicorn.
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='inference-batcher', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch: list):
+        started = time.monotonic()
+        with self._stats_lock:
+            self._in_flight = len(batch)
+            self._wait_seconds += sum(started - r.enqueued_at for r in batch)
+
+        # Las etapas del batch (tokenize, forward...) se miden aparte y se
+        # atribuyen completas a cada peticion que lo espero
+        token = start_request()
+        try:
+            results = self.engine.analyze_batch([r.text for r in batch])
+            error = None
+        except Exception as e:
+            logger.exception("Fallo el batch de %d textos", len(batch))
+            results = [None] * len(batch)
+            error = e
+        finally:
+            batch_timings = end_request(token)
+
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            self._in_flight = 0
+            self._batches += 1
+            self._busy_seconds += elapsed
+            if error is None:
+                self._completed += len(batch)
+            else:
+                self._failed += len(batch)
+
+        for request, result in zip(batch, results):
+            if request.timings is not None:
+                add_timings(request.timings, batch_timings)
+            request.result = result
+            request.error = error
+            request.done.set()
@@ -0,0 +1,157 @@
+"""
+Clasificacion en cascada: primero el lexico, el modelo solo para los dudosos.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from core.application.ai_service import MiningEngine
+from core.application.lexicon import LexiconScorer
+from core.application.metrics import timed
+
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeEngine(MiningEngine):
+    """
+    Dos niveles:
+    1. LexiconScorer responde si el score de su etiqueta principal supera el
+       umbral de esa etiqueta (CASCADE_THRESHOLDS_FILE, generado con
+       tune_cascade.py, o CASCADE_THRESHOLD para todas).
+    2. El resto de los textos del batch se escala al motor de
+       CASCADE_ESCALATION (nli o embedding) en una sola llamada batched.
+
+    Cada resultado lleva "tier": "lexicon" o "model", ademas del formato de
+    MiningEngine.analyze(). La carga, el warm-up y la readiness son los del
+    motor de escalado.
+    """
+
+    ESCALATION = os.environ.get("CASCADE_ESCALATION", "nli").lower()
+    # 0.5 = una sola coincidencia sin senales de otras etiquetas (ver LexiconScorer)
+    THRESHOLD = float(os.environ.get("CASCADE_THRESHOLD", "0.5"))
+    THRESHOLDS_FILE = os.environ.get("CASCADE_THRESHOLDS_FILE", "")
+
+    TIER_LEXICON = "lexicon"
+    TIER_MODEL = "model"
+
+    _thresholds = None
+    _counts_lock = threading.Lock()
+    _counts = {TIER_LEXICON: 0, TIER_MODEL: 0}
+
+    @classmethod
+    def escalation_engine(cls):
+        if cls.ESCALATION == "embedding":
+            from core.application.embedding_engine import EmbeddingEngine
+            return EmbeddingEngine
+        return MiningEngine
+
+    @classmethod
+    def thresholds(cls) -> dict:
+        """{"default": umbral, "labels": {etiqueta: umbral}}"""
+        if cls._thresholds is None:
+            thresholds = {"default": cls.THRESHOLD, "labels": {}}
+            if cls.THRESHOLDS_FILE:
+                with open(cls.THRESHOLDS_FILE, encoding='utf-8') as f:
+                    tuned = json.load(f)
+                thresholds["default"] = tuned.get("default", cls.THRESHOLD)
+                thresholds["labels"] = tuned.get("labels", {})
+            cls._thresholds = thresholds
+        return cls._thresholds
+
+    @classmethod
+    def threshold_for(cls, label: str) -> float:
+        thresholds = cls.thresholds()
+        return thresholds["labels"].get(label, thresholds["default"])
+
+    @classmethod
+    def analyze_batch(cls, texts: list) -> list:
+        """
+        Analiza varios textos; solo los que el lexico no resuelve pasan por el modelo.
+
+        Returns:
+            list: un dict por texto con el formato de analyze() mas "tier".
+        """
+        if not texts:
+            return []
+
+        started = time.perf_counter()
+        results = [None] * len(texts)
+        escalated = []
+        with timed('lexicon'):
+            for index, text in enumerate(texts):
+                ranked = LexiconScorer.score(text)
+                if ranked["scores"][0] > 0 and ranked["scores"][0] >= cls.threshold_for(ranked["labels"][0]):
+                    results[index] = {**cls._build_result(ranked, LexiconScorer.METHOD), "tier": cls.TIER_LEXICON}
+                else:
+                    escalated.append(index)
+        answered = len(texts) - len(escalated)
+        if answered:
+            cls._log_results(
+                [text for text, result in zip(texts, results) if result is not None],
+                [result for result in results if result is not None],
+                time.perf_counter() - started
+            )
+
+        if escalated:
+            analyses = cls.escalation_engine().analyze_batch([texts[i] for i in escalated])
+            for index, analysis in zip(escalated, analyses):
+                results[index] = {**analysis, "tier": cls.TIER_MODEL}
+
+        with cls._counts_lock:
+            cls._counts[cls.TIER_LEXICON] += answered
+            cls._counts[cls.TIER_MODEL] += len(escalated)
+        return results
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Textos resueltos por cada nivel en este worker."""
+        with cls._counts_lock:
+            lexicon, model = cls._counts[cls.TIER_LEXICON], cls._counts[cls.TIER_MODEL]
+        total = lexicon + model
+        return {
+            "escalation": cls.ESCALATION,
+            "lexicon_texts": lexicon,
+            "model_texts": model,
+            "lexicon_share": round(lexicon / total, 4) if total else 0.0,
+        }
+
+    # Carga y estado: los del motor de escalado
+
+    @classmethod
+    def get_classifier(cls):
+        return cls.escalation_engine().get_classifier()
+
+    @classmethod
+    def unload(cls):
+        cls.escalation_engine().unload()
+
+    @classmethod
+    def warmup(cls, standby: bool = True):
+        cls.escalation_engine().warmup(standby)
+
+    @classmethod
+    def preload(cls):
+        cls.escalation_engine().preload()
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls.escalation_engine().is_ready()
+
+    @classmethod
+    def readiness(cls) -> dict:
+        return cls.escalation_engine().readiness()
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        # Los umbrales y el lexico deciden que nivel responde
+        config = {
+            "escalation": cls.escalation_engine().fingerprint(),
+            "lexicon": LexiconScorer.VERSION,
+            "thresholds": cls.thresholds(),
+        }
+        payload = json.dumps(config, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,71 @@
+"""
+Punto de entrada de la clasificacion para la capa de infraestructura.
+Decide, segun settings, con que motor y como se ejecuta la inferencia.
+"""
+from django.conf import settings
+
+from core.application.batching import InferenceBatcher
+from core.application.classification_cache import ClassificationCache
+from core.application.engines import get_engine
+from core.application import request_context
+from core.application.metrics import timed
+from core.application.model_registry import ModelRegistry
+
+
+@timed('classification')
+def classify(text: str) -> dict:
+    """
+    Clasifica un texto. Consulta primero la cache de clasificacion (si esta
+    activa) y usa el micro-batching si INFERENCE_BATCHING esta activo.
+    """
+    _sync_model()
+    cache = ClassificationCache.get_instance()
+    if cache is None:
+        result = _analyze(text)
+    else:
+        result = cache.get_or_compute_many([text], lambda texts: [_analyze(texts[0])])[0]
+    request_context.annotate(model_method=result.get('method'))
+    return result
+
+
+@timed('classification')
+def classify_many(texts: list) -> list:
+    """Clasifica una lista de textos en una sola llamada batched."""
+    _sync_model()
+    cache = ClassificationCache.get_instance()
+    engine = get_engine()
+    if cache is None:
+        results = engine.analyze_batch(texts)
+    else:
+        results = cache.get_or_compute_many(texts, engine.analyze_batch)
+    if results:
+        request_context.annotate(model_method=results[0].get('method'))
+    return results
+
+
+def _sync_model():
+    # Cambio de modelo pedido con activate_model (solo MiningEngine usa el registro)
+    if getattr(settings, 'SCORING_MODE', 'nli') in ('nli', 'cascade'):
+        ModelRegistry.get_instance().sync()
+
+
+def _analyze(text: str) -> dict:
+    if getattr(settings, 'INFERENCE_BATCHING', False):
+        return InferenceBatcher.get_instance().analyze(text)
+    return get_engine().analyze(text)
+
+
+def inference_stats() -> dict:
+    """Estadisticas de inferencia del proceso actual."""
+    if InferenceBatcher._instance is None:
+        batching = {"enabled": getattr(settings, 'INFERENCE_BATCHING', False)}
+    else:
+        batching = {"enabled": True, **InferenceBatcher._instance.stats()}
+
+    cache = ClassificationCache.get_instance()
+    cache_stats = {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+
+    stats = {"batching": batching, "cache": cache_stats}
+    if getattr(settings, 'SCORING_MODE', 'nli') == 'cascade':
+        stats["cascade"] = get_engine().stats()
+    return stats
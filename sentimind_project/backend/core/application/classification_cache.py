@@ -0,0 +1,180 @@
+"""
+Cache de resultados de clasificacion por contenido.
+Evita repetir la inferencia para textos ya clasificados (reposts, spam, seeds).
+"""
+import copy
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from core.application.ai_service import MiningEngine
+from core.application.db_writer import serialized_write
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza Unicode (NFC) y espacios. No cambia mayusculas: el modelo es cased."""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class ClassificationCache:
+    """
+    Cache de dos niveles delante de MiningEngine.
+
+    - Nivel 1: LRU en memoria del proceso, acotado a max_entries.
+    - Nivel 2 (opcional): tabla ClassificationCacheEntry en la base de datos,
+      compartida por todos los workers de gunicorn.
+
+    La clave incluye la huella del motor (MiningEngine.fingerprint()), asi
+    que cualquier cambio de modelo, TAXONOMY, HYPOTHESIS_TEMPLATE o umbrales
+    invalida las entradas anteriores automaticamente.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 2048, persistent: bool = False, engine=MiningEngine):
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self.engine = engine
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def get_instance(cls):
+        """Retorna la cache del proceso, o None si esta desactivada en settings."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from django.conf import settings
+                    from core.application.engines import get_engine
+                    max_entries = getattr(settings, 'CLASSIFICATION_CACHE_SIZE', 0)
+                    persistent = getattr(settings, 'CLASSIFICATION_CACHE_PERSISTENT', False)
+                    if max_entries <= 0 and not persistent:
+                        return None
+                    cls._instance = cls(
+                        max_entries=max_entries, persistent=persistent, engine=get_engine()
+                    )
+        return cls._instance
+
+    def make_key(self, text: str) -> str:
+        payload = f"{self.engine.fingerprint()}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: list) -> list:
+        """Retorna un resultado (o None si no esta en cache) por texto."""
+        keys = [self.make_key(text) for text in texts]
+        results = [None] * len(texts)
+        missing = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[i] = self._entries[key]
+                    self._hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing and self.persistent:
+            from core.models import ClassificationCacheEntry
+            rows = ClassificationCacheEntry.objects.filter(key__in=list(missing)).values_list('key', 'result')
+            for key, result in rows:
+                for i in missing.pop(key):
+                    results[i] = result
+                    with self._lock:
+                        self._persistent_hits += 1
+                self._remember(key, result)
+
+        with self._lock:
+            self._misses += sum(len(positions) for positions in missing.values())
+
+        return [copy.deepcopy(result) if result is not None else None for result in results]
+
+    def set_many(self, texts: list, results: list):
+        """Guarda los resultados en ambos niveles."""
+        entries = {self.make_key(text): result for text, result in zip(texts, results)}
+        for key, result in entries.items():
+            self._remember(key, copy.deepcopy(result))
+
+        if self.persistent:
+            _persist(entries, self.engine.fingerprint())
+
+    def get_or_compute_many(self, texts: list, compute) -> list:
+        """
+        Resuelve los textos desde la cache y llama a compute(lista) solo con
+        los que faltan (una vez por texto distinto).
+        """
+        results = self.get_many(texts)
+        pending = {}
+        for i, (text, result) in enumerate(zip(texts, results)):
+            if result is None:
+                pending.setdefault(normalize_text(text), []).append(i)
+
+        if pending:
+            missing_texts = [texts[positions[0]] for positions in pending.values()]
+            computed = compute(missing_texts)
+            self.set_many(missing_texts, computed)
+            for positions, result in zip(pending.values(), computed):
+                for i in positions:
+                    results[i] = copy.deepcopy(result)
+
+        return results
+
+    def purge_stale(self, keep: list = None) -> int:
+        """
+        Borra del nivel persistente las entradas de huellas anteriores.
+        keep: huellas a conservar; por defecto la huella actual del motor.
+        """
+        from core.models import ClassificationCacheEntry
+        deleted, _ = ClassificationCacheEntry.objects.exclude(
+            fingerprint__in=keep or [self.engine.fingerprint()]
+        ).delete()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._persistent_hits + self._misses
+            return {
+                "max_entries": self.max_entries,
+                "persistent": self.persistent,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "persistent_hits": self._persistent_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round((self._hits + self._persistent_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, result: dict):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+@serialized_write
+def _persist(entries: dict, fingerprint: str):
+    from core.models import ClassificationCacheEntry
+    ClassificationCacheEntry.objects.bulk_create(
+        [ClassificationCacheEntry(key=key, fingerprint=fingerprint, result=result)
+         for key, result in entries.items()],
+        ignore_conflicts=True
+    )
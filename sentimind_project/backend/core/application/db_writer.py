@@ -0,0 +1,121 @@
+"""
+Escritor unico de base de datos por worker (DB_WRITE_QUEUE).
+
+SQLite admite un solo escritor a la vez: con varios hilos por worker, cada
+escritura compite por el lock y los perdedores esperan dentro de
+busy_timeout. Con la cola, los hilos de peticion entregan sus escrituras a
+un hilo dedicado que las ejecuta en orden con su propia conexion; el hilo
+de peticion solo espera el resultado. La inferencia ya ocurre antes de
+escribir (fuera de cualquier transaccion), asi que nunca corre con el lock
+tomado.
+
+Las lecturas no pasan por la cola: en WAL escalan con los workers.
+"""
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from core.application.metrics import record_stage
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWriter:
+    """
+    Hilo escritor de este proceso y su cola de escrituras pendientes.
+
+    Patrón Singleton por proceso (ver get_instance). El hilo arranca con la
+    primera escritura, despues del fork de gunicorn.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.writes = 0
+        self.errors = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Escrituras ejecutadas y pendientes en este worker (vacio si la cola no se uso)."""
+        writer = cls._instance
+        if writer is None:
+            return {}
+        return {"pending": writer._queue.qsize(), "writes": writer.writes, "errors": writer.errors}
+
+    def in_writer(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, func, *args, **kwargs):
+        """Ejecuta func(*args, **kwargs) en el hilo escritor y retorna su resultado (o relanza su error)."""
+        self._ensure_thread()
+        future = concurrent.futures.Future()
+        # El contexto de la peticion (request id, Server-Timing) viaja con la escritura
+        self._queue.put((future, contextvars.copy_context(), time.perf_counter(), func, args, kwargs))
+        return future.result()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            # Un fork despues de arrancar el hilo deja al hijo sin el: se arranca otro
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            future, context, queued_at, func, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            context.run(record_stage, 'db_write_wait', time.perf_counter() - queued_at)
+            try:
+                result = context.run(func, *args, **kwargs)
+            except BaseException as e:
+                self.errors += 1
+                # Conexion en estado desconocido: la siguiente escritura abre otra
+                connection.close()
+                future.set_exception(e)
+            else:
+                self.writes += 1
+                future.set_result(result)
+
+
+def serialized_write(func):
+    """
+    Ejecuta la funcion de escritura en el hilo escritor cuando DB_WRITE_QUEUE
+    esta activo. Dentro de una transaccion abierta (o ya en el hilo escritor)
+    se ejecuta en el mismo hilo: otra conexion no veria sus cambios.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not getattr(settings, 'DB_WRITE_QUEUE', False) or connection.in_atomic_block:
+            return func(*args, **kwargs)
+        writer = DatabaseWriter.get_instance()
+        if writer.in_writer():
+            return func(*args, **kwargs)
+        return writer.submit(func, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,147 @@
+"""
+Motor de clasificacion por embeddings (bi-encoder).
+Alternativa de un solo paso a la clasificacion zero-shot NLI de MiningEngine.
+"""
+from transformers import AutoTokenizer, AutoModel
+import logging
+import os
+import time
+
+from core.application import model_artifacts
+from core.application.ai_service import MiningEngine
+from core.application.metrics import timed
+
+
+logger = logging.getLogger(__name__)
+
+
+class _EmbeddingScorer:
+    """Tokenizer + encoder con pooling promedio y normalizacion L2."""
+
+    MAX_LENGTH = 256
+
+    def __init__(self, tokenizer, model):
+        self.tokenizer = tokenizer
+        self.model = model
+
+    def encode(self, texts: list):
+        import torch
+
+        with timed('tokenization'):
+            inputs = self.tokenizer(
+                list(texts), padding=True, truncation=True,
+                max_length=self.MAX_LENGTH, return_tensors='pt'
+            )
+        with timed('forward'), torch.inference_mode():
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            return torch.nn.functional.normalize(pooled, p=2, dim=1)
+
+
+class EmbeddingEngine(MiningEngine):
+    """
+    Clasificacion de un solo paso con un bi-encoder multilingue.
+
+    MiningEngine ejecuta un par premisa/hipotesis por etiqueta (12 pasadas
+    del cross-encoder por texto). Aqui las 12 hipotesis "Este texto expresa {}"
+    se codifican una sola vez al cargar el modelo; cada texto se codifica una
+    vez y se compara por similitud coseno contra todas las etiquetas.
+
+    Mantiene el formato de salida de MiningEngine.analyze()
+    (emotions, main_sentiment, confidence_score, all_scores, method).
+    """
+
+    MODEL_NAME = os.environ.get(
+        "EMBEDDING_MODEL_NAME",
+        "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    )
+
+    # Nombre del artefacto local (bundle_model embedding)
+    ARTIFACT_NAME = "embedding"
+
+    # Temperatura del softmax sobre las similitudes coseno: mas baja, mas
+    # separacion entre la etiqueta principal y las secundarias
+    TEMPERATURE = float(os.environ.get("EMBEDDING_TEMPERATURE", "0.05"))
+
+    _classifier = None
+    _model_name = None
+    _precision = None
+    _method = None
+    _active = None
+    _label_embeddings = None
+    _ready = False
+    _warmup_seconds = None
+    _warmup_error = None
+
+    @classmethod
+    def _load_classifier(cls):
+        model_name = cls.MODEL_NAME
+        source, local_only, _ = model_artifacts.resolve(cls.ARTIFACT_NAME, model_name)
+        logger.info("Cargando modelo de embeddings %s desde %s (esto pasa solo una vez)", model_name, source)
+
+        tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=local_only)
+        model = AutoModel.from_pretrained(source, local_files_only=local_only)
+        model.eval()
+
+        precision = cls.PRECISION if cls.PRECISION in ("fp32", "int8") else "int8"
+        if precision == "int8":
+            import torch
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        scorer = _EmbeddingScorer(tokenizer, model)
+
+        # Hipotesis precalculadas: una sola codificacion por etiqueta
+        hypotheses = [cls.HYPOTHESIS_TEMPLATE.format(label) for label in cls.TAXONOMY]
+        cls._label_embeddings = scorer.encode(hypotheses)
+
+        cls._classifier = scorer
+        cls._model_name = model_name
+        cls._precision = precision
+        cls._method = f"embedding-local:{precision}"
+        logger.info("Modelo %s cargado con %d hipotesis precalculadas", model_name, len(hypotheses),
+                    extra={"model_method": cls._method})
+
+    @classmethod
+    def unload(cls):
+        super().unload()
+        cls._label_embeddings = None
+
+    @classmethod
+    def analyze_batch(cls, texts: list) -> list:
+        """
+        Analiza varios textos con una sola codificacion por texto.
+
+        Returns:
+            list: un dict por texto, con el mismo formato que MiningEngine.analyze().
+        """
+        if not texts:
+            return []
+
+        started = time.perf_counter()
+        scorer = cls.get_classifier()
+        chunks, owners, weights = cls.split_texts(texts, scorer.tokenizer)
+        # Ordenados por longitud: menos padding dentro del batch
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        embeddings = scorer.encode([chunks[i] for i in order])
+        cls._ready = True
+
+        with timed('result_build'):
+            similarities = embeddings @ cls._label_embeddings.T
+            probabilities = (similarities / cls.TEMPERATURE).softmax(dim=1)
+            chunk_scores = [None] * len(chunks)
+            for i, row in zip(order, probabilities.tolist()):
+                chunk_scores[i] = dict(zip(cls.TAXONOMY, row))
+            results = [
+                cls._build_result(ranked)
+                for ranked in cls.merge_chunk_scores(len(texts), chunk_scores, owners, weights)
+            ]
+        cls._log_results(texts, results, time.perf_counter() - started)
+        return results
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        # La temperatura cambia los scores, asi que forma parte de la huella
+        return f"{super().fingerprint()}:t{cls.TEMPERATURE}"
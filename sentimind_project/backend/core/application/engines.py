@@ -0,0 +1,27 @@
+"""
+Seleccion del motor de clasificacion activo segun settings.SCORING_MODE.
+"""
+from django.conf import settings
+
+from core.application.ai_service import MiningEngine
+
+
+def get_engine():
+    """
+    Retorna la clase del motor configurado:
+    - nli (por defecto): MiningEngine, zero-shot con cross-encoder XLM-RoBERTa.
+    - embedding: EmbeddingEngine, bi-encoder de un solo paso por texto.
+    - stub: StubEngine, scores deterministas sin modelo (pruebas de carga).
+    - cascade: CascadeEngine, lexico primero y modelo solo para los dudosos.
+    """
+    mode = getattr(settings, 'SCORING_MODE', 'nli')
+    if mode == 'embedding':
+        from core.application.embedding_engine import EmbeddingEngine
+        return EmbeddingEngine
+    if mode == 'cascade':
+        from core.application.cascade_engine import CascadeEngine
+        return CascadeEngine
+    if mode == 'stub':
+        from core.application.stub_engine import StubEngine
+        return StubEngine
+    return MiningEngine
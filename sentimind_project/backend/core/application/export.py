@@ -0,0 +1,116 @@
+"""
+Exportacion del corpus de posts con sus clasificaciones, en NDJSON o CSV,
+para analitica offline (GET /api/posts/export/ y python manage.py export_posts).
+
+Los posts se leen con .iterator(chunk_size) (cursor del lado del servidor en
+PostgreSQL, fetchmany en SQLite) y las categorias con una consulta por chunk,
+asi que la memoria no depende del tamaño de la exportacion.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from core.application.ai_service import MiningEngine
+from core.models import Category, Post, PostCategory
+
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+
+# Columnas del CSV antes de las de confianza por categoria
+CSV_FIELDS = (
+    'id', 'created_at', 'author_id', 'author', 'classification_status',
+    'primary_category', 'primary_confidence', 'content',
+)
+
+
+def iter_posts(since=None, until=None, category: str = None, chunk_size: int = 2000, using: str = 'default'):
+    """
+    Un dict por post en [since, until), en orden (created_at, id):
+
+        {"id": 1, "created_at": "2026-01-05T14:00:00+00:00", "author_id": 3,
+         "author": "ana", "classification_status": "done",
+         "primary_category": "Alegría", "primary_confidence": 0.91,
+         "content": "...", "categories": [{"name": "Alegría", "confidence": 0.91}, ...]}
+
+    category limita a los posts que tienen esa categoria (no solo como principal).
+    """
+    queryset = Post.objects.using(using).order_by('created_at', 'id')
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    if category:
+        queryset = queryset.filter(post_categories__category__name=category)
+
+    rows = queryset.values(
+        'id', 'created_at', 'author_id', 'author__username', 'classification_status',
+        'primary_category', 'primary_confidence', 'content'
+    ).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        categories = {row['id']: [] for row in chunk}
+        for post_id, name, confidence in PostCategory.objects.using(using).filter(
+            post_id__in=list(categories)
+        ).values_list('post_id', 'category__name', 'confidence'):
+            categories[post_id].append({'name': name, 'confidence': confidence})
+
+        for row in chunk:
+            yield {
+                'id': row['id'],
+                'created_at': row['created_at'].isoformat(),
+                'author_id': row['author_id'],
+                'author': row['author__username'],
+                'classification_status': row['classification_status'],
+                'primary_category': row['primary_category'],
+                'primary_confidence': row['primary_confidence'],
+                'content': row['content'],
+                'categories': categories[row['id']],
+            }
+
+
+def ndjson_lines(posts):
+    """Una linea JSON por post."""
+    for post in posts:
+        yield json.dumps(post, ensure_ascii=False) + "\n"
+
+
+def csv_lines(posts, labels: list):
+    """Cabecera y una fila por post, con una columna de confianza por etiqueta de labels (vacia si no la tiene)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(list(CSV_FIELDS) + list(labels))
+    yield flush()
+    for post in posts:
+        scores = {cat['name']: cat['confidence'] for cat in post['categories']}
+        writer.writerow(
+            [post[field] for field in CSV_FIELDS] + [scores.get(label, '') for label in labels]
+        )
+        yield flush()
+
+
+def csv_labels(using: str = 'default') -> list:
+    """TAXONOMY y, al final, las categorias guardadas que no estan en ella."""
+    stored = set(Category.objects.using(using).values_list('name', flat=True))
+    return list(MiningEngine.TAXONOMY) + sorted(stored - set(MiningEngine.TAXONOMY))
+
+
+def export_lines(fmt: str, using: str = 'default', **filters):
+    """Lineas de la exportacion en fmt (ndjson | csv); filters son los de iter_posts."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato debe ser uno de: {', '.join(EXPORT_FORMATS)}")
+    posts = iter_posts(using=using, **filters)
+    if fmt == 'csv':
+        return csv_lines(posts, csv_labels(using))
+    return ndjson_lines(posts)
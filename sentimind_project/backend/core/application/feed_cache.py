@@ -0,0 +1,157 @@
+"""
+Cache de respuestas del feed (GET /api/posts/) con invalidacion por escritura.
+
+Cada respuesta se guarda ya renderizada, con su ETag, bajo una clave que
+combina el origen (esquema y host: los enlaces next/previous son absolutos),
+los parametros de la peticion (filtros, cursor, page_size, since) y la
+version de su ambito:
+
+- ?category=X: la version de la categoria X.
+- sin category: la version "all" (feed completo y filtros por campos de Post).
+
+Las escrituras de post_service cambian, al confirmarse su transaccion, la
+version de "all" y de las categorias de los posts afectados: las claves
+anteriores dejan de consultarse y expiran solas (FEED_CACHE_TTL). Un post
+nuevo de Alegria no invalida el feed de Tristeza.
+
+Las versiones viven en la misma cache que las respuestas: con varios
+workers (o el worker de clasificacion asincrona) hace falta un backend
+compartido (CACHE_BACKEND=file) para que todos vean las invalidaciones.
+check_shared_cache() lo exige al arrancar gunicorn.
+"""
+import hashlib
+import json
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+class FeedCache:
+    """
+    Respuestas renderizadas del feed y versiones por ambito.
+
+    Patrón Singleton por proceso (ver get_instance).
+    """
+
+    ALL = 'all'
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, cache, timeout: int = 300):
+        self.cache = cache
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+        self._invalidations = 0
+
+    @classmethod
+    def get_instance(cls):
+        """Retorna la cache del feed, o None si esta desactivada en settings."""
+        if not getattr(settings, 'FEED_CACHE', False):
+            return None
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(caches['default'], getattr(settings, 'FEED_CACHE_TTL', 300))
+        return cls._instance
+
+    def make_key(self, params: list, origin: str = '') -> str:
+        """
+        Clave de la respuesta para los parametros [(nombre, [valores])] de la
+        peticion. origin (esquema y host) separa las respuestas de cada host:
+        sus enlaces de paginacion apuntan a el.
+        """
+        params = sorted(params)
+        category = next((values[-1] for name, values in params if name == 'category' and values), None)
+        scope = category or self.ALL
+        payload = json.dumps([origin, scope, self._version(scope), params], ensure_ascii=False)
+        return 'feed:page:' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """(etag, body) guardado para la clave, o None."""
+        entry = self.cache.get(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes) -> tuple:
+        """Guarda la respuesta renderizada; retorna (etag, body)."""
+        entry = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+        self.cache.set(key, entry, self.timeout)
+        return entry
+
+    def not_modified(self, etag: str, if_none_match: str) -> bool:
+        """True si la cabecera If-None-Match del cliente incluye el ETag."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        matched = '*' in tags or etag in tags
+        if matched:
+            with self._lock:
+                self._not_modified += 1
+        return matched
+
+    def invalidate(self, categories=()):
+        """Nueva version de "all" y de las categorias: sus respuestas guardadas dejan de usarse."""
+        scopes = {self.ALL, *categories}
+        self.cache.set_many({self._version_key(scope): uuid.uuid4().hex for scope in scopes}, None)
+        with self._lock:
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "not_modified": self._not_modified,
+                "invalidations": self._invalidations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _version(self, scope: str) -> str:
+        key = self._version_key(scope)
+        version = self.cache.get(key)
+        if version is None:
+            # Version desalojada o ambito nuevo: cualquier valor nuevo invalida lo anterior
+            self.cache.add(key, uuid.uuid4().hex, None)
+            version = self.cache.get(key)
+        return version
+
+    @staticmethod
+    def _version_key(scope: str) -> str:
+        return 'feed:version:' + hashlib.sha256(scope.encode('utf-8')).hexdigest()[:16]
+
+
+def check_shared_cache(workers: int):
+    """
+    Rechaza FEED_CACHE con una cache por proceso (locmem) si hay mas de un
+    proceso: cada worker solo veria sus propias invalidaciones y serviria
+    respuestas viejas hasta FEED_CACHE_TTL.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if not getattr(settings, 'FEED_CACHE', False) or not backend.endswith('.LocMemCache'):
+        return
+    if workers > 1 or getattr(settings, 'ASYNC_CLASSIFICATION', False):
+        raise ImproperlyConfigured(
+            "FEED_CACHE necesita una cache compartida con varios workers o con "
+            "ASYNC_CLASSIFICATION: usa CACHE_BACKEND=file (o GUNICORN_WORKERS=1)"
+        )
+
+
+def invalidate_feed(categories=()):
+    """Invalida el feed completo y el de las categorias al confirmarse la transaccion en curso."""
+    feed_cache = FeedCache.get_instance()
+    if feed_cache is not None:
+        categories = set(categories)
+        transaction.on_commit(lambda: feed_cache.invalidate(categories))
@@ -0,0 +1,114 @@
+"""
+Ingesta masiva de posts (migraciones de datos e importaciones de partners).
+Clasifica en batches con MiningEngine y escribe con bulk_create.
+"""
+import json
+from itertools import islice
+
+from core.application.classification import classify_many
+from core.application.post_service import bulk_create_posts
+
+
+MIN_CONTENT_LENGTH = 3
+
+
+def parse_json_items(payload) -> list:
+    """Acepta una lista JSON de strings o de objetos {"content": ...}."""
+    if not isinstance(payload, list):
+        raise ValueError("Se esperaba una lista JSON de posts")
+    return [_content_of(item) for item in payload]
+
+
+def iter_ndjson_items(lines):
+    """Un post por linea NDJSON (string u objeto {"content": ...}); ignora lineas vacias."""
+    for line in lines:
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if not line:
+                continue
+            yield _content_of(json.loads(line))
+        except ValueError as e:
+            yield e
+
+
+def ingest(items, author=None, batch_size: int = 64, max_items: int = None):
+    """
+    Clasifica y guarda los items en batches, emitiendo un evento por item
+    y uno de progreso por batch:
+
+        {"type": "item", "index": 0, "status": "created", "id": 12, "primary_category": "Humor"}
+        {"type": "item", "index": 1, "status": "error", "error": "..."}
+        {"type": "progress", "processed": 64, "created": 63, "failed": 1}
+        {"type": "summary", "processed": 100, "created": 98, "failed": 2}
+
+    items puede ser un iterable perezoso (p. ej. iter_ndjson_items sobre un
+    archivo o el cuerpo de la peticion): solo se mantiene en memoria un batch
+    a la vez.
+
+    Con max_items se procesan como mucho max_items items; si quedan mas, se
+    emite un evento de error antes del resumen (los batches anteriores ya
+    quedaron guardados):
+
+        {"type": "error", "error": "Maximo 10000 posts por peticion: ..."}
+    """
+    processed = created = failed = 0
+    iterator = enumerate(items)
+
+    while True:
+        size = batch_size if max_items is None else min(batch_size, max_items - processed)
+        batch = list(islice(iterator, size)) if size > 0 else []
+        if not batch:
+            break
+
+        valid = []
+        for index, content in batch:
+            error = _validate(content)
+            if error:
+                failed += 1
+                yield {"type": "item", "index": index, "status": "error", "error": error}
+            else:
+                valid.append((index, content))
+
+        if valid:
+            contents = [content for _, content in valid]
+            try:
+                analyses = classify_many(contents)
+                posts = bulk_create_posts(contents, author, analyses)
+            except Exception as e:
+                failed += len(valid)
+                for index, _ in valid:
+                    yield {"type": "item", "index": index, "status": "error", "error": str(e)}
+            else:
+                created += len(posts)
+                for (index, _), post in zip(valid, posts):
+                    yield {
+                        "type": "item", "index": index, "status": "created",
+                        "id": post.id, "primary_category": post.primary_category
+                    }
+
+        processed += len(batch)
+        yield {"type": "progress", "processed": processed, "created": created, "failed": failed}
+
+    if max_items is not None and processed >= max_items and next(iterator, None) is not None:
+        yield {
+            "type": "error",
+            "error": f"Maximo {max_items} posts por peticion: el resto no se proceso",
+        }
+
+    yield {"type": "summary", "processed": processed, "created": created, "failed": failed}
+
+
+def _content_of(item):
+    if isinstance(item, dict):
+        return item.get('content')
+    return item
+
+
+def _validate(content):
+    if isinstance(content, Exception):
+        return f"JSON invalido: {content}"
+    if not isinstance(content, str) or len(content.strip()) < MIN_CONTENT_LENGTH:
+        return f"El contenido debe tener al menos {MIN_CONTENT_LENGTH} caracteres"
+    return None
@@ -0,0 +1,128 @@
+"""
+Clasificador por lexico: primer nivel de la cascada (ver cascade_engine).
+Reconoce los casos obvios ("jajaja", "te amo", "pesimo servicio") con
+expresiones regulares, sin modelo y en microsegundos por texto.
+"""
+import re
+import unicodedata
+
+from core.application.ai_service import MiningEngine
+
+
+# Patrones por etiqueta, sobre el texto en minusculas y sin tildes
+LEXICON = {
+    "Alegría": [
+        r"\bfeliz\b", r"\bfelicidad\b", r"\balegr(?:e|ia|ias)\b", r"\bcontent[oa]s?\b",
+        r"\bel mejor dia\b", r"\bque bien\b", "😄", "😁", "🥳",
+    ],
+    "Tristeza": [
+        r"\btriste(?:za)?\b", r"\bllor(?:o|ando|ar|e)\b", r"\blo extrano\b", r"\bla extrano\b",
+        r"\bdeprimid[oa]\b", r"\bme siento (?:muy )?sol[oa]\b", r"\bse murio\b", "😢", "😭", "💔",
+    ],
+    "Enojo": [
+        r"\bodio\b", r"\bfurios[oa]\b", r"\bme (?:enfada|enoja|molesta|irrita)\b", r"\bhart[oa]\b",
+        r"\brabia\b", r"\bme hierve la sangre\b", r"\bno soporto\b", "😡", "🤬",
+    ],
+    "Miedo": [
+        r"\bmiedo\b", r"\bme aterra\b", r"\baterrad[oa]\b", r"\bpanico\b", r"\bterror\b",
+        r"\basustad[oa]\b", "😱", "😨",
+    ],
+    "Sorpresa": [
+        r"\bno (?:lo )?puedo creer\b", r"\bque sorpresa\b", r"\bno me lo esperaba\b",
+        r"\bsin palabras\b", r"\bincreible\b", "😮", "😲",
+    ],
+    "Asco": [
+        r"\basco\b", r"\brepugnante\b", r"\bvomit(?:o|ar|ivo)\b", r"\basqueros[oa]\b", "🤮", "🤢",
+    ],
+    "Amor": [
+        r"\bte (?:amo|adoro)\b", r"\benamor(?:ad[oa]|o)\b", r"\bmi amor\b",
+        r"\bamo a\b", "❤", "😍", "🥰",
+    ],
+    "Humor": [
+        r"\b(?:ja){2,}j?\b", r"\b(?:je){2,}\b", r"\b(?:js){2,}\w*", r"\bx+d+\b", r"\blol\b",
+        r"\bme muero de (?:la )?risa\b", r"\bque risa\b", r"\bgracios[oa]\b", r"\bmeme\b",
+        "😂", "🤣",
+    ],
+    "Inspiración": [
+        r"\bnunca te rindas\b", r"\bsigue adelante\b", r"\bcree en ti\b", r"\btu puedes\b",
+        r"\bpersigue tus suenos\b", r"\bnueva oportunidad\b", "💪",
+    ],
+    "Queja": [
+        r"\bpesim[oa]\b", r"\breclam(?:o|e|ar)\b", r"\bnadie (?:me )?(?:responde|atiende)\b",
+        r"\bsigo esperando\b", r"\bmal servicio\b", r"\bestafa\b", r"\bes el colmo\b",
+        r"\bno funciona\b", r"\bque verguenza\b",
+    ],
+    "Reflexión": [
+        r"\bme pregunto\b", r"\ba veces pienso\b", r"\bla vida es\b", r"\breflexion(?:ar|ando)?\b",
+    ],
+    "Sarcasmo": [
+        r"\bclaro,? como (?:si|no)\b", r"\bsi,? claro\b", r"\bque suerte la mia\b", "🙄",
+    ],
+}
+
+
+# Negaciones que invierten una senal cercana ("no estoy feliz", "nunca me siento triste")
+NEGATORS = ("no", "nunca", "tampoco", "ni", "jamas")
+
+
+class LexiconScorer:
+    """
+    Scores por etiqueta a partir de coincidencias del lexico:
+
+        score(etiqueta) = coincidencias(etiqueta) / (coincidencias totales + PRIOR)
+
+    Sin coincidencias todos los scores son 0; con una sola coincidencia el
+    score maximo es 0.5. Los umbrales de la cascada se ajustan sobre esta
+    escala con tune_cascade.py.
+
+    Si una coincidencia tiene una negacion (NEGATORS) en las
+    NEGATION_WINDOW palabras anteriores, el lexico no decide: todos los
+    scores son 0 y la cascada escala el texto al modelo.
+    """
+
+    # Cambia si cambia LEXICON o la formula: forma parte de la huella de la cache
+    VERSION = 3
+    METHOD = f"lexicon-v{VERSION}"
+    PRIOR = 1.0
+    NEGATION_WINDOW = 3
+
+    _patterns = {
+        label: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+        for label, patterns in LEXICON.items()
+    }
+    # Negacion seguida de hasta NEGATION_WINDOW - 1 palabras, justo antes de la coincidencia
+    _negation = re.compile(
+        rf"\b(?:{'|'.join(NEGATORS)})\b(?:\W+\w+){{0,{NEGATION_WINDOW - 1}}}\W*$"
+    )
+
+    @classmethod
+    def score(cls, text: str) -> dict:
+        """{"labels": [...], "scores": [...]} ordenado por score descendente (formato de _build_result)."""
+        normalized = _normalize(text)
+        hits = {}
+        for label, pattern in cls._patterns.items():
+            matches = list(pattern.finditer(normalized))
+            if any(cls._negated(normalized, match.start()) for match in matches):
+                hits = {}
+                break
+            hits[label] = len(matches)
+        total = sum(hits.values()) + cls.PRIOR
+        ranked = sorted(
+            ((label, hits.get(label, 0) / total) for label in MiningEngine.TAXONOMY),
+            key=lambda item: item[1], reverse=True
+        )
+        return {
+            "labels": [label for label, _ in ranked],
+            "scores": [score for _, score in ranked],
+        }
+
+    @classmethod
+    def _negated(cls, normalized: str, start: int) -> bool:
+        # Solo se miran los caracteres cercanos: la ventana es de pocas palabras
+        return cls._negation.search(normalized, max(0, start - 60), start) is not None
+
+
+def _normalize(text: str) -> str:
+    # Minusculas y sin tildes (los emojis no tienen marcas combinantes que perder)
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
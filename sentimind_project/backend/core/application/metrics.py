@@ -0,0 +1,175 @@
+"""
+Metricas del proceso en formato de texto de Prometheus.
+Tiempos por etapa (tokenizacion, forward, post-proceso, escrituras en BD,
+serializacion) y contadores de peticiones HTTP.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Limites superiores (segundos) de los buckets de los histogramas
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Tiempos por etapa de la peticion en curso (para la cabecera Server-Timing).
+# Un ContextVar y no un threading.local: cada peticion arranca su propio dict
+# y los hilos de fondo (batcher, warm-up) no lo heredan.
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, limit in enumerate(BUCKETS):
+            if value <= limit:
+                self.counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas en memoria del proceso.
+
+    Cada worker de gunicorn tiene su propio registro: /metrics reporta solo
+    el worker que atiende el scrape.
+
+    Patrón Singleton por proceso (ver get_instance).
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._requests = {}
+        self._request_durations = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _Histogram()
+            histogram.observe(seconds)
+
+    def observe_request(self, method: str, view: str, status: int, seconds: float):
+        with self._lock:
+            key = (method, view, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._request_durations.get((method, view))
+            if histogram is None:
+                histogram = self._request_durations[(method, view)] = _Histogram()
+            histogram.observe(seconds)
+
+    def render(self, gauges: dict = None) -> str:
+        """Exposicion en formato de texto de Prometheus (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP sentimind_stage_seconds Tiempo por etapa del procesamiento",
+                "# TYPE sentimind_stage_seconds histogram",
+            ]
+            for stage, histogram in sorted(self._stages.items()):
+                lines += _histogram_lines('sentimind_stage_seconds', f'stage="{stage}"', histogram)
+
+            lines += [
+                "# HELP sentimind_http_requests_total Peticiones HTTP atendidas",
+                "# TYPE sentimind_http_requests_total counter",
+            ]
+            for (method, view, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'sentimind_http_requests_total{{method="{method}",view="{view}",status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP sentimind_http_request_seconds Duracion de las peticiones HTTP",
+                "# TYPE sentimind_http_request_seconds histogram",
+            ]
+            for (method, view), histogram in sorted(self._request_durations.items()):
+                lines += _histogram_lines(
+                    'sentimind_http_request_seconds', f'method="{method}",view="{view}"', histogram
+                )
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._requests.clear()
+            self._request_durations.clear()
+
+
+def _histogram_lines(name: str, labels: str, histogram: _Histogram) -> list:
+    lines = []
+    cumulative = 0
+    for limit, count in zip(BUCKETS, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{limit}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.total:.6f}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+def record_stage(stage: str, seconds: float):
+    """Registra una etapa en el histograma global y en la peticion en curso."""
+    MetricsRegistry.get_instance().observe_stage(stage, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """Mide el bloque como la etapa stage: with timed('db_write'): ..."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def start_request():
+    """Abre la cuenta de etapas de una peticion; retorna el token para end_request."""
+    return _request_timings.set({})
+
+
+def end_request(token) -> dict:
+    """Cierra la cuenta de etapas de la peticion y retorna {etapa: segundos}."""
+    timings = _request_timings.get() or {}
+    _request_timings.reset(token)
+    return timings
+
+
+def current_timings():
+    """Dict de etapas de la peticion en curso (None fuera de una peticion)."""
+    return _request_timings.get()
+
+
+def add_timings(target: dict, timings: dict):
+    """
+    Suma a target (el dict de otra peticion, ver current_timings) las etapas
+    medidas en otro hilo, p. ej. las del batch que atendio esa peticion.
+    """
+    for stage, seconds in timings.items():
+        target[stage] = target.get(stage, 0.0) + seconds
@@ -0,0 +1,143 @@
+"""
+Artefactos locales de modelos para arrancar sin red (ver bundle_model).
+
+Estructura en MODEL_ARTIFACTS_DIR:
+
+    <nombre>/<version>/config.json, model.safetensors, tokenizer.json, ..., manifest.json
+    <nombre>/CURRENT          version que cargan los workers
+
+<nombre> es el del registro de modelos (o "embedding" para EmbeddingEngine).
+Los pesos se guardan en safetensors: se abren con mmap, sin deserializar
+pickle, y el tokenizer rapido va ya convertido (tokenizer.json), asi que la
+carga no descarga ni convierte nada.
+
+Con MODEL_OFFLINE los modelos solo se cargan desde su artefacto; sin el,
+el artefacto se usa si existe y si no se descarga del hub como siempre.
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+
+MANIFEST = 'manifest.json'
+CURRENT = 'CURRENT'
+
+
+def artifacts_dir() -> str:
+    return str(getattr(settings, 'MODEL_ARTIFACTS_DIR', 'model_artifacts'))
+
+
+def current_artifact(name: str):
+    """(ruta, manifest) de la version activa del artefacto `name`, o None."""
+    base = os.path.join(artifacts_dir(), name)
+    try:
+        with open(os.path.join(base, CURRENT), encoding='utf-8') as f:
+            version = f.read().strip()
+        path = os.path.join(base, version)
+        with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+            return path, json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def resolve(name: str, model_id: str) -> tuple:
+    """
+    Origen desde el que cargar el modelo `name` (id de hub `model_id`):
+    (ruta o id, local_files_only, manifest o None).
+
+    Lanza RuntimeError con MODEL_OFFLINE si no hay artefacto.
+    """
+    artifact = current_artifact(name)
+    if artifact is not None:
+        path, manifest = artifact
+        return path, True, manifest
+    if getattr(settings, 'MODEL_OFFLINE', False):
+        raise RuntimeError(
+            f"MODEL_OFFLINE: no hay artefacto de '{name}' en {artifacts_dir()}; "
+            f"ejecuta: python manage.py bundle_model {name}"
+        )
+    return model_id, False, None
+
+
+def write_artifact(name: str, model_id: str, model, tokenizer, task: str) -> str:
+    """
+    Guarda model y tokenizer como una nueva version del artefacto `name` y
+    la marca como CURRENT. La version se escribe en un directorio temporal y
+    se renombra al terminar: un bundle interrumpido nunca queda como activo.
+    """
+    revision = getattr(model.config, '_commit_hash', None)
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at:%Y%m%d%H%M%S}-{(revision or 'local')[:12]}"
+    base = os.path.join(artifacts_dir(), name)
+    path = os.path.join(base, version)
+    staging = os.path.join(base, f".{version}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    model.save_pretrained(staging)
+    tokenizer.save_pretrained(staging)
+    manifest = {
+        "name": name,
+        "model": model_id,
+        "revision": revision,
+        "task": task,
+        "tokenizer": "fast" if getattr(tokenizer, 'is_fast', False) else "slow",
+        "created_at": created_at.isoformat(timespec='seconds'),
+        "files": {
+            filename: _sha256(os.path.join(staging, filename))
+            for filename in sorted(os.listdir(staging))
+            if os.path.isfile(os.path.join(staging, filename))
+        },
+    }
+    with open(os.path.join(staging, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    os.replace(staging, path)
+    _write_current(base, version)
+    return path
+
+
+def verify(path: str, manifest: dict) -> list:
+    """Archivos del artefacto que faltan o cuyo sha256 no coincide con el manifest."""
+    broken = []
+    for filename, digest in manifest.get("files", {}).items():
+        file_path = os.path.join(path, filename)
+        if not os.path.exists(file_path) or _sha256(file_path) != digest:
+            broken.append(filename)
+    return broken
+
+
+def prune(name: str, keep: int) -> list:
+    """Borra las versiones mas antiguas de `name`, salvo las `keep` mas recientes y CURRENT."""
+    base = os.path.join(artifacts_dir(), name)
+    current = current_artifact(name)
+    current_version = os.path.basename(current[0]) if current else None
+    versions = sorted(
+        entry for entry in os.listdir(base)
+        if not entry.startswith('.') and os.path.isdir(os.path.join(base, entry))
+    )
+    removed = []
+    for version in versions[:max(len(versions) - keep, 0)]:
+        if version != current_version:
+            shutil.rmtree(os.path.join(base, version))
+            removed.append(version)
+    return removed
+
+
+def _write_current(base: str, version: str):
+    staging = os.path.join(base, f".{CURRENT}.tmp")
+    with open(staging, 'w', encoding='utf-8') as f:
+        f.write(version + "\n")
+    os.replace(staging, os.path.join(base, CURRENT))
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
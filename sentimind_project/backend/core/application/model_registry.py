@@ -0,0 +1,341 @@
+"""
+Registro de modelos zero-shot candidatos para MiningEngine.
+
+Cada modelo del registro tiene un nombre y una spec:
+
+    {
+        "model": "joeddav/xlm-roberta-large-xnli",  # id de Hugging Face o ruta local
+        "precision": "int8",           # fp32 | int8 | onnx (por defecto INFERENCE_PRECISION)
+        "load": "eager",               # eager: en memoria desde el arranque | lazy: al activarlo
+        "fallback": "bart-large-mnli", # modelo a usar si este no carga
+        "method": "xlm-roberta-local", # prefijo del campo method del analisis
+        "use_fast": false,             # tokenizer rapido de transformers
+        "hypothesis_template": "Este texto expresa {}",
+        "labels": {"Alegría": "alegría"}  # etiqueta de TAXONOMY -> etiqueta para el modelo
+    }
+
+El registro sale de MODEL_REGISTRY_FILE (JSON {nombre: spec}); sin el
+archivo se usa MiningEngine.default_registry().
+
+Cambio de modelo sin corte: activate() carga el candidato en un hilo,
+ejecuta el warm-up y solo entonces lo instala en MiningEngine con un
+cambio atomico de referencia. Mientras tanto, y para las peticiones que ya
+estaban en curso, responde el modelo anterior.
+
+Los workers de gunicorn no comparten memoria: el modelo elegido se guarda
+en ModelSelection y cada worker lo consulta cada MODEL_SWITCH_POLL_SECONDS
+(sync) desde el camino de clasificacion.
+"""
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from core.application.ai_service import MiningEngine, LoadedModel
+
+
+logger = logging.getLogger(__name__)
+
+LOAD_POLICIES = ("eager", "lazy")
+
+
+class ModelStats:
+    """Latencia de inferencia de un modelo en este worker (ventana de los ultimos batches)."""
+
+    WINDOW = 512
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._per_text = deque(maxlen=self.WINDOW)
+        self.batches = 0
+        self.texts = 0
+        self.seconds = 0.0
+
+    def observe(self, seconds: float, texts: int):
+        with self._lock:
+            self.batches += 1
+            self.texts += texts
+            self.seconds += seconds
+            self._per_text.append(seconds / texts)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            window = sorted(self._per_text)
+            stats = {
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_ms_per_text": round(self.seconds * 1000 / self.texts, 2) if self.texts else None,
+            }
+        if len(window) >= 2:
+            quantiles = statistics.quantiles(window, n=100, method='inclusive')
+            stats["p50_ms_per_text"] = round(quantiles[49] * 1000, 2)
+            stats["p95_ms_per_text"] = round(quantiles[94] * 1000, 2)
+        elif window:
+            stats["p50_ms_per_text"] = stats["p95_ms_per_text"] = round(window[0] * 1000, 2)
+        return stats
+
+
+class ModelRegistry:
+    """
+    Modelos candidatos, modelos cargados en este worker y cambio de modelo
+    activo en segundo plano.
+
+    Patrón Singleton por proceso (ver get_instance).
+    """
+
+    # Inferencias de prueba sobre el candidato antes de activarlo
+    WARMUP_RUNS = 3
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, engine, specs: dict, initial: str = None):
+        _validate(specs, engine)
+        if initial and initial not in specs:
+            raise ImproperlyConfigured(f"ACTIVE_MODEL '{initial}' no esta en el registro de modelos")
+        self.engine = engine
+        self.specs = specs
+        self.initial = initial or next(iter(specs))
+        self._lock = threading.Lock()
+        # Serializa las cargas: el hilo de espera y un cambio no cargan dos veces el mismo modelo
+        self._load_lock = threading.Lock()
+        self._loaded = {}
+        self._stats = {name: ModelStats() for name in specs}
+        self._loading = None
+        self._error = None
+        self._last_sync = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(
+                        MiningEngine,
+                        _read_registry_file(getattr(settings, 'MODEL_REGISTRY_FILE', '')) or MiningEngine.default_registry(),
+                        getattr(settings, 'ACTIVE_MODEL', '') or None,
+                    )
+        return cls._instance
+
+    @classmethod
+    def discard(cls, engine):
+        """Olvida los modelos cargados (MiningEngine.unload)."""
+        with cls._instance_lock:
+            if cls._instance is not None and cls._instance.engine is engine:
+                cls._instance = None
+
+    @property
+    def active(self) -> str:
+        model = self.engine._active
+        return model.name if model is not None else None
+
+    def selected(self) -> str:
+        """Modelo que se cargaria al arrancar: el de ModelSelection o ACTIVE_MODEL."""
+        name = _selected_model() or self.initial
+        if name not in self.specs:
+            logger.warning("Modelo seleccionado '%s' no esta en el registro, usando '%s'", name, self.initial)
+            name = self.initial
+        return name
+
+    def load_initial(self) -> LoadedModel:
+        """
+        Carga el modelo elegido (ModelSelection, o ACTIVE_MODEL) siguiendo la
+        cadena de fallback si no carga. Lanza RuntimeError si no carga ninguno.
+        """
+        name = self.selected()
+
+        errors = []
+        tried = set()
+        while name and name not in tried:
+            tried.add(name)
+            try:
+                return self._load(name)
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                name = self.specs[name].get("fallback")
+                if name:
+                    logger.warning("Error cargando %s; intentando con %s (fallback)", errors[-1], name)
+        logger.error("No se pudo cargar ningun modelo del registro: %s", "; ".join(errors))
+        raise RuntimeError(f"No se pudo cargar ningún modelo: {'; '.join(errors)}")
+
+    def load_standby(self):
+        """Carga en un hilo los modelos eager que no estan activos."""
+        pending = [
+            name for name, spec in self.specs.items()
+            if spec.get("load", "lazy") == "eager" and name not in self._loaded
+        ]
+        if pending:
+            threading.Thread(
+                target=self._load_standby, args=(pending,), name='model-standby', daemon=True
+            ).start()
+
+    def preload_standby(self):
+        """
+        Carga sin inferencia los modelos eager que no estan activos, en el
+        hilo actual. Para el master de gunicorn antes del fork: los workers
+        heredan los pesos compartidos en lugar de cargar cada uno su copia.
+        """
+        for name, spec in self.specs.items():
+            if spec.get("load", "lazy") == "eager" and name not in self._loaded:
+                try:
+                    self._load(name)
+                except Exception:
+                    logger.exception("No se pudo cargar el modelo en espera %s", name)
+
+    def loaded_models(self) -> list:
+        """Modelos cargados en este proceso (activo y en espera)."""
+        return [model for model in self._loaded.values() if model is not None]
+
+    def activate(self, name: str, wait: bool = False) -> bool:
+        """
+        Carga `name` en segundo plano y lo activa cuando termina su warm-up.
+        Retorna False si ya es el activo o ya se esta cargando otro modelo.
+        """
+        if name not in self.specs:
+            raise ValueError(f"Modelo '{name}' no esta en el registro: {', '.join(self.specs)}")
+        with self._lock:
+            if self._loading is not None or name == self.active:
+                return False
+            self._loading = name
+        thread = threading.Thread(target=self._swap, args=(name,), name='model-swap', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def sync(self):
+        """
+        Activa el modelo guardado en ModelSelection si difiere del activo.
+        Consulta la base como mucho cada MODEL_SWITCH_POLL_SECONDS.
+        """
+        interval = getattr(settings, 'MODEL_SWITCH_POLL_SECONDS', 10.0)
+        now = time.monotonic()
+        if interval <= 0 or now - self._last_sync < interval or self.engine._active is None:
+            return
+        self._last_sync = now
+        name = _selected_model()
+        if name and name != self.active and name != self._loading:
+            if name not in self.specs:
+                logger.warning("Modelo seleccionado '%s' no esta en el registro", name)
+                return
+            self.activate(name)
+
+    def status(self) -> dict:
+        """Modelo activo, cambio en curso y latencia de cada modelo en este worker."""
+        return {
+            "active": self.active,
+            "loading": self._loading,
+            "error": self._error,
+            "models": {
+                name: {
+                    "model": spec["model"],
+                    "precision": spec.get("precision") or self.engine.PRECISION,
+                    "load": spec.get("load", "lazy"),
+                    "fallback": spec.get("fallback"),
+                    "loaded": self._loaded.get(name) is not None,
+                    "artifact": getattr(self._loaded.get(name), 'artifact', None),
+                    "latency": self._stats[name].snapshot(),
+                }
+                for name, spec in self.specs.items()
+            },
+        }
+
+    def _load(self, name: str) -> LoadedModel:
+        with self._load_lock:
+            model = self._loaded.get(name)
+            if model is None:
+                model = self.engine.load_model(name, self.specs[name])
+                model.stats = self._stats[name]
+                self._loaded[name] = model
+            return model
+
+    def _load_standby(self, names: list):
+        for name in names:
+            try:
+                self._warm(self._load(name))
+            except Exception:
+                logger.exception("No se pudo cargar el modelo en espera %s", name)
+
+    def _warm(self, model: LoadedModel):
+        for _ in range(self.WARMUP_RUNS):
+            self.engine.analyze_with(model, [self.engine.WARMUP_TEXT])
+
+    def _swap(self, name: str):
+        started = time.monotonic()
+        previous = self.engine._active
+        try:
+            model = self._load(name)
+            self._warm(model)
+            self.engine.swap(model)
+        except Exception as e:
+            self._error = f"{name}: {e}"
+            self._loaded.pop(name, None)
+            logger.exception("Fallo el cambio al modelo %s; sigue activo %s", name, self.active)
+        else:
+            self._error = None
+            # Un modelo lazy sale de memoria al desactivarlo; las peticiones
+            # que aun lo usan conservan su referencia hasta terminar
+            if previous is not None and self.specs[previous.name].get("load", "lazy") != "eager":
+                self._loaded.pop(previous.name, None)
+            logger.info("Modelo activo: %s (cambio en %.1fs)", name, time.monotonic() - started,
+                        extra={"model_method": model.method})
+        finally:
+            with self._lock:
+                self._loading = None
+
+
+def _validate(specs: dict, engine):
+    if not specs:
+        raise ImproperlyConfigured("El registro de modelos esta vacio")
+    for name, spec in specs.items():
+        if "model" not in spec:
+            raise ImproperlyConfigured(f"Modelo '{name}': falta 'model'")
+        if spec.get("load", "lazy") not in LOAD_POLICIES:
+            raise ImproperlyConfigured(f"Modelo '{name}': 'load' debe ser una de: {', '.join(LOAD_POLICIES)}")
+        if spec.get("precision") and spec["precision"] not in engine.PRECISIONS:
+            raise ImproperlyConfigured(
+                f"Modelo '{name}': 'precision' debe ser una de: {', '.join(engine.PRECISIONS)}"
+            )
+        if spec.get("fallback") and spec["fallback"] not in specs:
+            raise ImproperlyConfigured(f"Modelo '{name}': fallback '{spec['fallback']}' no esta en el registro")
+        unknown = set(spec.get("labels", {})) - set(engine.TAXONOMY)
+        if unknown:
+            raise ImproperlyConfigured(f"Modelo '{name}': etiquetas fuera de TAXONOMY: {', '.join(sorted(unknown))}")
+
+
+def _read_registry_file(path: str) -> dict:
+    if not path:
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ImproperlyConfigured(f"No se pudo leer MODEL_REGISTRY_FILE ({path}): {e}")
+
+
+def _selected_model() -> str:
+    """Modelo elegido con activate_model / la API, o None."""
+    from core.models import ModelSelection
+
+    try:
+        return ModelSelection.objects.values_list('name', flat=True).filter(pk=1).first()
+    except Exception:
+        # Sin base (p. ej. preload en el master antes de migrar): ACTIVE_MODEL
+        logger.warning("No se pudo leer ModelSelection; se usa ACTIVE_MODEL", exc_info=True)
+        return None
+
+
+def select_model(name: str) -> str:
+    """Guarda `name` como modelo activo para todos los workers."""
+    from core.models import ModelSelection
+
+    registry = ModelRegistry.get_instance()
+    if name not in registry.specs:
+        raise ValueError(f"Modelo '{name}' no esta en el registro: {', '.join(registry.specs)}")
+    ModelSelection.objects.update_or_create(pk=1, defaults={'name': name})
+    return name
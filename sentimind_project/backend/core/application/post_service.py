@@ -0,0 +1,204 @@
+"""
+Casos de uso de escritura de posts.
+Persisten el resultado de MiningEngine y gestionan la cola de clasificacion.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.application.analytics import record_post_categories
+from core.application.db_writer import serialized_write
+from core.application.feed_cache import invalidate_feed
+from core.application.metrics import timed
+from core.models import Post, Category, PostCategory, ClassificationJob
+
+
+# last_error de los trabajos reencolados porque su worker no termino a tiempo
+STALE_JOB_ERROR = 'worker timeout'
+
+
+@serialized_write
+@timed('db_write')
+def create_post(content: str, author, analysis: dict) -> Post:
+    """Crea un post ya clasificado con sus relaciones de categorias."""
+    with transaction.atomic():
+        post = Post.objects.create(
+            content=content,
+            author=author,
+            primary_category=analysis['main_sentiment'],
+            primary_confidence=analysis['confidence_score'],
+            classification_status=Post.STATUS_DONE
+        )
+        _create_post_categories(post, analysis)
+        invalidate_feed(cat['name'] for cat in analysis['emotions'])
+    return post
+
+
+@serialized_write
+@timed('db_write')
+def bulk_create_posts(contents: list, author, analyses: list) -> list:
+    """
+    Crea varios posts clasificados con dos INSERT masivos (posts y
+    PostCategory) en lugar de 1 + 2 consultas por categoria y post.
+    """
+    names = {cat['name'] for analysis in analyses for cat in analysis['emotions']}
+    category_ids = category_id_map(names)
+
+    with transaction.atomic():
+        posts = Post.objects.bulk_create([
+            Post(
+                content=content,
+                author=author,
+                primary_category=analysis['main_sentiment'],
+                primary_confidence=analysis['confidence_score'],
+                classification_status=Post.STATUS_DONE
+            )
+            for content, analysis in zip(contents, analyses)
+        ])
+        post_categories = PostCategory.objects.bulk_create([
+            PostCategory(
+                post=post,
+                category_id=category_ids[cat_data['name']],
+                confidence=cat_data['confidence'],
+                created_at=post.created_at
+            )
+            for post, analysis in zip(posts, analyses)
+            for cat_data in analysis['emotions']
+        ])
+        record_post_categories(post_categories)
+        invalidate_feed(names)
+    return posts
+
+
+def category_id_map(names) -> dict:
+    """Mapa nombre -> id de Category, creando las que falten."""
+    names = set(names)
+    ids = dict(Category.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = names - ids.keys()
+    if missing:
+        Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Category.objects.filter(name__in=missing).values_list('name', 'id'))
+    return ids
+
+
+@serialized_write
+@timed('db_write')
+def enqueue_post(content: str, author) -> Post:
+    """Crea un post pendiente y encola su trabajo de clasificacion."""
+    with transaction.atomic():
+        post = Post.objects.create(
+            content=content,
+            author=author,
+            classification_status=Post.STATUS_PENDING
+        )
+        ClassificationJob.objects.create(post=post)
+        invalidate_feed()
+    return post
+
+
+@serialized_write
+@timed('db_write')
+def save_analysis(post: Post, analysis: dict) -> Post:
+    """Completa un post pendiente con el resultado del analisis."""
+    with transaction.atomic():
+        post.primary_category = analysis['main_sentiment']
+        post.primary_confidence = analysis['confidence_score']
+        post.classification_status = Post.STATUS_DONE
+        post.save(update_fields=['primary_category', 'primary_confidence', 'classification_status'])
+        previous = list(post.post_categories.select_related('category'))
+        if previous:
+            record_post_categories(previous, sign=-1)
+            post.post_categories.all().delete()
+        _create_post_categories(post, analysis)
+        invalidate_feed(
+            [pc.category.name for pc in previous] + [cat['name'] for cat in analysis['emotions']]
+        )
+    return post
+
+
+def _create_post_categories(post: Post, analysis: dict):
+    post_categories = []
+    for cat_data in analysis['emotions']:
+        category, _ = Category.objects.get_or_create(name=cat_data['name'])
+        post_categories.append(PostCategory.objects.create(
+            post=post,
+            category=category,
+            confidence=cat_data['confidence'],
+            created_at=post.created_at
+        ))
+    record_post_categories(post_categories)
+
+
+@serialized_write
+def claim_jobs(batch_size: int, lock_timeout: int, max_attempts: int = 3) -> list:
+    """
+    Reserva hasta batch_size trabajos en cola para este worker.
+
+    Cada reserva cuenta como un intento. Los trabajos que llevan mas de
+    lock_timeout segundos en 'running' (worker caido a mitad de batch)
+    vuelven a la cola, o quedan como failed si ya agotaron max_attempts:
+    un post que tumba al worker no se reintenta indefinidamente.
+    """
+    now = timezone.now()
+    stale = ClassificationJob.objects.filter(
+        status=ClassificationJob.STATUS_RUNNING,
+        locked_at__lt=now - timedelta(seconds=lock_timeout)
+    )
+    with transaction.atomic():
+        exhausted = list(stale.filter(attempts__gte=max_attempts).values_list('post_id', flat=True))
+        if exhausted:
+            ClassificationJob.objects.filter(post_id__in=exhausted).update(
+                status=ClassificationJob.STATUS_FAILED, last_error=STALE_JOB_ERROR, finished_at=now
+            )
+            Post.objects.filter(pk__in=exhausted).update(classification_status=Post.STATUS_FAILED)
+            invalidate_feed()
+        stale.update(status=ClassificationJob.STATUS_QUEUED, last_error=STALE_JOB_ERROR)
+
+    with transaction.atomic():
+        ids = list(
+            ClassificationJob.objects
+            .filter(status=ClassificationJob.STATUS_QUEUED)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        ClassificationJob.objects.filter(
+            id__in=ids, status=ClassificationJob.STATUS_QUEUED
+        ).update(status=ClassificationJob.STATUS_RUNNING, locked_at=now, attempts=F('attempts') + 1)
+
+    return list(
+        ClassificationJob.objects
+        .filter(id__in=ids, status=ClassificationJob.STATUS_RUNNING, locked_at=now)
+        .select_related('post')
+        .order_by('created_at')
+    )
+
+
+@serialized_write
+def complete_job(job: ClassificationJob, analysis: dict):
+    """Guarda el analisis del post y marca el trabajo como terminado."""
+    with transaction.atomic():
+        save_analysis(job.post, analysis)
+        job.status = ClassificationJob.STATUS_DONE
+        job.last_error = ''
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'last_error', 'finished_at'])
+
+
+@serialized_write
+def fail_job(job: ClassificationJob, error: Exception, max_attempts: int):
+    """
+    Registra el error del intento (contado al reservar el trabajo); tras
+    max_attempts el post queda como failed.
+    """
+    with transaction.atomic():
+        job.last_error = str(error)
+        if job.attempts >= max_attempts:
+            job.status = ClassificationJob.STATUS_FAILED
+            job.finished_at = timezone.now()
+            Post.objects.filter(pk=job.post_id).update(classification_status=Post.STATUS_FAILED)
+            invalidate_feed()
+        else:
+            job.status = ClassificationJob.STATUS_QUEUED
+        job.save(update_fields=['status', 'last_error', 'finished_at'])
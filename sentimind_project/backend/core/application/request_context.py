@@ -0,0 +1,34 @@
+"""
+Contexto de la peticion en curso para los logs estructurados.
+Guarda el request id y los campos que las capas internas quieran agregar al
+registro de la peticion (p. ej. el metodo del modelo que la clasifico).
+"""
+import contextvars
+
+
+_context = contextvars.ContextVar('request_context', default=None)
+
+
+def begin(request_id: str):
+    """Abre el contexto de una peticion; retorna el token para end()."""
+    return _context.set({"request_id": request_id})
+
+
+def end(token) -> dict:
+    """Cierra el contexto y retorna sus campos."""
+    fields = _context.get() or {}
+    _context.reset(token)
+    return fields
+
+
+def request_id():
+    """Request id de la peticion en curso, o None fuera de una peticion."""
+    fields = _context.get()
+    return fields["request_id"] if fields else None
+
+
+def annotate(**fields):
+    """Agrega campos al registro de la peticion en curso (sin efecto fuera de una)."""
+    current = _context.get()
+    if current is not None:
+        current.update(fields)
@@ -0,0 +1,73 @@
+"""
+Motor de clasificacion falso para pruebas de carga y desarrollo sin modelo.
+"""
+import hashlib
+import os
+import time
+
+from core.application.ai_service import MiningEngine
+from core.application.metrics import timed
+
+
+class StubEngine(MiningEngine):
+    """
+    Sustituye a XLM-RoBERTa por scores deterministas derivados del hash del
+    texto, con una latencia simulada opcional (STUB_ENGINE_LATENCY_MS por
+    texto). No carga pesos ni importa torch: sirve para medir el resto de la
+    pila (vistas, serializadores, consultas) bajo carga.
+
+    Mantiene el formato de salida de MiningEngine.analyze().
+    """
+
+    MODEL_NAME = "stub"
+    PRECISION = "stub"
+    LATENCY_MS = float(os.environ.get("STUB_ENGINE_LATENCY_MS", "0"))
+
+    _classifier = None
+    _model_name = None
+    _precision = None
+    _method = None
+    _active = None
+    _ready = False
+    _warmup_seconds = None
+    _warmup_error = None
+
+    @classmethod
+    def _load_classifier(cls):
+        cls._classifier = cls
+        cls._model_name = cls.MODEL_NAME
+        cls._precision = cls.PRECISION
+        cls._method = "stub"
+
+    @classmethod
+    def preload(cls):
+        cls.get_classifier()
+
+    @classmethod
+    def analyze_batch(cls, texts: list) -> list:
+        if not texts:
+            return []
+
+        started = time.perf_counter()
+        cls.get_classifier()
+        with timed('forward'):
+            if cls.LATENCY_MS > 0:
+                time.sleep(cls.LATENCY_MS * len(texts) / 1000.0)
+        cls._ready = True
+
+        with timed('result_build'):
+            results = []
+            for text in texts:
+                digest = hashlib.sha256(text.encode('utf-8')).digest()
+                raw = [digest[i] + 1 for i in range(len(cls.TAXONOMY))]
+                total = sum(raw)
+                ranked = sorted(
+                    zip(cls.TAXONOMY, (value / total for value in raw)),
+                    key=lambda item: item[1], reverse=True
+                )
+                results.append(cls._build_result({
+                    "labels": [label for label, _ in ranked],
+                    "scores": [score for _, score in ranked],
+                }))
+        cls._log_results(texts, results, time.perf_counter() - started)
+        return results
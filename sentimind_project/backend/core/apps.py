@@ -1,5 +1,40 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Warm-up del modelo al arrancar el worker (MODEL_WARMUP):
+        # - off: carga perezosa en la primera peticion
+        # - background: carga en un hilo; /ready/ responde 503 hasta terminar
+        # - blocking: carga antes de que el worker acepte peticiones
+        # - preload: solo carga los pesos (master de gunicorn con preload_app);
+        #   gunicorn.conf.py hace el warm-up en cada worker tras el fork
+        mode = settings.MODEL_WARMUP
+        if mode == 'off':
+            return
+
+        from core.application.engines import get_engine
+        engine = get_engine()
+
+        if mode == 'preload':
+            engine.preload()
+        elif mode == 'blocking':
+            engine.warmup()
+        else:
+            threading.Thread(
+                target=self._background_warmup, args=(engine,),
+                name='model-warmup', daemon=True
+            ).start()
+
+    @staticmethod
+    def _background_warmup(engine):
+        try:
+            engine.warmup()
+        except Exception:
+            # El error queda en engine.readiness() y /ready/ sigue en 503
+            pass
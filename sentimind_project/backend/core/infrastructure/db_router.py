@@ -0,0 +1,50 @@
+"""
+Enrutado de lecturas a replicas (DATABASE_REPLICA_URLS).
+
+Solo leen de una replica las consultas hechas dentro de replica_reads(): el
+feed publico tolera unos segundos de retraso de replicacion, pero un post
+recien creado se serializa (y sus categorias se leen) desde la primaria.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Las lecturas del bloque van a una replica, si hay alguna configurada."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_alias() -> str:
+    """Alias de una replica para lecturas largas (exportaciones), o 'default' si no hay."""
+    replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+    return random.choice(replicas) if replicas else 'default'
+
+
+class ReplicaRouter:
+    """Escrituras y migraciones en default; lecturas en una replica solo dentro de replica_reads()."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las replicas tienen los mismos datos que default
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == 'default'
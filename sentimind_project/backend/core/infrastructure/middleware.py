@@ -0,0 +1,125 @@
+"""
+Middlewares de diagnostico.
+"""
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.application import request_context
+from core.application.metrics import MetricsRegistry, start_request, end_request
+
+
+logger = logging.getLogger('sentimind.request')
+
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class QueryCountMiddleware:
+    """
+    Cuenta las consultas SQL de cada peticion y las expone en la cabecera
+    X-DB-Queries. Se activa con QUERY_COUNT_HEADER (ver settings).
+
+    En respuestas en streaming solo cuenta las consultas hechas antes de
+    empezar a enviar el cuerpo.
+    """
+
+    HEADER = 'X-DB-Queries'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = [0]
+
+        def count(execute, sql, params, many, context):
+            counter[0] += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count))
+            response = self.get_response(request)
+
+        response[self.HEADER] = str(counter[0])
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Registra cada peticion en MetricsRegistry (contador y duracion por vista
+    y status) y, con SERVER_TIMING_HEADER, agrega la cabecera Server-Timing
+    con el tiempo de cada etapa medida durante la peticion:
+
+        Server-Timing: classification;dur=412.3, forward;dur=380.1, db_write;dur=6.2, total;dur=431.0
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'SERVER_TIMING_HEADER', False)
+
+    def __call__(self, request):
+        token = start_request()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = end_request(token)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else 'unmatched'
+        MetricsRegistry.get_instance().observe_request(request.method, view, response.status_code, elapsed)
+
+        if self.server_timing:
+            entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+            entries.append(f"total;dur={elapsed * 1000:.1f}")
+            response['Server-Timing'] = ", ".join(entries)
+        return response
+
+
+class RequestIdMiddleware:
+    """
+    Asigna un request id a cada peticion (el de la cabecera X-Request-ID si
+    viene de un proxy, o uno nuevo), lo devuelve en la respuesta y lo pone a
+    disposicion de los logs. Al terminar registra la peticion con su latencia
+    y los campos que hayan agregado las capas internas (request_context.annotate),
+    muestreada segun LOG_REQUEST_SAMPLE_RATE; los errores 5xx se registran siempre.
+    """
+
+    HEADER = 'X-Request-ID'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'LOG_REQUEST_SAMPLE_RATE', 1.0)
+
+    def __call__(self, request):
+        incoming = request.headers.get(self.HEADER, '')
+        request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        # Para los logs de django.request, que se emiten despues de end()
+        request.request_id = request_id
+
+        token = request_context.begin(request_id)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            fields = request_context.end(token)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        if response.status_code >= 500 or random.random() < self.sample_rate:
+            logger.info("request", extra={
+                **fields,
+                "http_method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "latency_ms": round(latency_ms, 1),
+            })
+
+        response[self.HEADER] = request_id
+        return response
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    Paginacion keyset del feed sobre (-created_at, -id).
+
+    Cada pagina es una consulta por rango sobre el indice core_post_feed_idx,
+    asi que su coste no depende del total de posts.
+
+    Parametros:
+    - cursor: cursor opaco de los enlaces next/previous.
+    - page_size: tamaño de pagina (maximo max_page_size).
+    - since: id del post mas reciente que ya tiene el cliente; solo se
+      retornan posts mas nuevos que ese.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = settings.FEED_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    since_query_param = 'since'
+
+    def get_ordering(self, request, queryset, view):
+        # Filtro ?category=: ordenar por la copia de created_at en PostCategory
+        # para recorrer core_postcat_feed_idx (category, -created_at, -post)
+        if 'category_created_at' in queryset.query.annotations:
+            return ('-category_created_at', '-category_post_id')
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        since = request.query_params.get(self.since_query_param)
+        if since:
+            queryset = self._filter_since(queryset, since)
+        return super().paginate_queryset(queryset, request, view)
+
+    def _filter_since(self, queryset, since):
+        try:
+            anchor = queryset.model.objects.filter(pk=int(since)).values('created_at', 'id').first()
+        except ValueError:
+            anchor = None
+        if anchor is None:
+            raise ValidationError({self.since_query_param: "Post no encontrado."})
+        return queryset.filter(
+            Q(created_at__gt=anchor['created_at']) |
+            Q(created_at=anchor['created_at'], id__gt=anchor['id'])
+        )
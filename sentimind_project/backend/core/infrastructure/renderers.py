@@ -0,0 +1,41 @@
+"""
+Renderer JSON con orjson para las respuestas grandes (feed de posts).
+"""
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin el se usa el JSONRenderer de DRF
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que serializa con orjson.
+
+    La salida es identica byte a byte a la de JSONRenderer con la
+    configuracion por defecto de DRF (compacta, UTF-8 sin escapar, U+2028 y
+    U+2029 escapados). orjson escribe los floats con la misma representacion
+    minima que json salvo en notacion exponencial (|x| < 1e-4 o >= 1e16);
+    las confidencias estan redondeadas a 2 decimales y nunca caen ahi.
+
+    Con indent (API navegable, Accept: ...; indent=4), ensure_ascii o sin
+    orjson instalado se usa JSONRenderer.
+    """
+
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            # default: fechas, Decimal, cadenas lazy, ... como el encoder de DRF.
+            # orjson escribe las fechas aware con +00:00 y DRF con Z: las
+            # fechas pasan tambien por el encoder de DRF
+            ret = orjson.dumps(data, default=self._encoder.default,
+                               option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
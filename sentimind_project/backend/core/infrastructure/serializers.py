@@ -44,10 +44,65 @@ class PostSerializer(serializers.ModelSerializer):
             'category', 'confidence',  # Compatibilidad con frontend existente
             'primary_category', 'primary_confidence',
             'categories',  # Nueva: lista de todas las categorias
+            'classification_status',  # pending mientras la IA corre en segundo plano
             'created_at'
         ]
         read_only_fields = ['id', 'author', 'category', 'confidence', 'primary_category', 
-                           'primary_confidence', 'categories', 'created_at']
+                           'primary_confidence', 'categories', 'classification_status', 'created_at']
+
+
+# Ruta rapida de lectura del feed: mismo JSON que PostSerializer sin
+# instanciar modelos ni campos de DRF por post y categoria
+
+POST_ROW_FIELDS = (
+    'id', 'content', 'author_id', 'author__username', 'primary_category',
+    'primary_confidence', 'classification_status', 'created_at',
+)
+
+_created_at_field = serializers.DateTimeField()
+
+
+def post_rows(queryset):
+    """
+    Filas .values() del queryset de posts para serialize_post_rows. Conserva
+    las anotaciones (la paginacion por cursor ordena por ellas con ?category=).
+    """
+    return queryset.prefetch_related(None).values(*POST_ROW_FIELDS, *queryset.query.annotations)
+
+
+def serialize_post_rows(rows: list) -> list:
+    """
+    Representacion de PostSerializer (mismas claves, en el mismo orden) para
+    filas de post_rows. Las categorias de toda la pagina salen de una sola
+    consulta, con el orden de PostCategory.Meta.ordering, igual que el
+    prefetch de PostSerializer.
+    """
+    if not rows:
+        return []
+    categories = {row['id']: [] for row in rows}
+    for post_id, name, confidence in PostCategory.objects.filter(
+        post_id__in=list(categories)
+    ).values_list('post_id', 'category__name', 'confidence'):
+        categories[post_id].append({'name': name, 'confidence': float(confidence)})
+
+    return [
+        {
+            'id': row['id'],
+            'content': row['content'],
+            'author': (
+                {'id': row['author_id'], 'username': row['author__username']}
+                if row['author_id'] is not None else None
+            ),
+            'category': row['primary_category'],
+            'confidence': float(row['primary_confidence']),
+            'primary_category': row['primary_category'],
+            'primary_confidence': float(row['primary_confidence']),
+            'categories': categories[row['id']],
+            'classification_status': row['classification_status'],
+            'created_at': _created_at_field.to_representation(row['created_at']),
+        }
+        for row in rows
+    ]
 
 
 class PostCreateSerializer(serializers.Serializer):
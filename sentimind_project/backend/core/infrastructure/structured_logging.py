@@ -0,0 +1,132 @@
+"""
+Logging estructurado (JSON) con escritura fuera del hilo de la peticion.
+Se configura desde settings.LOGGING.
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from core.application import request_context
+
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+# Atributos estandar de LogRecord: el resto son campos de extra={...}
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Agrega el request id de la peticion en curso a cada registro. Los de
+    django.request (4xx/5xx) se emiten cuando RequestIdMiddleware ya cerro el
+    contexto: para esos se toma el id guardado en record.request.
+    """
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = request_context.request_id() or getattr(
+                getattr(record, 'request', None), 'request_id', None
+            )
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Un objeto JSON por linea:
+
+        {"ts": "...", "level": "INFO", "logger": "core.ai", "message": "...",
+         "request_id": "9f1c...", "latency_ms": 412.3, "model_method": "xlm-roberta-local:fp32"}
+
+    Los campos pasados con extra={...} se agregan tal cual.
+    """
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        elif record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Encola los registros en memoria y los escribe en stdout desde un hilo
+    QueueListener, asi la peticion no espera la E/S del log.
+
+    La cola es acotada (max_size): si el listener no da abasto los registros
+    nuevos se descartan y se cuentan en dropped, en lugar de bloquear la
+    peticion o crecer sin limite.
+
+    El listener se arranca en el primer registro de cada proceso: tras el
+    fork de gunicorn el hilo del master no existe en los workers. Se detiene
+    en close(), que logging.shutdown llama al salir.
+    """
+
+    def __init__(self, log_format: str = 'json', max_size: int = 10000, stream=None):
+        super().__init__(queue.Queue(max_size))
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.target.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def emit(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def prepare(self, record):
+        # El listener formatea en otro hilo: resolver aqui el mensaje y la
+        # traza (el traceback referencia frames de este hilo)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.target.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        with self._listener_lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+        super().close()
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def _reset_after_fork(self):
+        # Los registros que el master dejo en cola no son de este proceso
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
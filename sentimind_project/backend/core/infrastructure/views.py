@@ -1,26 +1,69 @@
 from rest_framework import generics, status, permissions
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import transaction
-from core.models import Post, Category, PostCategory
-from core.infrastructure.serializers import PostSerializer
+from django.conf import settings
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from contextlib import nullcontext
+from datetime import timedelta, timezone as dt_timezone
+from core.models import Post, Category
+from core.infrastructure.serializers import PostSerializer, post_rows, serialize_post_rows
+from core.infrastructure.renderers import FastJSONRenderer
+from core.infrastructure.pagination import PostCursorPagination
+from core.infrastructure.db_router import replica_alias, replica_reads
 from core.application.ai_service import MiningEngine
-import traceback
+from core.application.analytics import (
+    GRANULARITIES, emotion_distribution, top_categories, author_profile
+)
+from core.application.classification import classify, inference_stats
+from core.application.export import CONTENT_TYPES, export_lines
+from core.application.feed_cache import FeedCache
+from core.application.metrics import timed
+from core.application.model_registry import ModelRegistry, select_model
+from core.application.post_service import create_post, enqueue_post
+from core.application.ingestion import ingest, iter_ndjson_items, parse_json_items
+import json
+import logging
 
 
+logger = logging.getLogger(__name__)
+
+
+def filter_by_category(queryset, category: str):
+    """
+    Posts que contienen la categoria, via PostCategory y sin JOIN con Category
+    ni DISTINCT: (post, category) es unico, asi que no hay filas duplicadas.
+
+    Anota category_created_at/category_post_id (columnas de PostCategory) para
+    que PostCursorPagination ordene por ellas y la consulta sea un rango sobre
+    core_postcat_feed_idx (category, -created_at, -post).
+    """
+    category_id = Category.objects.filter(name=category).values_list('id', flat=True).first()
+    if category_id is None:
+        return queryset.none()
+    return queryset.filter(post_categories__category_id=category_id).annotate(
+        category_created_at=F('post_categories__created_at'),
+        category_post_id=F('post_categories__post_id')
+    )
 
 
 class PostListCreateView(generics.ListCreateAPIView):
     """
     Endpoint principal:
-    - GET: Lista posts con filtro por categoria
+    - GET: Lista posts con filtro por categoria (paginacion por cursor)
     - POST: Crea un post y ejecuta la IA automaticamente
+      (o lo deja pendiente para el worker si ASYNC_CLASSIFICATION esta activo)
     """
     queryset = Post.objects.select_related('author').prefetch_related('post_categories__category').all()
     serializer_class = PostSerializer
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['primary_category']
+    filterset_fields = ['primary_category', 'classification_status']
+    pagination_class = PostCursorPagination
     permission_classes = [permissions.AllowAny]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     def get_queryset(self):
         """Permite filtrar por cualquier categoria."""
@@ -28,7 +71,7 @@ class PostListCreateView(generics.ListCreateAPIView):
         
         category = self.request.query_params.get('category')
         if category:
-            queryset = queryset.filter(categories__name=category).distinct()
+            queryset = filter_by_category(queryset, category)
         
         # Filtro por posts propios
         mine = self.request.query_params.get('mine')
@@ -37,7 +80,46 @@ class PostListCreateView(generics.ListCreateAPIView):
         
         return queryset
 
-    @transaction.atomic
+    def list(self, request, *args, **kwargs):
+        feed_cache = FeedCache.get_instance()
+        # Solo el feed publico en JSON: "mine" depende del usuario
+        if feed_cache is None or request.query_params.get('mine') or request.accepted_renderer.format != 'json':
+            return self._list(request)
+
+        with timed('feed_cache'):
+            key = feed_cache.make_key(list(request.query_params.lists()), request.build_absolute_uri('/'))
+            entry = feed_cache.get(key)
+        if entry is None:
+            response = self._list(request)
+            with timed('serialize'):
+                entry = feed_cache.set(key, FastJSONRenderer().render(response.data))
+        etag, body = entry
+        if feed_cache.not_modified(etag, request.headers.get('If-None-Match')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        # El cliente puede guardar la respuesta pero debe revalidarla (304 si no cambio)
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def _list(self, request):
+        # El feed publico lee de una replica (si hay); "mine" lee de la
+        # primaria para que el autor vea enseguida sus posts recien creados
+        reads = nullcontext() if request.query_params.get('mine') else replica_reads()
+        with reads:
+            queryset = self.filter_queryset(self.get_queryset())
+            if settings.FEED_FAST_SERIALIZER:
+                queryset = post_rows(queryset)
+            with timed('db_read'):
+                page = self.paginate_queryset(queryset)
+            with timed('serialize'):
+                if settings.FEED_FAST_SERIALIZER:
+                    data = serialize_post_rows(page)
+                else:
+                    data = self.get_serializer(page, many=True).data
+        return self.get_paginated_response(data)
+
     def create(self, request, *args, **kwargs):
         try:
             content = request.data.get('content')
@@ -48,12 +130,20 @@ class PostListCreateView(generics.ListCreateAPIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # 1. Llamar a la capa de mineria
+            author = request.user if request.user.is_authenticated else None
+            
+            # Modo asincrono: guardar como pendiente y dejar la IA al worker
+            if settings.ASYNC_CLASSIFICATION:
+                post = enqueue_post(content, author)
+                with timed('serialize'):
+                    data = self.get_serializer(post).data
+                return Response(data, status=status.HTTP_202_ACCEPTED)
+            
+            # 1. Llamar a la capa de mineria (fuera de cualquier transaccion)
             try:
-                analysis = MiningEngine.analyze(content)
-            except Exception as e:
-                print(f"Error en analisis: {e}")
-                traceback.print_exc()
+                analysis = classify(content)
+            except Exception:
+                logger.exception("Error en analisis, usando clasificacion de respaldo")
                 analysis = {
                     "emotions": [{"name": "Reflexión", "confidence": 0.5}],
                     "main_sentiment": "Reflexión",
@@ -61,36 +151,112 @@ class PostListCreateView(generics.ListCreateAPIView):
                     "method": "fallback-error"
                 }
             
-            # 2. Crear la entidad Post con el autor
-            post = Post.objects.create(
-                content=content,
-                author=request.user if request.user.is_authenticated else None,
-                primary_category=analysis['main_sentiment'],
-                primary_confidence=analysis['confidence_score']
-            )
-            
-            # 3. Crear las relaciones con las categorias detectadas
-            for cat_data in analysis['emotions']:
-                category, _ = Category.objects.get_or_create(name=cat_data['name'])
-                PostCategory.objects.create(
-                    post=post,
-                    category=category,
-                    confidence=cat_data['confidence']
-                )
+            # 2. Crear el Post con el autor y sus categorias detectadas
+            post = create_post(content, author, analysis)
             
-            # 4. Serializar respuesta
-            serializer = self.get_serializer(post)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # 3. Serializar respuesta
+            with timed('serialize'):
+                data = self.get_serializer(post).data
+            return Response(data, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            print(f"Error creando post: {e}")
-            traceback.print_exc()
+            logger.exception("Error creando post")
             return Response(
                 {"error": f"Error interno del servidor: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
+class PostBulkCreateView(generics.GenericAPIView):
+    """
+    Ingesta masiva de posts (migraciones e importaciones).
+    - Body JSON: lista de strings u objetos {"content": ...}
+    - Body NDJSON (Content-Type: application/x-ndjson): un post por linea
+
+    Clasifica en batches y escribe con bulk_create. La respuesta es un
+    stream NDJSON con el estado de cada item y el progreso por batch.
+
+    El cuerpo NDJSON se lee linea a linea mientras se envia la respuesta:
+    en memoria solo esta el batch en curso. Al pasar BULK_INGEST_MAX_ITEMS
+    la ingesta se corta con un evento de error (un cuerpo JSON, que hay que
+    parsear entero, se rechaza antes con 400). Un cuerpo NDJSON sin
+    Content-Length (chunked) se rechaza con 411.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if request.content_type.startswith('application/x-ndjson'):
+            stream = request.stream
+            if stream is None and not request.META.get('CONTENT_LENGTH'):
+                # Sin Content-Length (Transfer-Encoding: chunked) WSGI no
+                # entrega el cuerpo: responder 200 con 0 posts perderia los datos
+                return Response(
+                    {"error": "El cuerpo NDJSON requiere Content-Length (no se admite Transfer-Encoding: chunked)"},
+                    status=status.HTTP_411_LENGTH_REQUIRED
+                )
+            items = iter_ndjson_items(iter(stream.readline, b'')) if stream is not None else ()
+        else:
+            try:
+                items = parse_json_items(request.data)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            if len(items) > settings.BULK_INGEST_MAX_ITEMS:
+                return Response(
+                    {"error": f"Maximo {settings.BULK_INGEST_MAX_ITEMS} posts por peticion"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        events = ingest(
+            items, author=request.user,
+            batch_size=settings.BULK_INGEST_BATCH_SIZE, max_items=settings.BULK_INGEST_MAX_ITEMS
+        )
+        return StreamingHttpResponse(
+            (json.dumps(event, ensure_ascii=False) + "\n" for event in events),
+            content_type='application/x-ndjson'
+        )
+
+
+class PostExportView(generics.GenericAPIView):
+    """
+    Exportacion completa de posts y clasificaciones en streaming (solo admin).
+    - output: ndjson (por defecto) | csv
+    - since / until: ISO 8601, rango [since, until) de created_at
+    - category: solo posts con esa categoria
+
+    Lee de una replica si hay alguna (DATABASE_REPLICA_URLS).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        try:
+            lines = export_lines(
+                output,
+                using=replica_alias(),
+                since=_parse_moment(request.query_params.get('since')),
+                until=_parse_moment(request.query_params.get('until')),
+                category=request.query_params.get('category'),
+                chunk_size=settings.EXPORT_CHUNK_SIZE,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[output])
+        filename = f"posts-{timezone.now():%Y%m%dT%H%M%S}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class PostDetailView(generics.RetrieveAPIView):
+    """
+    Endpoint de detalle de un post.
+    Permite consultar el estado de una clasificacion asincrona (polling).
+    """
+    queryset = Post.objects.select_related('author').prefetch_related('post_categories__category').all()
+    serializer_class = PostSerializer
+    permission_classes = [permissions.AllowAny]
+
+
 class CategoryListView(generics.GenericAPIView):
     """
     Endpoint para obtener las categorías disponibles.
@@ -99,3 +265,99 @@ class CategoryListView(generics.GenericAPIView):
         return Response({
             "categories": MiningEngine.TAXONOMY
         })
+
+
+class InferenceStatsView(generics.GenericAPIView):
+    """
+    Endpoint con los contadores de inferencia del worker actual
+    (throughput y profundidad de cola del micro-batching). Solo admin.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(inference_stats())
+
+
+class ModelRegistryView(generics.GenericAPIView):
+    """
+    Registro de modelos del worker actual (solo admin):
+    - GET: modelo activo, cambio en curso y latencia por modelo
+    - POST {"model": nombre}: elige el modelo activo para todos los workers;
+      cada uno lo carga en segundo plano y cambia al terminar el warm-up
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(ModelRegistry.get_instance().status())
+
+    def post(self, request):
+        registry = ModelRegistry.get_instance()
+        try:
+            name = select_model(request.data.get('model', ''))
+            registry.activate(name)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(registry.status(), status=status.HTTP_202_ACCEPTED)
+
+
+class EmotionDistributionView(generics.GenericAPIView):
+    """
+    Distribucion de emociones por hora o por dia (UTC), desde los rollups.
+    - granularity: hour (por defecto) | day
+    - since / until: ISO 8601 (por defecto, las ultimas 24 horas o 30 dias)
+    - category: limita a una categoria
+    """
+    DEFAULT_RANGES = {'hour': timedelta(hours=24), 'day': timedelta(days=30)}
+
+    def get(self, request):
+        granularity = request.query_params.get('granularity', 'hour')
+        if granularity not in GRANULARITIES:
+            return Response(
+                {"error": f"granularity debe ser una de: {', '.join(GRANULARITIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            until = _parse_moment(request.query_params.get('until')) or timezone.now()
+            since = _parse_moment(request.query_params.get('since')) or until - self.DEFAULT_RANGES[granularity]
+            buckets = emotion_distribution(
+                granularity, since, until, category=request.query_params.get('category')
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"granularity": granularity, "buckets": buckets})
+
+
+class TopCategoriesView(generics.GenericAPIView):
+    """Categorias mas frecuentes de los ultimos ?days= dias (7 por defecto)."""
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 7))
+            limit = int(request.query_params.get('limit', 5))
+        except ValueError:
+            return Response({"error": "days y limit deben ser enteros"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= days <= 366 or not 1 <= limit <= 50:
+            return Response(
+                {"error": "days debe estar entre 1 y 366, limit entre 1 y 50"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({"days": days, "categories": top_categories(days, limit)})
+
+
+class AuthorEmotionProfileView(generics.GenericAPIView):
+    """Perfil emocional de un autor (conteo y proporcion por categoria)."""
+
+    def get(self, request, author_id):
+        return Response(author_profile(author_id))
+
+
+def _parse_moment(value):
+    """ISO 8601 -> datetime aware (UTC si no trae zona); None si no hay valor."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Fecha invalida: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
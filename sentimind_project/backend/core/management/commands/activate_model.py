@@ -0,0 +1,43 @@
+"""
+Elige el modelo activo del registro para todos los workers. Cada worker lo
+detecta en menos de MODEL_SWITCH_POLL_SECONDS, lo carga en segundo plano y
+cambia cuando termina el warm-up, sin reiniciar.
+
+Uso:
+    python manage.py activate_model --list
+    python manage.py activate_model bart-large-mnli
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.application.model_registry import ModelRegistry, select_model
+from core.models import ModelSelection
+
+
+class Command(BaseCommand):
+    help = "Cambia el modelo zero-shot activo sin reiniciar los workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help="Nombre del modelo en el registro.")
+        parser.add_argument(
+            '--list', action='store_true',
+            help="Muestra los modelos del registro y el seleccionado."
+        )
+
+    def handle(self, *args, **options):
+        if options['list'] or not options['name']:
+            registry = ModelRegistry.get_instance()
+            selected = ModelSelection.objects.values_list('name', flat=True).filter(pk=1).first()
+            selected = selected or registry.initial
+            for name, spec in registry.specs.items():
+                marker = '*' if name == selected else ' '
+                self.stdout.write(
+                    f"{marker} {name}: {spec['model']} "
+                    f"(precision={spec.get('precision') or registry.engine.PRECISION}, load={spec.get('load', 'lazy')})"
+                )
+            return
+
+        try:
+            name = select_model(options['name'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"[OK] Modelo activo: {name} (los workers cambian en segundo plano)")
@@ -0,0 +1,71 @@
+"""
+Reconstruye las tablas de analitica (EmotionRollup, AuthorEmotionRollup)
+a partir de PostCategory. Necesario al desplegar los rollups sobre una base
+con posts existentes, o para corregir desvios (p. ej. posts borrados desde
+el admin, que no descuentan de los rollups).
+
+Uso:
+    python manage.py backfill_analytics
+"""
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+from core.models import PostCategory, EmotionRollup, AuthorEmotionRollup
+
+
+class Command(BaseCommand):
+    help = "Recalcula los rollups de analitica de emociones desde PostCategory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Filas por INSERT masivo."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        truncations = {
+            EmotionRollup.GRANULARITY_HOUR: TruncHour('created_at', tzinfo=dt_timezone.utc),
+            EmotionRollup.GRANULARITY_DAY: TruncDay('created_at', tzinfo=dt_timezone.utc),
+        }
+
+        with transaction.atomic():
+            EmotionRollup.objects.all().delete()
+            AuthorEmotionRollup.objects.all().delete()
+
+            for granularity, truncation in truncations.items():
+                rows = (
+                    PostCategory.objects
+                    .annotate(bucket=truncation)
+                    .values('bucket', 'category_id')
+                    .annotate(count=Count('id'), confidence_sum=Sum('confidence'))
+                    .order_by()
+                )
+                created = EmotionRollup.objects.bulk_create(
+                    (EmotionRollup(granularity=granularity, **row) for row in rows.iterator()),
+                    batch_size=batch_size
+                )
+                self.stdout.write(f"[OK] {len(created)} franjas de {granularity}")
+
+            rows = (
+                PostCategory.objects
+                .filter(post__author__isnull=False)
+                .values('post__author_id', 'category_id')
+                .annotate(count=Count('id'), confidence_sum=Sum('confidence'))
+                .order_by()
+            )
+            created = AuthorEmotionRollup.objects.bulk_create(
+                (
+                    AuthorEmotionRollup(
+                        author_id=row['post__author_id'], category_id=row['category_id'],
+                        count=row['count'], confidence_sum=row['confidence_sum']
+                    )
+                    for row in rows.iterator()
+                ),
+                batch_size=batch_size
+            )
+            self.stdout.write(f"[OK] {len(created)} perfiles autor/categoria")
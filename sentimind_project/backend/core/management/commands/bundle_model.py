@@ -0,0 +1,105 @@
+"""
+Descarga (o convierte) modelos una sola vez a un artefacto local versionado
+en MODEL_ARTIFACTS_DIR: pesos en safetensors, tokenizer rapido ya
+convertido y un manifest con la revision y el sha256 de cada archivo.
+Los workers cargan desde el artefacto sin consultar el hub; con
+MODEL_OFFLINE=True es la unica fuente permitida.
+
+Uso:
+    python manage.py bundle_model                      # modelo inicial y su cadena de fallback
+    python manage.py bundle_model xlm-roberta embedding
+    python manage.py bundle_model --all --keep 2
+    python manage.py bundle_model --verify
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.application import model_artifacts
+from core.application.model_registry import ModelRegistry
+
+
+# Artefacto del bi-encoder de EmbeddingEngine (fuera del registro de modelos)
+EMBEDDING = "embedding"
+
+
+class Command(BaseCommand):
+    help = "Empaqueta modelos como artefactos locales para arrancar sin red."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names', nargs='*',
+            help="Modelos del registro (o 'embedding'). Por defecto, el inicial y sus fallbacks."
+        )
+        parser.add_argument('--all', action='store_true', help="Todos los modelos del registro y el de embeddings.")
+        parser.add_argument('--revision', help="Revision del hub (rama, tag o commit) a empaquetar.")
+        parser.add_argument('--keep', type=int, default=2, help="Versiones a conservar por modelo (0: todas).")
+        parser.add_argument('--verify', action='store_true', help="Comprueba los sha256 de los artefactos actuales.")
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry.get_instance()
+        sources = {name: spec["model"] for name, spec in registry.specs.items()}
+        from core.application.embedding_engine import EmbeddingEngine
+        sources[EMBEDDING] = EmbeddingEngine.MODEL_NAME
+
+        names = options['names']
+        if options['all']:
+            names = list(sources)
+        elif not names:
+            names = self._fallback_chain(registry)
+        unknown = [name for name in names if name not in sources]
+        if unknown:
+            raise CommandError(f"Modelos desconocidos: {', '.join(unknown)} (disponibles: {', '.join(sources)})")
+
+        if options['verify']:
+            self._verify(names)
+            return
+
+        if getattr(settings, 'MODEL_OFFLINE', False):
+            raise CommandError("bundle_model descarga del hub: ejecutalo con MODEL_OFFLINE=False")
+
+        for name in names:
+            self.stdout.write(f"Empaquetando {name} ({sources[name]})...")
+            path = self._bundle(name, sources[name], options['revision'])
+            self.stdout.write(f"[OK] {name} -> {path}")
+            if options['keep'] > 0:
+                for version in model_artifacts.prune(name, options['keep']):
+                    self.stdout.write(f"     version antigua eliminada: {version}")
+
+    def _fallback_chain(self, registry):
+        names = []
+        name = registry.initial
+        while name and name not in names:
+            names.append(name)
+            name = registry.specs[name].get("fallback")
+        return names
+
+    def _bundle(self, name, model_id, revision):
+        from transformers import AutoTokenizer, AutoModel, AutoModelForSequenceClassification
+
+        if name == EMBEDDING:
+            model_class, task = AutoModel, "feature-extraction"
+        else:
+            model_class, task = AutoModelForSequenceClassification, "zero-shot-classification"
+        # use_fast=True convierte el tokenizer de sentencepiece a tokenizer.json
+        # una sola vez aqui, en lugar de en cada arranque
+        tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True, revision=revision)
+        model = model_class.from_pretrained(model_id, revision=revision)
+        return model_artifacts.write_artifact(name, model_id, model, tokenizer, task)
+
+    def _verify(self, names):
+        failed = False
+        for name in names:
+            artifact = model_artifacts.current_artifact(name)
+            if artifact is None:
+                self.stdout.write(f"[FALTA] {name}: sin artefacto en {model_artifacts.artifacts_dir()}")
+                failed = True
+                continue
+            path, manifest = artifact
+            broken = model_artifacts.verify(path, manifest)
+            if broken:
+                self.stdout.write(f"[ERROR] {name}: archivos alterados o ausentes: {', '.join(broken)}")
+                failed = True
+            else:
+                self.stdout.write(f"[OK] {name}: {path} ({manifest['model']}@{manifest.get('revision')})")
+        if failed:
+            raise CommandError("Hay artefactos ausentes o corruptos")
@@ -0,0 +1,44 @@
+"""
+Limpia el nivel persistente de la cache de clasificacion.
+
+Uso:
+    python manage.py clear_classification_cache          # solo entradas obsoletas
+    python manage.py clear_classification_cache --keep <huella> [--keep <huella> ...]
+    python manage.py clear_classification_cache --all
+
+Sin --keep, la huella que se conserva es la del motor activo (SCORING_MODE)
+con el modelo que cargaria un worker: el del registro seleccionado con
+activate_model o ACTIVE_MODEL, siguiendo la cadena de fallback. Para eso el
+comando carga el modelo; --keep lo evita.
+"""
+from django.core.management.base import BaseCommand
+
+from core.application.classification_cache import ClassificationCache
+from core.application.engines import get_engine
+from core.models import ClassificationCacheEntry
+
+
+class Command(BaseCommand):
+    help = "Borra entradas de la cache persistente de clasificacion."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Borra todas las entradas, no solo las de configuraciones anteriores."
+        )
+        parser.add_argument(
+            '--keep', action='append', default=[], metavar='HUELLA',
+            help="Huella a conservar (repetible). Sin --keep se conserva la del motor activo."
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            deleted, _ = ClassificationCacheEntry.objects.all().delete()
+        else:
+            engine = get_engine()
+            if not options['keep']:
+                # La huella depende del modelo y la precision efectivos tras la carga
+                engine.get_classifier()
+            cache = ClassificationCache(max_entries=0, persistent=True, engine=engine)
+            deleted = cache.purge_stale(keep=options['keep'])
+        self.stdout.write(f"[OK] {deleted} entradas eliminadas de la cache de clasificacion")
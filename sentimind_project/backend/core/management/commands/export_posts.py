@@ -0,0 +1,65 @@
+"""
+Exporta posts y sus clasificaciones en NDJSON o CSV, en streaming
+(memoria constante sea cual sea el tamaño del corpus).
+
+Uso:
+    python manage.py export_posts --output posts.ndjson
+    python manage.py export_posts --format csv --since 2026-01-01T00:00:00 --category Alegría > posts.csv
+"""
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.application.export import EXPORT_FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Exporta posts y clasificaciones en NDJSON o CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', help="Archivo de salida (por defecto, stdout).")
+        parser.add_argument('--since', help="ISO 8601: posts creados desde este momento.")
+        parser.add_argument('--until', help="ISO 8601: posts creados antes de este momento.")
+        parser.add_argument('--category', help="Solo posts con esta categoria.")
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.EXPORT_CHUNK_SIZE,
+            help="Posts leidos por consulta."
+        )
+        parser.add_argument('--database', default='default', help="Alias de la base (p. ej. una replica).")
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options['format'],
+            using=options['database'],
+            since=_moment(options['since']),
+            until=_moment(options['until']),
+            category=options['category'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = -1 if options['format'] == 'csv' else 0
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f"[OK] {count:,} posts exportados a {options['output']}"))
+
+
+def _moment(value):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise CommandError(f"Fecha invalida: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
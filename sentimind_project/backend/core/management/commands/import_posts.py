@@ -0,0 +1,74 @@
+"""
+Importa posts desde un archivo JSON (lista) o NDJSON (uno por linea),
+clasificandolos en batches y escribiendolos con bulk_create.
+
+Uso:
+    python manage.py import_posts posts.ndjson
+    python manage.py import_posts posts.json --author admin --batch-size 128
+"""
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.application.ingestion import ingest, iter_ndjson_items, parse_json_items
+
+
+class Command(BaseCommand):
+    help = "Importa y clasifica posts en batches desde JSON o NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Archivo .json (lista) o .ndjson/.jsonl")
+        parser.add_argument(
+            '--format', choices=['json', 'ndjson'],
+            help="Formato del archivo (por defecto, segun la extension)."
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.BULK_INGEST_BATCH_SIZE,
+            help="Posts clasificados por llamada al modelo."
+        )
+        parser.add_argument('--author', help="Username al que se asignan los posts.")
+        parser.add_argument(
+            '--report', help="Archivo NDJSON donde guardar el estado de cada item."
+        )
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            try:
+                author = User.objects.get(username=options['author'])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario '{options['author']}'")
+
+        fmt = options['format'] or ('json' if options['path'].endswith('.json') else 'ndjson')
+        report = open(options['report'], 'w', encoding='utf-8') if options['report'] else None
+
+        try:
+            with open(options['path'], encoding='utf-8') as f:
+                if fmt == 'json':
+                    try:
+                        items = parse_json_items(json.load(f))
+                    except ValueError as e:
+                        raise CommandError(str(e))
+                else:
+                    # Lectura perezosa: solo un batch en memoria
+                    items = iter_ndjson_items(f)
+
+                for event in ingest(items, author=author, batch_size=options['batch_size']):
+                    if event['type'] == 'item':
+                        if report:
+                            report.write(json.dumps(event, ensure_ascii=False) + "\n")
+                    elif event['type'] == 'progress':
+                        self.stdout.write(
+                            f"  {event['processed']:>8,} procesados "
+                            f"({event['created']:,} creados, {event['failed']:,} con error)"
+                        )
+                    else:
+                        self.stdout.write(self.style.SUCCESS(
+                            f"[OK] Importacion terminada: {event['created']:,} creados, "
+                            f"{event['failed']:,} con error"
+                        ))
+        finally:
+            if report:
+                report.close()
@@ -0,0 +1,98 @@
+"""
+Worker local de clasificacion asincrona.
+Consume la cola ClassificationJob en batches y completa los posts pendientes.
+
+SIGTERM/SIGINT detienen el worker al terminar el batch en curso: los
+trabajos ya reservados no quedan en 'running' hasta el lock timeout.
+
+Uso:
+    python manage.py process_classification_jobs
+    python manage.py process_classification_jobs --once --batch-size 32
+"""
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.application.classification import classify_many
+from core.application.post_service import claim_jobs, complete_job, fail_job
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de clasificacion de posts pendientes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=getattr(settings, 'CLASSIFICATION_WORKER_BATCH_SIZE', 16),
+            help="Trabajos clasificados por llamada al modelo."
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'CLASSIFICATION_WORKER_POLL_SECONDS', 1.0),
+            help="Segundos de espera cuando la cola esta vacia."
+        )
+        parser.add_argument(
+            '--max-attempts', type=int,
+            default=getattr(settings, 'CLASSIFICATION_WORKER_MAX_ATTEMPTS', 3),
+            help="Intentos antes de marcar un post como failed."
+        )
+        parser.add_argument(
+            '--lock-timeout', type=int, default=600,
+            help="Segundos tras los cuales un trabajo 'running' se reencola."
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Vacia la cola y termina en lugar de quedarse escuchando."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self._stop = threading.Event()
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                previous[signum] = signal.signal(signum, self._request_stop)
+        self.stdout.write(f"[WORKER] Procesando cola de clasificacion (batch={batch_size})")
+
+        try:
+            while not self._stop.is_set():
+                jobs = claim_jobs(batch_size, options['lock_timeout'], options['max_attempts'])
+                if not jobs:
+                    if options['once']:
+                        break
+                    self._stop.wait(options['poll_interval'])
+                    continue
+                self._process(jobs, options['max_attempts'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+        if self._stop.is_set():
+            self.stdout.write("[WORKER] Detenido")
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write(f"[WORKER] Senal {signal.Signals(signum).name}: termina el batch en curso y sale")
+        self._stop.set()
+
+    def _process(self, jobs, max_attempts):
+        started = time.monotonic()
+        try:
+            analyses = classify_many([job.post.content for job in jobs])
+        except Exception as e:
+            self.stderr.write(f"[ERROR] Fallo la clasificacion del batch: {e}")
+            for job in jobs:
+                fail_job(job, e, max_attempts)
+            return
+
+        for job, analysis in zip(jobs, analyses):
+            try:
+                complete_job(job, analysis)
+            except Exception as e:
+                self.stderr.write(f"[ERROR] No se pudo guardar el post {job.post_id}: {e}")
+                fail_job(job, e, max_attempts)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"[OK] {len(jobs)} posts clasificados en {elapsed:.2f}s")
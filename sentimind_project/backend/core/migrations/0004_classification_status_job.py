@@ -0,0 +1,46 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_post_author_alter_post_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='classification_status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('done', 'Clasificado'), ('failed', 'Fallido')], db_index=True, default='done', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='primary_category',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='primary_confidence',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='ClassificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'En cola'), ('running', 'En proceso'), ('done', 'Terminado'), ('failed', 'Fallido')], default='queued', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='classification_job', to='core.post')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_job_status_created_idx')],
+            },
+        ),
+    ]
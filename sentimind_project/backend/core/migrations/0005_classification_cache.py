@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_classification_status_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassificationCacheEntry',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(db_index=True, max_length=64)),
+                ('result', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:52
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_post_created_at(apps, schema_editor):
+    Post = apps.get_model('core', 'Post')
+    PostCategory = apps.get_model('core', 'PostCategory')
+    PostCategory.objects.update(
+        created_at=Subquery(
+            Post.objects.filter(pk=OuterRef('post_id')).values('created_at')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postcategory',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(copy_post_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='postcategory',
+            name='created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='postcategory',
+            index=models.Index(fields=['category', '-created_at', '-post'], name='core_postcat_feed_idx'),
+        ),
+    ]
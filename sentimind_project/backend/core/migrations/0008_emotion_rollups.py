@@ -0,0 +1,43 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_postcategory_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorEmotionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('confidence_sum', models.FloatField(default=0.0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emotion_rollups', to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_rollups', to='core.category')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('author', 'category'), name='core_author_rollup_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmotionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hora'), ('day', 'Dia')], max_length=4)),
+                ('bucket', models.DateTimeField(help_text='Inicio de la franja (UTC)')),
+                ('count', models.IntegerField(default=0)),
+                ('confidence_sum', models.FloatField(default=0.0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='core.category')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket', 'category'), name='core_rollup_bucket_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.1.2 on 2026-10-18 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_emotion_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelSelection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
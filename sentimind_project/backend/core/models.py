@@ -21,6 +21,15 @@ class Post(models.Model):
     Entidad principal. Representa una publicacion en el muro.
     Soporta multiples emociones/categorias por post.
     """
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_DONE, 'Clasificado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
     content = models.TextField(help_text="El mensaje del usuario")
     
     # Autor del post (opcional para compatibilidad con posts anonimos)
@@ -41,16 +50,32 @@ class Post(models.Model):
     )
     
     # Categoria principal (la de mayor confianza) - para filtrado rapido
-    primary_category = models.CharField(max_length=50, db_index=True)
+    # Vacia mientras el post espera su clasificacion asincrona
+    primary_category = models.CharField(max_length=50, db_index=True, blank=True, default='')
     
     # Confianza de la categoria principal
-    primary_confidence = models.FloatField()
+    primary_confidence = models.FloatField(default=0.0)
+    
+    # Estado de la clasificacion (pending cuando la IA corre en segundo plano)
+    classification_status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_DONE,
+        db_index=True
+    )
     
     # Metadatos
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Feed paginado por cursor: (-created_at, -id)
+            models.Index(fields=['-created_at', '-id'], name='core_post_feed_idx'),
+            # Feed filtrado por ?primary_category= y por ?mine=
+            models.Index(fields=['primary_category', '-created_at', '-id'], name='core_post_primary_feed_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='core_post_author_feed_idx'),
+        ]
 
     def __str__(self):
         return f"[{self.primary_category}] {self.content[:30]}..."
@@ -69,9 +94,125 @@ class PostCategory(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='category_posts')
     confidence = models.FloatField(help_text="Nivel de confianza (0-1)")
     
+    # Copia desnormalizada de post.created_at: permite resolver
+    # "posts de la categoria X por fecha" como un rango sobre core_postcat_feed_idx
+    created_at = models.DateTimeField()
+    
     class Meta:
         unique_together = ('post', 'category')
         ordering = ['-confidence']
+        indexes = [
+            models.Index(fields=['category', '-created_at', '-post'], name='core_postcat_feed_idx'),
+        ]
     
     def __str__(self):
         return f"{self.post.id} - {self.category.name}: {self.confidence:.2%}"
+
+
+class ClassificationJob(models.Model):
+    """
+    Cola de trabajos de clasificacion respaldada en la base de datos.
+    Un trabajo por post pendiente; lo consume el comando process_classification_jobs.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'En cola'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Terminado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='classification_job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='core_job_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} (post {self.post_id}): {self.status}"
+
+
+class ClassificationCacheEntry(models.Model):
+    """
+    Nivel persistente de la cache de clasificacion, compartido por todos los workers.
+    La clave es el hash del texto normalizado mas la huella del modelo.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    fingerprint = models.CharField(max_length=64, db_index=True)
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.key[:12]}... ({self.result.get('main_sentiment')})"
+
+
+class EmotionRollup(models.Model):
+    """
+    Agregado de PostCategory por categoria y franja de tiempo (hora o dia, UTC).
+    Se actualiza de forma incremental al escribir PostCategory (ver
+    core.application.analytics) y se reconstruye con backfill_analytics.
+    count es IntegerField (no Positive): los descuentos se aplican con un
+    upsert cuya fila propuesta lleva el delta negativo.
+    """
+    GRANULARITY_HOUR = 'hour'
+    GRANULARITY_DAY = 'day'
+    GRANULARITY_CHOICES = [
+        (GRANULARITY_HOUR, 'Hora'),
+        (GRANULARITY_DAY, 'Dia'),
+    ]
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField(help_text="Inicio de la franja (UTC)")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='rollups')
+    count = models.IntegerField(default=0)
+    confidence_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket', 'category'], name='core_rollup_bucket_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket:%Y-%m-%d %H:%M} {self.category_id}: {self.count}"
+
+
+class AuthorEmotionRollup(models.Model):
+    """Perfil emocional de un autor: posts y suma de confianzas por categoria."""
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='emotion_rollups')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='author_rollups')
+    count = models.IntegerField(default=0)
+    confidence_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'category'], name='core_author_rollup_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.author_id} - {self.category_id}: {self.count}"
+
+
+class ModelSelection(models.Model):
+    """
+    Modelo del registro elegido como activo (una sola fila, pk=1).
+    Cada worker la consulta periodicamente y cambia de modelo en segundo
+    plano (ver core.application.model_registry).
+    """
+    name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
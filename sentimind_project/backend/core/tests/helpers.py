@@ -0,0 +1,57 @@
+"""
+Utilidades comunes de los tests: settings con el motor stub (sin descargar
+modelos) y limpieza de los singletons de proceso entre tests.
+"""
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from core.application.classification_cache import ClassificationCache
+from core.application.post_service import create_post
+from core.models import Post, PostCategory
+
+
+# Motor stub y todas las optimizaciones opcionales apagadas: cada test
+# activa solo la que prueba
+STUB_SETTINGS = {
+    'SCORING_MODE': 'stub',
+    'INFERENCE_BATCHING': False,
+    'CLASSIFICATION_CACHE_SIZE': 0,
+    'CLASSIFICATION_CACHE_PERSISTENT': False,
+    'ASYNC_CLASSIFICATION': False,
+    'DB_WRITE_QUEUE': False,
+    'FEED_CACHE': False,
+}
+
+
+def stub_settings(**overrides):
+    """override_settings con STUB_SETTINGS y los cambios de overrides."""
+    return override_settings(**{**STUB_SETTINGS, **overrides})
+
+
+def reset_singletons():
+    """Descarta los singletons que leen settings al crearse."""
+    ClassificationCache._instance = None
+
+
+def make_user(username='ana', **extra):
+    return User.objects.create_user(username=username, password='clave-segura-123', **extra)
+
+
+def analysis_for(categories) -> dict:
+    """Resultado de analyze() con las categorias [(nombre, confianza), ...] (la primera es la principal)."""
+    return {
+        "emotions": [{"name": name, "confidence": confidence} for name, confidence in categories],
+        "main_sentiment": categories[0][0],
+        "confidence_score": categories[0][1],
+        "method": "test",
+    }
+
+
+def make_post(content='Un post de prueba', author=None, categories=(('Alegría', 0.9),), created_at=None) -> Post:
+    """Post clasificado via create_post; created_at fija la fecha del post y de sus PostCategory."""
+    post = create_post(content, author, analysis_for(categories))
+    if created_at is not None:
+        Post.objects.filter(pk=post.pk).update(created_at=created_at)
+        PostCategory.objects.filter(post=post).update(created_at=created_at)
+        post.created_at = created_at
+    return post
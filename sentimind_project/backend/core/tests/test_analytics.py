@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.application.analytics import truncate
+from core.application.post_service import bulk_create_posts, enqueue_post, save_analysis
+from core.models import AuthorEmotionRollup, EmotionRollup
+from core.tests.helpers import analysis_for, make_post, make_user, reset_singletons, stub_settings
+
+
+def rollup_snapshot():
+    """Filas con count > 0 de ambas tablas, comparables entre si."""
+    buckets = {
+        (r.granularity, r.bucket, r.category.name): (r.count, round(r.confidence_sum, 6))
+        for r in EmotionRollup.objects.select_related('category').filter(count__gt=0)
+    }
+    authors = {
+        (r.author_id, r.category.name): (r.count, round(r.confidence_sum, 6))
+        for r in AuthorEmotionRollup.objects.select_related('category').filter(count__gt=0)
+    }
+    return buckets, authors
+
+
+@stub_settings()
+class RollupUpsertTests(TestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+
+    def _bucket(self, granularity, category):
+        return EmotionRollup.objects.get(granularity=granularity, category__name=category)
+
+    def test_create_post_adds_to_hour_day_and_author_rollups(self):
+        make_post("post feliz", self.author, (('Alegría', 0.9), ('Amor', 0.7)))
+        make_post("otro post feliz", self.author, (('Alegría', 0.5),))
+
+        for granularity in ('hour', 'day'):
+            row = self._bucket(granularity, 'Alegría')
+            self.assertEqual(row.count, 2)
+            self.assertAlmostEqual(row.confidence_sum, 1.4)
+            self.assertEqual(row.bucket, truncate(timezone.now(), granularity))
+        self.assertEqual(AuthorEmotionRollup.objects.get(author=self.author, category__name='Amor').count, 1)
+
+    def test_bulk_create_upserts_each_table_once(self):
+        with CaptureQueriesContext(connection) as context:
+            bulk_create_posts([f"post {i}" for i in range(5)], self.author, [analysis_for((('Humor', 0.8),))] * 5)
+
+        upserts = [q['sql'] for q in context.captured_queries if 'ON CONFLICT' in q['sql']]
+        self.assertEqual(len(upserts), 2)
+        self.assertEqual(self._bucket('hour', 'Humor').count, 5)
+
+    def test_reclassification_moves_the_counts(self):
+        post = enqueue_post("post pendiente", self.author)
+        save_analysis(post, analysis_for((('Tristeza', 0.6),)))
+
+        save_analysis(post, analysis_for((('Alegría', 0.8),)))
+
+        self.assertEqual(self._bucket('day', 'Tristeza').count, 0)
+        self.assertEqual(self._bucket('day', 'Alegría').count, 1)
+        self.assertEqual(AuthorEmotionRollup.objects.get(author=self.author, category__name='Tristeza').count, 0)
+
+    def test_backfill_rebuilds_the_same_rollups(self):
+        other = make_user('beto')
+        make_post("post uno", self.author, (('Alegría', 0.9), ('Amor', 0.7)))
+        make_post("post dos", other, (('Miedo', 0.6),))
+        bulk_create_posts(["post tres", "post cuatro"], None, [analysis_for((('Alegría', 0.4),))] * 2)
+        incremental = rollup_snapshot()
+
+        call_command('backfill_analytics', stdout=StringIO())
+
+        self.assertEqual(rollup_snapshot(), incremental)
+
+    def test_backfill_uses_the_stored_created_at(self):
+        moment = timezone.now() - timedelta(days=3)
+        make_post("post antiguo", self.author, created_at=moment)
+
+        call_command('backfill_analytics', stdout=StringIO())
+
+        self.assertEqual(
+            list(EmotionRollup.objects.filter(granularity='day').values_list('bucket', flat=True)),
+            [truncate(moment, 'day')]
+        )
+
+
+@stub_settings()
+class AnalyticsEndpointTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+        make_post("post uno", self.author, (('Alegría', 0.9), ('Amor', 0.7)))
+        make_post("post dos", self.author, (('Alegría', 0.7),))
+        make_post("post tres", self.author, (('Miedo', 0.6),))
+
+    def test_distribution_groups_by_bucket(self):
+        body = self.client.get('/api/analytics/distribution/', {"granularity": "day"}).json()
+
+        self.assertEqual(len(body["buckets"]), 1)
+        bucket = body["buckets"][0]
+        self.assertEqual(bucket["total"], 4)
+        self.assertEqual(bucket["categories"]["Alegría"], {"count": 2, "avg_confidence": 0.8})
+
+    def test_distribution_filters_by_category(self):
+        body = self.client.get('/api/analytics/distribution/', {"category": "Miedo"}).json()
+
+        self.assertEqual(list(body["buckets"][0]["categories"]), ["Miedo"])
+
+    def test_distribution_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get('/api/analytics/distribution/?granularity=week').status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics/distribution/?since=ayer').status_code, 400)
+
+    def test_top_categories_orders_by_count(self):
+        body = self.client.get('/api/analytics/top-categories/', {"limit": 2}).json()
+
+        self.assertEqual([row["category"] for row in body["categories"]], ["Alegría", "Amor"])
+        self.assertEqual(self.client.get('/api/analytics/top-categories/?days=0').status_code, 400)
+
+    def test_author_profile_reports_shares(self):
+        body = self.client.get(f'/api/analytics/authors/{self.author.id}/').json()
+
+        self.assertEqual(body["total"], 4)
+        self.assertEqual(body["categories"][0], {
+            "category": "Alegría", "count": 2, "share": 0.5, "avg_confidence": 0.8
+        })
@@ -0,0 +1,96 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from core.application.batching import InferenceBatcher
+
+
+class FakeEngine:
+    """Motor que registra el tamaño de cada batch y retorna el texto como resultado."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+
+    def analyze_batch(self, texts):
+        self.release.wait(5)
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("modelo caido")
+        return [{"main_sentiment": text} for text in texts]
+
+
+class InferenceBatcherTests(SimpleTestCase):
+
+    def _analyze_concurrently(self, batcher, texts):
+        results, errors = {}, {}
+
+        def call(text):
+            try:
+                results[text] = batcher.analyze(text, timeout=5)
+            except Exception as e:
+                errors[text] = e
+
+        threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return results, errors
+
+    def test_concurrent_calls_share_a_batch_and_get_their_own_result(self):
+        engine = FakeEngine()
+        batcher = InferenceBatcher(engine=engine, max_batch_size=8, max_wait_ms=200)
+        texts = [f"texto {i}" for i in range(5)]
+
+        results, errors = self._analyze_concurrently(batcher, texts)
+
+        self.assertEqual(errors, {})
+        self.assertEqual({text: result["main_sentiment"] for text, result in results.items()},
+                         {text: text for text in texts})
+        self.assertLess(len(engine.batches), len(texts))
+        self.assertEqual(sorted(sum(engine.batches, [])), sorted(texts))
+
+    def test_batches_never_exceed_max_batch_size(self):
+        engine = FakeEngine()
+        # El primer batch queda retenido mientras el resto se encola
+        engine.release.clear()
+        batcher = InferenceBatcher(engine=engine, max_batch_size=3, max_wait_ms=50)
+        texts = [f"texto {i}" for i in range(10)]
+
+        timer = threading.Timer(0.3, engine.release.set)
+        timer.start()
+        results, errors = self._analyze_concurrently(batcher, texts)
+        timer.cancel()
+
+        self.assertEqual(errors, {})
+        self.assertEqual(len(results), len(texts))
+        self.assertTrue(all(len(batch) <= 3 for batch in engine.batches))
+
+    def test_batch_error_is_raised_in_every_caller(self):
+        batcher = InferenceBatcher(engine=FakeEngine(fail=True), max_batch_size=4, max_wait_ms=50)
+
+        results, errors = self._analyze_concurrently(batcher, ["a", "b", "c"])
+
+        self.assertEqual(results, {})
+        self.assertEqual(set(errors), {"a", "b", "c"})
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors.values()))
+        self.assertEqual(batcher.stats()["failed"], 3)
+
+    def test_stats_count_completed_texts_and_batches(self):
+        batcher = InferenceBatcher(engine=FakeEngine(), max_batch_size=4, max_wait_ms=1)
+
+        batcher.analyze("uno", timeout=5)
+        batcher.analyze("dos", timeout=5)
+        stats = batcher.stats()
+
+        self.assertEqual(stats["submitted"], 2)
+        self.assertEqual(stats["completed"], 2)
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_rejects_empty_batch_size(self):
+        with self.assertRaises(ValueError):
+            InferenceBatcher(engine=FakeEngine(), max_batch_size=0)
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from core.application.ingestion import ingest, iter_ndjson_items
+from core.models import Post
+from core.tests.helpers import make_user, reset_singletons, stub_settings
+
+
+def read_events(response):
+    return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+
+@stub_settings(BULK_INGEST_BATCH_SIZE=2, BULK_INGEST_MAX_ITEMS=100)
+class BulkCreateViewTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+
+    def _post_ndjson(self, lines):
+        body = "\n".join(lines).encode('utf-8')
+        return self.client.generic('POST', '/api/posts/bulk/', body, content_type='application/x-ndjson')
+
+    def test_json_list_streams_item_progress_and_summary_events(self):
+        response = self.client.post(
+            '/api/posts/bulk/', ["primer post", {"content": "segundo post"}, "tercer post"], format='json'
+        )
+        events = read_events(response)
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([e["status"] for e in events if e["type"] == "item"], ["created"] * 3)
+        self.assertEqual([e["processed"] for e in events if e["type"] == "progress"], [2, 3])
+        self.assertEqual(events[-1], {"type": "summary", "processed": 3, "created": 3, "failed": 0})
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+
+    def test_ndjson_reports_invalid_lines_and_keeps_the_rest(self):
+        response = self._post_ndjson(['"post valido"', '{roto', '"no"', '', '{"content": "otro post valido"}'])
+        events = read_events(response)
+
+        items = {e["index"]: e["status"] for e in events if e["type"] == "item"}
+        self.assertEqual(items, {0: "created", 1: "error", 2: "error", 3: "created"})
+        self.assertEqual(events[-1]["created"], 2)
+        self.assertEqual(
+            sorted(Post.objects.values_list('content', flat=True)), ["otro post valido", "post valido"]
+        )
+
+    def test_ndjson_stops_at_max_items(self):
+        with self.settings(BULK_INGEST_MAX_ITEMS=3):
+            events = read_events(self._post_ndjson([f'"post numero {i}"' for i in range(5)]))
+
+        self.assertEqual(events[-2]["type"], "error")
+        self.assertEqual(events[-1]["processed"], 3)
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_ndjson_without_content_length_is_rejected(self):
+        response = self.client.generic(
+            'POST', '/api/posts/bulk/', b'"post perdido"\n', content_type='application/x-ndjson',
+            CONTENT_LENGTH='', HTTP_TRANSFER_ENCODING='chunked'
+        )
+
+        self.assertEqual(response.status_code, 411)
+        self.assertFalse(Post.objects.exists())
+
+    def test_json_over_max_items_is_rejected_before_processing(self):
+        with self.settings(BULK_INGEST_MAX_ITEMS=2):
+            response = self.client.post('/api/posts/bulk/', ["uno uno", "dos dos", "tres tres"], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.post('/api/posts/bulk/', ["un post"], format='json')
+
+        self.assertIn(response.status_code, (401, 403))
+
+
+@stub_settings()
+class IngestTests(TestCase):
+
+    def setUp(self):
+        reset_singletons()
+
+    def test_reads_items_lazily_one_batch_at_a_time(self):
+        pulled = []
+
+        def items():
+            for i in range(10):
+                pulled.append(i)
+                yield f"post perezoso {i}"
+
+        events = ingest(items(), batch_size=3)
+        while next(events)["type"] != "progress":
+            pass
+
+        self.assertEqual(len(pulled), 3)
+
+    def test_invalid_utf8_line_is_an_item_error(self):
+        items = list(iter_ndjson_items([b'"bien"', b'\xff\xfe']))
+
+        self.assertEqual(items[0], "bien")
+        self.assertIsInstance(items[1], ValueError)
+
+    def test_import_posts_command_reads_ndjson_file(self):
+        author = make_user('importador')
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False, encoding='utf-8') as f:
+            f.write("\n".join(json.dumps({"content": f"importado {i}"}) for i in range(5)))
+        self.addCleanup(os.remove, f.name)
+
+        call_command('import_posts', f.name, author='importador', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(Post.objects.filter(author=author).count(), 5)
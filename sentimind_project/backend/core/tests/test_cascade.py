@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+import tune_cascade
+from core.application.cascade_engine import CascadeEngine
+from core.application.lexicon import LexiconScorer
+from core.application.stub_engine import StubEngine
+
+
+class LexiconScorerTests(SimpleTestCase):
+
+    def test_single_cue_scores_one_half(self):
+        ranked = LexiconScorer.score("Jajaja que buen dia")
+
+        self.assertEqual(ranked["labels"][0], "Humor")
+        self.assertEqual(ranked["scores"][0], 0.5)
+
+    def test_matches_without_accents_or_case(self):
+        self.assertEqual(LexiconScorer.score("Estoy ASUSTADA")["labels"][0], "Miedo")
+        self.assertEqual(LexiconScorer.score("Qué tristeza")["labels"][0], "Tristeza")
+
+    def test_no_cue_scores_zero(self):
+        self.assertEqual(LexiconScorer.score("El tren sale a las ocho")["scores"][0], 0)
+
+    def test_negated_cue_scores_zero(self):
+        self.assertEqual(LexiconScorer.score("No estoy feliz")["scores"][0], 0)
+        self.assertEqual(LexiconScorer.score("Nunca me siento triste")["scores"][0], 0)
+        self.assertEqual(LexiconScorer.score("No soporto esto")["labels"][0], "Enojo")
+
+
+class CascadeEngineTests(SimpleTestCase):
+
+    def setUp(self):
+        CascadeEngine._thresholds = None
+        CascadeEngine._counts = {CascadeEngine.TIER_LEXICON: 0, CascadeEngine.TIER_MODEL: 0}
+        self.addCleanup(setattr, CascadeEngine, '_thresholds', None)
+        patcher = mock.patch.object(CascadeEngine, 'escalation_engine', return_value=StubEngine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _thresholds_file(self, thresholds):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(thresholds, f)
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def test_single_clear_cue_is_answered_by_the_lexicon_by_default(self):
+        result = CascadeEngine.analyze("Te amo con todo mi corazon")
+
+        self.assertEqual(result["tier"], CascadeEngine.TIER_LEXICON)
+        self.assertEqual(result["main_sentiment"], "Amor")
+        self.assertEqual(result["method"], LexiconScorer.METHOD)
+
+    def test_negated_cue_is_escalated_with_the_default_threshold(self):
+        result = CascadeEngine.analyze("no estoy feliz")
+
+        self.assertEqual(result["tier"], CascadeEngine.TIER_MODEL)
+        self.assertEqual(result["method"], "stub")
+
+    def test_conflicting_or_missing_cues_are_escalated(self):
+        mixed, plain = CascadeEngine.analyze_batch(["Estoy feliz pero triste", "Hoy fui al mercado"])
+
+        self.assertEqual(mixed["tier"], CascadeEngine.TIER_MODEL)
+        self.assertEqual(plain["tier"], CascadeEngine.TIER_MODEL)
+        self.assertEqual(plain["method"], "stub")
+
+    def test_results_keep_input_order_and_count_tiers(self):
+        texts = ["Hoy fui al mercado", "jajaja", "pesimo servicio"]
+
+        results = CascadeEngine.analyze_batch(texts)
+
+        self.assertEqual([r["tier"] for r in results], ["model", "lexicon", "lexicon"])
+        self.assertEqual(results[2]["main_sentiment"], "Queja")
+        self.assertEqual(CascadeEngine.stats()["lexicon_texts"], 2)
+        self.assertEqual(CascadeEngine.stats()["model_texts"], 1)
+
+    def test_per_label_thresholds_from_file(self):
+        path = self._thresholds_file({"default": 0.5, "labels": {"Humor": tune_cascade.NEVER}})
+
+        with mock.patch.object(CascadeEngine, 'THRESHOLDS_FILE', path):
+            humor, amor = CascadeEngine.analyze_batch(["jajaja", "te amo"])
+
+        self.assertEqual(humor["tier"], CascadeEngine.TIER_MODEL)
+        self.assertEqual(amor["tier"], CascadeEngine.TIER_LEXICON)
+
+    def test_fingerprint_changes_with_the_thresholds(self):
+        before = CascadeEngine.fingerprint()
+        CascadeEngine._thresholds = None
+
+        with mock.patch.object(CascadeEngine, 'THRESHOLD', 0.67):
+            self.assertNotEqual(CascadeEngine.fingerprint(), before)
+
+
+class TuneCascadeTests(SimpleTestCase):
+
+    def test_picks_the_lowest_threshold_reaching_the_target(self):
+        scored = [
+            (0, "Humor", "Humor", 0.5),
+            (1, "Alegría", "Humor", 0.5),
+            (2, "Humor", "Humor", 0.67),
+            (3, "Humor", "Humor", 0.67),
+            (4, "Queja", "Queja", 0.5),
+        ]
+
+        thresholds = tune_cascade.tune(scored, target_accuracy=0.9, min_support=1)
+
+        self.assertEqual(thresholds, {"Humor": 0.67, "Queja": 0.5})
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.application.post_service import bulk_create_posts
+from core.infrastructure.pagination import PostCursorPagination
+from core.infrastructure.views import filter_by_category
+from core.models import Post, PostCategory
+from core.tests.helpers import analysis_for, make_post, make_user, reset_singletons, stub_settings
+
+
+@stub_settings()
+class CategoryFilterTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+        start = timezone.now() - timedelta(hours=1)
+        # Pares: Alegría principal; impares: Tristeza principal y Alegría secundaria;
+        # cada tercero: solo Enojo
+        self.posts = []
+        for i in range(12):
+            if i % 3 == 2:
+                categories = (('Enojo', 0.8),)
+            elif i % 2:
+                categories = (('Tristeza', 0.7), ('Alegría', 0.65))
+            else:
+                categories = (('Alegría', 0.9),)
+            self.posts.append(make_post(f"post {i}", self.author, categories, start + timedelta(minutes=i)))
+
+    def _ids(self, category, page_size):
+        body = self.client.get('/api/posts/', {"category": category, "page_size": page_size}).json()
+        ids = [post["id"] for post in body["results"]]
+        while body["next"]:
+            body = self.client.get(body["next"]).json()
+            ids += [post["id"] for post in body["results"]]
+        return ids
+
+    def test_returns_posts_with_the_category_as_primary_or_secondary(self):
+        expected = [
+            post.id for post in reversed(self.posts)
+            if post.post_categories.filter(category__name='Alegría').exists()
+        ]
+
+        self.assertEqual(self._ids('Alegría', 3), expected)
+
+    def test_post_with_several_categories_appears_once(self):
+        ids = self._ids('Tristeza', 2)
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), 4)
+
+    def test_unknown_category_returns_an_empty_page(self):
+        body = self.client.get('/api/posts/', {"category": "Nostalgia"}).json()
+
+        self.assertEqual(body["results"], [])
+
+    def test_orders_by_the_denormalized_created_at(self):
+        queryset = filter_by_category(Post.objects.all(), 'Alegría')
+
+        self.assertEqual(
+            PostCursorPagination().get_ordering(None, queryset, None),
+            ('-category_created_at', '-category_post_id')
+        )
+        self.assertIn('"core_postcategory"."created_at" AS "category_created_at"', str(queryset.query))
+
+    def test_writers_copy_created_at_into_post_categories(self):
+        single = make_post("post suelto", self.author, (('Amor', 0.9), ('Alegría', 0.88)))
+        batch = bulk_create_posts(["uno", "dos"], self.author, [analysis_for((('Humor', 0.8),))] * 2)
+
+        for post in [single, *batch]:
+            post.refresh_from_db()
+            self.assertEqual(
+                set(PostCategory.objects.filter(post=post).values_list('created_at', flat=True)),
+                {post.created_at}
+            )
@@ -0,0 +1,124 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.application.ai_service import LoadedModel, MiningEngine
+
+
+class WordTokenizer:
+    """Tokenizador de prueba: un token por palabra."""
+
+    def __call__(self, sentences, add_special_tokens=False):
+        return {"input_ids": [sentence.split() for sentence in sentences]}
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+class FakePipeline:
+    """Pipeline zero-shot que da mas Tristeza a los fragmentos que la mencionan."""
+
+    tokenizer = WordTokenizer()
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, labels, **kwargs):
+        self.calls.append(list(texts))
+        outputs = []
+        for text in texts:
+            sad = 0.9 if "triste" in text else 0.1
+            outputs.append({"labels": ["Tristeza", "Alegría"], "scores": [sad, 1 - sad]})
+        return outputs
+
+
+def chunk(text, max_tokens=5, max_chunks=4):
+    with mock.patch.multiple(MiningEngine, MAX_TOKENS_PER_CHUNK=max_tokens, MAX_CHUNKS_PER_TEXT=max_chunks):
+        return MiningEngine._chunk_text(text, WordTokenizer())
+
+
+class ChunkTextTests(SimpleTestCase):
+
+    def test_short_text_is_a_single_chunk(self):
+        self.assertEqual(chunk("Hola mundo."), ["Hola mundo."])
+
+    def test_sentences_are_packed_under_the_token_budget(self):
+        text = "Uno dos tres. Cuatro cinco. Seis siete ocho nueve. Diez."
+
+        self.assertEqual(chunk(text), ["Uno dos tres. Cuatro cinco.", "Seis siete ocho nueve. Diez."])
+
+    def test_oversized_sentence_is_cut_by_tokens(self):
+        text = "a b c d e f g h i j k l"
+
+        self.assertEqual(chunk(text), ["a b c d e", "f g h i j", "k l"])
+
+    def test_keeps_first_and_last_chunks_when_over_the_limit(self):
+        text = " ".join(f"Oracion {i} con cinco palabras." for i in range(6))
+
+        chunks = chunk(text, max_chunks=3)
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0], "Oracion 0 con cinco palabras.")
+        self.assertEqual(chunks[-1], "Oracion 5 con cinco palabras.")
+
+
+class MergeChunkScoresTests(SimpleTestCase):
+
+    def test_mean_is_weighted_by_chunk_length(self):
+        scores = [{"Alegría": 1.0, "Tristeza": 0.0}, {"Alegría": 0.0, "Tristeza": 1.0}]
+
+        ranked = MiningEngine.merge_chunk_scores(1, scores, [0, 0], [30, 10])[0]
+
+        self.assertEqual(ranked["labels"], ["Alegría", "Tristeza"])
+        self.assertEqual(ranked["scores"], [0.75, 0.25])
+
+    def test_max_keeps_the_highest_score_per_label(self):
+        scores = [{"Alegría": 0.2, "Tristeza": 0.6}, {"Alegría": 0.9, "Tristeza": 0.1}]
+
+        with mock.patch.object(MiningEngine, 'CHUNK_AGGREGATION', 'max'):
+            ranked = MiningEngine.merge_chunk_scores(1, scores, [0, 0], [1, 1])[0]
+
+        self.assertEqual(dict(zip(ranked["labels"], ranked["scores"])), {"Alegría": 0.9, "Tristeza": 0.6})
+
+    def test_chunks_are_merged_into_their_own_text(self):
+        scores = [{"Alegría": 0.8}, {"Miedo": 0.7}, {"Alegría": 0.4}]
+
+        ranked = MiningEngine.merge_chunk_scores(2, scores, [0, 1, 0], [1, 1, 1])
+
+        self.assertEqual(ranked[0]["labels"], ["Alegría"])
+        self.assertAlmostEqual(ranked[0]["scores"][0], 0.6)
+        self.assertEqual(ranked[1], {"labels": ["Miedo"], "scores": [0.7]})
+
+
+class AnalyzeWithChunksTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.multiple(MiningEngine, MAX_TOKENS_PER_CHUNK=5, MAX_CHUNKS_PER_TEXT=4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pipeline = FakePipeline()
+        self.model = LoadedModel(
+            'test', 'fake', self.pipeline, 'fp32', 'fake:fp32', '{}',
+            ["Tristeza", "Alegría"], ["Tristeza", "Alegría"]
+        )
+
+    def test_results_follow_input_order_although_chunks_are_sorted_by_length(self):
+        texts = [
+            "Hoy estoy muy muy feliz. Todo salio genial hoy. Que dia tan bonito.",
+            "triste",
+        ]
+
+        results = MiningEngine.analyze_with(self.model, texts)
+
+        sent = self.pipeline.calls[0]
+        self.assertEqual(sent, sorted(sent, key=len))
+        self.assertEqual(results[0]["main_sentiment"], "Alegría")
+        self.assertEqual(results[1]["main_sentiment"], "Tristeza")
+
+    def test_long_text_is_classified_from_all_its_chunks(self):
+        text = "Estoy triste por dentro. El dia fue bueno. Sigo algo triste."
+
+        result = MiningEngine.analyze_with(self.model, [text])[0]
+
+        self.assertEqual(len(self.pipeline.calls[0]), 3)
+        self.assertEqual(result["main_sentiment"], "Tristeza")
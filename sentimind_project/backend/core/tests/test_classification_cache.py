@@ -0,0 +1,139 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.application.classification import classify
+from core.application.classification_cache import ClassificationCache, normalize_text
+from core.application.stub_engine import StubEngine
+from core.models import ClassificationCacheEntry
+from core.tests.helpers import reset_singletons, stub_settings
+
+
+class FakeEngine:
+    """Motor con huella configurable que cuenta los textos que clasifica."""
+
+    def __init__(self, fingerprint='v1'):
+        self.version = fingerprint
+        self.computed = []
+
+    def fingerprint(self):
+        return self.version
+
+    def analyze_batch(self, texts):
+        self.computed.extend(texts)
+        return [{"main_sentiment": "Alegría", "text": text, "version": self.version} for text in texts]
+
+
+class ClassificationCacheMemoryTests(SimpleTestCase):
+
+    def test_normalize_text_collapses_whitespace_but_keeps_case(self):
+        self.assertEqual(normalize_text("  Hola\n\t Mundo  "), "Hola Mundo")
+        self.assertNotEqual(normalize_text("Hola"), normalize_text("hola"))
+
+    def test_computes_each_distinct_text_once(self):
+        engine = FakeEngine()
+        cache = ClassificationCache(max_entries=10, engine=engine)
+
+        first = cache.get_or_compute_many(["hola  mundo", "hola mundo", "otro"], engine.analyze_batch)
+        second = cache.get_or_compute_many(["hola mundo"], engine.analyze_batch)
+
+        self.assertEqual(engine.computed, ["hola  mundo", "otro"])
+        self.assertEqual(first[0], first[1])
+        self.assertEqual(second[0], first[0])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_fingerprint_change_invalidates_entries(self):
+        engine = FakeEngine('v1')
+        cache = ClassificationCache(max_entries=10, engine=engine)
+        cache.get_or_compute_many(["hola"], engine.analyze_batch)
+
+        engine.version = 'v2'
+        result = cache.get_or_compute_many(["hola"], engine.analyze_batch)[0]
+
+        self.assertEqual(result["version"], 'v2')
+        self.assertEqual(engine.computed, ["hola", "hola"])
+
+    def test_lru_evicts_least_recently_used(self):
+        engine = FakeEngine()
+        cache = ClassificationCache(max_entries=2, engine=engine)
+        cache.get_or_compute_many(["a1", "b2"], engine.analyze_batch)
+        cache.get_many(["a1"])
+        cache.get_or_compute_many(["c3"], engine.analyze_batch)
+
+        self.assertEqual(cache.get_many(["a1", "b2", "c3"])[1], None)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_returns_copies(self):
+        engine = FakeEngine()
+        cache = ClassificationCache(max_entries=10, engine=engine)
+        cache.get_or_compute_many(["hola"], engine.analyze_batch)[0]["main_sentiment"] = "Enojo"
+
+        self.assertEqual(cache.get_many(["hola"])[0]["main_sentiment"], "Alegría")
+
+
+class ClassificationCachePersistentTests(TestCase):
+
+    def test_persistent_tier_is_shared_between_instances(self):
+        engine = FakeEngine()
+        ClassificationCache(max_entries=10, persistent=True, engine=engine).get_or_compute_many(
+            ["hola"], engine.analyze_batch
+        )
+
+        other = ClassificationCache(max_entries=10, persistent=True, engine=engine)
+        result = other.get_or_compute_many(["hola"], engine.analyze_batch)[0]
+
+        self.assertEqual(result["text"], "hola")
+        self.assertEqual(engine.computed, ["hola"])
+        self.assertEqual(other.stats()["persistent_hits"], 1)
+
+    def test_purge_stale_deletes_other_fingerprints(self):
+        engine = FakeEngine('v1')
+        cache = ClassificationCache(max_entries=0, persistent=True, engine=engine)
+        cache.get_or_compute_many(["uno", "dos"], engine.analyze_batch)
+        engine.version = 'v2'
+        cache.get_or_compute_many(["uno"], engine.analyze_batch)
+
+        self.assertEqual(cache.purge_stale(), 2)
+        self.assertEqual(list(ClassificationCacheEntry.objects.values_list('fingerprint', flat=True)), ['v2'])
+
+
+@stub_settings()
+class ClearClassificationCacheCommandTests(TestCase):
+
+    def setUp(self):
+        cache = ClassificationCache(max_entries=0, persistent=True, engine=StubEngine)
+        cache.get_or_compute_many(["uno", "dos"], StubEngine.analyze_batch)
+        ClassificationCacheEntry.objects.create(key='vieja', fingerprint='anterior', result={})
+
+    def test_keeps_the_entries_of_the_active_scoring_mode(self):
+        call_command('clear_classification_cache', stdout=StringIO())
+
+        self.assertEqual(
+            set(ClassificationCacheEntry.objects.values_list('fingerprint', flat=True)),
+            {StubEngine.fingerprint()},
+        )
+        self.assertEqual(ClassificationCacheEntry.objects.count(), 2)
+
+    def test_keep_option_overrides_the_engine_fingerprint(self):
+        call_command('clear_classification_cache', keep=['anterior'], stdout=StringIO())
+
+        self.assertEqual(list(ClassificationCacheEntry.objects.values_list('key', flat=True)), ['vieja'])
+
+
+@stub_settings(CLASSIFICATION_CACHE_SIZE=16)
+class ClassifyWithCacheTests(TestCase):
+
+    def setUp(self):
+        reset_singletons()
+
+    def tearDown(self):
+        reset_singletons()
+
+    def test_classify_serves_repeated_texts_from_cache(self):
+        first = classify("Hoy es un gran dia")
+        second = classify("Hoy   es un gran dia")
+
+        self.assertEqual(first, second)
+        stats = ClassificationCache.get_instance().stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
@@ -0,0 +1,158 @@
+import os
+import signal
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.application.post_service import claim_jobs, complete_job, enqueue_post, fail_job
+from core.application.stub_engine import StubEngine
+from core.models import ClassificationJob, Post
+from core.tests.helpers import make_user, reset_singletons, stub_settings
+
+
+@stub_settings(ASYNC_CLASSIFICATION=True)
+class AsyncCreateTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+
+    def test_post_returns_202_with_pending_post_and_queued_job(self):
+        response = self.client.post('/api/posts/', {"content": "Hoy fue un gran dia"}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["classification_status"], Post.STATUS_PENDING)
+        self.assertEqual(response.data["categories"], [])
+        job = ClassificationJob.objects.get(post_id=response.data["id"])
+        self.assertEqual(job.status, ClassificationJob.STATUS_QUEUED)
+
+
+@stub_settings()
+class ClassificationJobTests(TestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+
+    def test_claim_jobs_reserves_each_job_once_in_creation_order(self):
+        posts = [enqueue_post(f"texto pendiente {i}", self.author) for i in range(3)]
+
+        first = claim_jobs(batch_size=2, lock_timeout=600)
+        second = claim_jobs(batch_size=2, lock_timeout=600)
+
+        self.assertEqual([job.post_id for job in first], [posts[0].id, posts[1].id])
+        self.assertEqual([job.post_id for job in second], [posts[2].id])
+        self.assertEqual(claim_jobs(batch_size=2, lock_timeout=600), [])
+        self.assertFalse(ClassificationJob.objects.exclude(status=ClassificationJob.STATUS_RUNNING).exists())
+
+    def test_claim_jobs_requeues_stale_running_jobs(self):
+        post = enqueue_post("texto abandonado", self.author)
+        ClassificationJob.objects.filter(post=post).update(
+            status=ClassificationJob.STATUS_RUNNING,
+            locked_at=timezone.now() - timedelta(seconds=700)
+        )
+
+        self.assertEqual([job.post_id for job in claim_jobs(batch_size=5, lock_timeout=600)], [post.id])
+
+    def test_stale_jobs_count_the_attempt_and_fail_after_max_attempts(self):
+        post = enqueue_post("texto que tumba al worker", self.author)
+
+        for attempt in range(1, 3):
+            job = claim_jobs(batch_size=1, lock_timeout=600, max_attempts=2)[0]
+            self.assertEqual(job.attempts, attempt)
+            # El worker muere sin llamar a complete_job ni a fail_job
+            ClassificationJob.objects.filter(pk=job.pk).update(
+                locked_at=timezone.now() - timedelta(seconds=700)
+            )
+
+        self.assertEqual(claim_jobs(batch_size=1, lock_timeout=600, max_attempts=2), [])
+        job.refresh_from_db()
+        post.refresh_from_db()
+        self.assertEqual(job.status, ClassificationJob.STATUS_FAILED)
+        self.assertEqual(job.last_error, "worker timeout")
+        self.assertEqual(post.classification_status, Post.STATUS_FAILED)
+
+    def test_failed_save_counts_a_single_attempt(self):
+        enqueue_post("texto que no se guarda", self.author)
+        job = claim_jobs(batch_size=1, lock_timeout=600)[0]
+
+        with mock.patch('core.application.post_service.save_analysis', side_effect=RuntimeError("base caida")):
+            with self.assertRaises(RuntimeError):
+                complete_job(job, StubEngine.analyze(job.post.content))
+        fail_job(job, RuntimeError("base caida"), max_attempts=3)
+
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.status, ClassificationJob.STATUS_QUEUED)
+
+    def test_claim_jobs_leaves_recent_running_jobs_alone(self):
+        post = enqueue_post("texto en proceso", self.author)
+        ClassificationJob.objects.filter(post=post).update(
+            status=ClassificationJob.STATUS_RUNNING, locked_at=timezone.now()
+        )
+
+        self.assertEqual(claim_jobs(batch_size=5, lock_timeout=600), [])
+
+    def test_complete_job_classifies_post(self):
+        enqueue_post("Me encanta este lugar", self.author)
+        job = claim_jobs(batch_size=1, lock_timeout=600)[0]
+        analysis = StubEngine.analyze(job.post.content)
+
+        complete_job(job, analysis)
+
+        job.refresh_from_db()
+        post = Post.objects.get(pk=job.post_id)
+        self.assertEqual(job.status, ClassificationJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(post.classification_status, Post.STATUS_DONE)
+        self.assertEqual(post.primary_category, analysis["main_sentiment"])
+        self.assertEqual(
+            sorted(post.post_categories.values_list('category__name', flat=True)),
+            sorted(cat["name"] for cat in analysis["emotions"])
+        )
+
+    def test_fail_job_requeues_until_max_attempts(self):
+        post = enqueue_post("texto problematico", self.author)
+
+        for attempt in range(1, 3):
+            job = claim_jobs(batch_size=1, lock_timeout=600)[0]
+            fail_job(job, RuntimeError("modelo caido"), max_attempts=2)
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            self.assertEqual(job.last_error, "modelo caido")
+
+        post.refresh_from_db()
+        self.assertEqual(job.status, ClassificationJob.STATUS_FAILED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(post.classification_status, Post.STATUS_FAILED)
+        self.assertEqual(claim_jobs(batch_size=1, lock_timeout=600), [])
+
+    def test_worker_command_drains_the_queue(self):
+        for i in range(5):
+            enqueue_post(f"texto numero {i}", self.author)
+
+        call_command('process_classification_jobs', once=True, batch_size=2, stdout=StringIO())
+
+        self.assertFalse(Post.objects.exclude(classification_status=Post.STATUS_DONE).exists())
+        self.assertEqual(
+            ClassificationJob.objects.filter(status=ClassificationJob.STATUS_DONE).count(), 5
+        )
+
+    def test_worker_command_stops_on_sigterm(self):
+        previous = signal.getsignal(signal.SIGTERM)
+        timer = threading.Timer(0.2, os.kill, args=(os.getpid(), signal.SIGTERM))
+        output = StringIO()
+        started = time.monotonic()
+
+        timer.start()
+        call_command('process_classification_jobs', poll_interval=30, stdout=output)
+
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertIn("Detenido", output.getvalue())
+        self.assertIs(signal.getsignal(signal.SIGTERM), previous)
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from core.application.db_writer import DatabaseWriter, serialized_write
+from core.application.metrics import end_request, start_request
+from core.application.post_service import create_post
+from core.models import Post
+from core.tests.helpers import analysis_for, make_user, reset_singletons, stub_settings
+
+
+class DatabaseWriterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.writer = DatabaseWriter()
+
+    def test_runs_the_write_in_the_writer_thread_and_returns_its_result(self):
+        result = self.writer.submit(lambda value: (threading.current_thread().name, value), 42)
+
+        self.assertEqual(result, ('db-writer', 42))
+        self.assertEqual(self.writer.writes, 1)
+
+    def test_exceptions_are_raised_in_the_calling_thread(self):
+        def fail():
+            raise ValueError("restriccion violada")
+
+        with self.assertRaisesMessage(ValueError, "restriccion violada"):
+            self.writer.submit(fail)
+
+        self.assertEqual(self.writer.errors, 1)
+        self.assertEqual(self.writer.submit(lambda: "sigue vivo"), "sigue vivo")
+
+    def test_concurrent_writes_never_overlap(self):
+        active, overlaps, done = [0], [], []
+        lock = threading.Lock()
+
+        def write(i):
+            with lock:
+                active[0] += 1
+                overlaps.append(active[0] > 1)
+            time.sleep(0.002)
+            with lock:
+                active[0] -= 1
+            done.append(i)
+
+        threads = [threading.Thread(target=self.writer.submit, args=(write, i)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(sorted(done), list(range(8)))
+        self.assertFalse(any(overlaps))
+
+    def test_queue_wait_is_recorded_in_the_callers_request(self):
+        token = start_request()
+        self.writer.submit(lambda: None)
+        timings = end_request(token)
+
+        self.assertIn('db_write_wait', timings)
+
+
+@stub_settings(DB_WRITE_QUEUE=True)
+class SerializedWriteTests(TransactionTestCase):
+
+    def setUp(self):
+        reset_singletons()
+        DatabaseWriter._instance = None
+        self.author = make_user()
+
+    def tearDown(self):
+        writer = DatabaseWriter._instance
+        if writer is not None and writer._thread is not None:
+            # La conexion del hilo escritor no debe sobrevivir al test
+            writer.submit(lambda: connection.close())
+        DatabaseWriter._instance = None
+
+    def test_writes_go_through_the_writer_thread(self):
+        threads = []
+
+        @serialized_write
+        def write():
+            threads.append(threading.current_thread().name)
+            return Post.objects.create(content="via cola", author=self.author)
+
+        post = write()
+
+        self.assertEqual(threads, ['db-writer'])
+        self.assertTrue(Post.objects.filter(pk=post.pk).exists())
+        self.assertEqual(DatabaseWriter.stats()["writes"], 1)
+
+    def test_service_errors_propagate_to_the_request_thread(self):
+        with self.assertRaises(KeyError):
+            create_post("post sin analisis", self.author, {"emotions": []})
+
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(DatabaseWriter.stats()["errors"], 1)
+
+    def test_writes_inside_an_open_transaction_stay_in_the_caller(self):
+        with transaction.atomic():
+            post = create_post("dentro de atomic", self.author, analysis_for((('Alegría', 0.9),)))
+
+        self.assertTrue(Post.objects.filter(pk=post.pk).exists())
+        self.assertIsNone(DatabaseWriter._instance)
+
+    def test_queue_disabled_writes_inline(self):
+        with self.settings(DB_WRITE_QUEUE=False):
+            create_post("sin cola", self.author, analysis_for((('Alegría', 0.9),)))
+
+        self.assertIsNone(DatabaseWriter._instance)
+        self.assertEqual(Post.objects.count(), 1)
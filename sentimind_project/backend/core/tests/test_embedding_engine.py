@@ -0,0 +1,68 @@
+import importlib.util
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase, override_settings
+
+from core.application.embedding_engine import EmbeddingEngine
+from core.application.engines import get_engine
+
+
+HAS_TORCH = importlib.util.find_spec('torch') is not None
+
+
+class FakeTokenizer:
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [[0] * len(text.split()) for text in texts]}
+
+
+class FakeScorer:
+    """Codifica cada texto como el vector one-hot de la etiqueta que nombra."""
+
+    tokenizer = FakeTokenizer()
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        import torch
+
+        self.calls.append(list(texts))
+        vectors = torch.zeros(len(texts), len(EmbeddingEngine.TAXONOMY))
+        for row, text in enumerate(texts):
+            for column, label in enumerate(EmbeddingEngine.TAXONOMY):
+                if label.lower() in text.lower():
+                    vectors[row, column] = 1.0
+        return vectors
+
+
+class EmbeddingEngineTests(SimpleTestCase):
+
+    @override_settings(SCORING_MODE='embedding')
+    def test_selected_by_scoring_mode(self):
+        self.assertIs(get_engine(), EmbeddingEngine)
+
+    def test_temperature_is_part_of_the_fingerprint(self):
+        with mock.patch.object(EmbeddingEngine, 'TEMPERATURE', 0.05):
+            cold = EmbeddingEngine.fingerprint()
+        with mock.patch.object(EmbeddingEngine, 'TEMPERATURE', 0.5):
+            warm = EmbeddingEngine.fingerprint()
+
+        self.assertNotEqual(cold, warm)
+
+    @skipUnless(HAS_TORCH, "requiere torch")
+    def test_one_encoding_per_text_against_precomputed_hypotheses(self):
+        import torch
+
+        scorer = FakeScorer()
+        with mock.patch.multiple(
+            EmbeddingEngine,
+            _classifier=scorer,
+            _label_embeddings=torch.eye(len(EmbeddingEngine.TAXONOMY)),
+            _method="embedding-local:fp32",
+        ):
+            results = EmbeddingEngine.analyze_batch(["pura tristeza", "mucho humor aqui"])
+
+        self.assertEqual(len(scorer.calls), 1)
+        self.assertEqual(sorted(scorer.calls[0]), ["mucho humor aqui", "pura tristeza"])
+        self.assertEqual([r["main_sentiment"] for r in results], ["Tristeza", "Humor"])
+        self.assertEqual(results[0]["method"], "embedding-local:fp32")
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+import evaluate_model
+from core.application.stub_engine import StubEngine
+from core.tests.helpers import stub_settings
+
+
+@stub_settings()
+class EvaluateDatasetTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.dataset = self._write_dataset('posts.jsonl', 'text', 'label')
+        self.checkpoint = os.path.join(self.dir, 'predictions.jsonl')
+
+    def _write_dataset(self, name, text_field, label_field, rows=5):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(rows):
+                f.write(json.dumps({text_field: f"texto numero {i}", label_field: 'Alegría'}) + "\n")
+        return path
+
+    def _evaluate(self, dataset=None, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return evaluate_model.evaluate_dataset(
+                dataset or self.dataset, batch_size=2, checkpoint=self.checkpoint,
+                output_dir=self.dir, **kwargs
+            )
+
+    def _checkpoint_rows(self):
+        return list(evaluate_model._iter_checkpoint(self.checkpoint))
+
+    def test_resume_only_classifies_missing_rows(self):
+        self._evaluate()
+        with open(self.checkpoint, encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(self.checkpoint, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:3])
+
+        with mock.patch.object(StubEngine, 'analyze_batch', wraps=StubEngine.analyze_batch) as analyze:
+            result = self._evaluate()
+
+        self.assertEqual(sum(len(call.args[0]) for call in analyze.call_args_list), 3)
+        self.assertEqual(result['samples'], 5)
+        self.assertEqual(sorted(row['index'] for row in self._checkpoint_rows()), list(range(5)))
+
+    def test_checkpoint_of_another_dataset_is_rejected(self):
+        self._evaluate()
+        other = self._write_dataset('otros.jsonl', 'text', 'label')
+
+        with self.assertRaises(SystemExit) as raised:
+            self._evaluate(other)
+
+        self.assertIn('dataset', str(raised.exception))
+
+    def test_checkpoint_with_other_fields_is_rejected(self):
+        self._evaluate()
+        self._write_dataset('posts.jsonl', 'content', 'categoria')
+
+        with self.assertRaises(SystemExit) as raised:
+            self._evaluate(text_field='content', label_field='categoria')
+
+        self.assertIn('text_field', str(raised.exception))
+
+    def test_checkpoint_of_another_model_is_rejected(self):
+        self._evaluate()
+        StubEngine.unload()
+        self.addCleanup(StubEngine.unload)
+
+        def load_other_model(cls):
+            cls._classifier = cls
+            cls._model_name = "otro-modelo"
+
+        with mock.patch.object(StubEngine, '_load_classifier', classmethod(load_other_model)):
+            with self.assertRaises(SystemExit) as raised:
+                self._evaluate()
+
+        self.assertIn('fingerprint', str(raised.exception))
+
+    def test_failed_batches_are_not_checkpointed_and_are_retried(self):
+        original = StubEngine.analyze_batch.__func__
+        calls = []
+
+        def fail_first_batch(cls, texts):
+            calls.append(texts)
+            if len(calls) == 1:
+                raise RuntimeError("sin memoria")
+            return original(cls, texts)
+
+        with mock.patch.object(StubEngine, 'analyze_batch', classmethod(fail_first_batch)):
+            first = self._evaluate()
+
+        self.assertEqual(first['failed'], 2)
+        self.assertEqual(first['samples'], 3)
+        self.assertNotIn('Error', first['labels'])
+
+        second = self._evaluate()
+
+        self.assertEqual(second['failed'], 0)
+        self.assertEqual(second['samples'], 5)
+        self.assertEqual(sorted(row['index'] for row in self._checkpoint_rows()), list(range(5)))
@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from core.application.ai_service import MiningEngine
+from core.application.export import CSV_FIELDS, export_lines, iter_posts
+from core.tests.helpers import make_post, make_user, reset_singletons, stub_settings
+
+
+def day(n):
+    return datetime(2026, 1, n, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class ExportFixture:
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+        self.posts = [
+            make_post("feliz", self.author, (('Alegría', 0.9), ('Amor', 0.4)), created_at=day(1)),
+            make_post("triste, \"muy\"\ntriste", None, (('Tristeza', 0.8),), created_at=day(2)),
+            make_post("con miedo", self.author, (('Miedo', 0.7), ('Tristeza', 0.3)), created_at=day(3)),
+            make_post("otra alegría", self.author, (('Alegría', 0.6),), created_at=day(4)),
+            make_post("nostalgia", self.author, (('Nostalgia', 0.5),), created_at=day(5)),
+        ]
+
+
+@stub_settings()
+class ExportLinesTests(ExportFixture, TestCase):
+
+    def test_posts_are_read_in_chunks_with_one_category_query_each(self):
+        with self.assertNumQueries(4):
+            posts = list(iter_posts(chunk_size=2))
+
+        self.assertEqual([post["id"] for post in posts], [post.id for post in self.posts])
+        self.assertEqual(posts[0]["categories"], [
+            {"name": "Alegría", "confidence": 0.9}, {"name": "Amor", "confidence": 0.4}
+        ])
+        self.assertIsNone(posts[1]["author"])
+        self.assertEqual(posts[0]["created_at"], day(1).isoformat())
+
+    def test_range_is_half_open_and_category_matches_any_classification(self):
+        ids = [post["id"] for post in iter_posts(since=day(2), until=day(4))]
+        sad = [post["id"] for post in iter_posts(category='Tristeza')]
+
+        self.assertEqual(ids, [self.posts[1].id, self.posts[2].id])
+        self.assertEqual(sad, [self.posts[1].id, self.posts[2].id])
+
+    def test_ndjson_has_one_object_per_line(self):
+        lines = list(export_lines('ndjson', chunk_size=2))
+
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(line.endswith("\n") and line.count("\n") == 1 for line in lines))
+        self.assertEqual(json.loads(lines[1])["content"], "triste, \"muy\"\ntriste")
+        self.assertIn("Alegría", lines[0])
+
+    def test_csv_has_a_column_per_label_plus_unknown_categories(self):
+        rows = list(csv.reader(io.StringIO(''.join(export_lines('csv')))))
+
+        header = rows[0]
+        self.assertEqual(header, list(CSV_FIELDS) + list(MiningEngine.TAXONOMY) + ['Nostalgia'])
+        self.assertEqual(len(rows), 6)
+        first = dict(zip(header, rows[1]))
+        self.assertEqual((first["Alegría"], first["Amor"], first["Tristeza"]), ('0.9', '0.4', ''))
+        self.assertEqual(dict(zip(header, rows[2]))["content"], "triste, \"muy\"\ntriste")
+        self.assertEqual(dict(zip(header, rows[5]))["Nostalgia"], '0.5')
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            export_lines('xml')
+
+
+@stub_settings(EXPORT_CHUNK_SIZE=2)
+class PostExportViewTests(ExportFixture, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_user('admin', is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def _body(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_streams_ndjson_as_an_attachment(self):
+        response = self.client.get('/api/posts/export/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('attachment; filename="posts-', response['Content-Disposition'])
+        posts = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual([post["id"] for post in posts], [post.id for post in self.posts])
+
+    def test_csv_with_filters(self):
+        response = self.client.get('/api/posts/export/', {
+            'output': 'csv', 'category': 'Alegría', 'since': '2026-01-02T00:00:00',
+        })
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(self._body(response))))
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.posts[3].id)])
+
+    def test_invalid_format_or_date_is_a_bad_request(self):
+        self.assertEqual(self.client.get('/api/posts/export/', {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/posts/export/', {'since': 'ayer'}).status_code, 400)
+
+    def test_only_admins_can_export(self):
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get('/api/posts/export/').status_code, 403)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/posts/export/').status_code, 403)
+
+
+@stub_settings()
+class ExportPostsCommandTests(ExportFixture, TestCase):
+
+    def test_writes_to_stdout(self):
+        out = io.StringIO()
+
+        call_command('export_posts', category='Miedo', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.posts[2].id])
+
+    def test_writes_the_file_and_reports_the_count(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        err = io.StringIO()
+
+        call_command('export_posts', format='csv', output=path, until='2026-01-03T00:00:00',
+                     chunk_size=1, stderr=err)
+
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 3)
+        self.assertIn('[OK] 2 posts exportados', err.getvalue())
+
+    def test_invalid_date_is_a_command_error(self):
+        with self.assertRaisesMessage(CommandError, 'Fecha invalida'):
+            call_command('export_posts', since='ayer', stdout=io.StringIO())
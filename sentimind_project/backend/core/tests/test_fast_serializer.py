@@ -0,0 +1,97 @@
+import unittest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core.infrastructure import renderers
+from core.infrastructure.renderers import FastJSONRenderer
+from core.infrastructure.serializers import PostSerializer, post_rows, serialize_post_rows
+from core.models import Post
+from core.tests.helpers import make_post, make_user, reset_singletons, stub_settings
+
+
+@stub_settings()
+class FastSerializerEquivalenceTests(APITestCase):
+    """La ruta rapida del feed debe producir los mismos bytes que PostSerializer + JSONRenderer."""
+
+    def setUp(self):
+        reset_singletons()
+        author = make_user()
+        start = timezone.now() - timedelta(hours=1)
+        contents = [
+            ("Qué día tan feliz 😀", (('Alegría', 0.93), ('Amor', 0.41))),
+            ("Linea\u2028separada y \"comillas\"", (('Tristeza', 0.5),)),
+            ("Estoy triste y con miedo", (('Tristeza', 0.77), ('Miedo', 0.66), ('Alegría', 0.1))),
+        ]
+        for i in range(12):
+            content, categories = contents[i % len(contents)]
+            make_post(f"{content} {i}", None if i % 4 == 0 else author, categories,
+                      created_at=start + timedelta(minutes=i))
+
+    def _pages(self, params):
+        """Cuerpos de todas las paginas del feed, siguiendo los enlaces next."""
+        bodies, response = [], self.client.get('/api/posts/', params)
+        while True:
+            bodies.append(response.content)
+            next_url = response.json()["next"]
+            if not next_url:
+                return bodies
+            response = self.client.get(next_url)
+
+    def _assert_same_feed(self, params):
+        with override_settings(FEED_FAST_SERIALIZER=False):
+            expected = self._pages(params)
+        with override_settings(FEED_FAST_SERIALIZER=True):
+            fast = self._pages(params)
+
+        self.assertGreater(len(expected), 1)
+        self.assertEqual(fast, expected)
+
+    def test_cursor_paginated_feed_is_identical(self):
+        self._assert_same_feed({'page_size': 5})
+
+    def test_category_filtered_feed_is_identical(self):
+        self._assert_same_feed({'category': 'Tristeza', 'page_size': 3})
+
+    def test_rows_match_the_serializer_for_the_same_posts(self):
+        queryset = Post.objects.select_related('author').prefetch_related('post_categories__category')
+        queryset = queryset.order_by('-created_at', '-id')
+
+        expected = JSONRenderer().render(PostSerializer(queryset, many=True).data)
+        fast = FastJSONRenderer().render(serialize_post_rows(list(post_rows(queryset))))
+
+        self.assertEqual(fast, expected)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    DATA = {
+        "texto": "ñandú \u2028 \u2029 \"x\"",
+        "fecha": timezone.now(),
+        "dia": date(2024, 5, 1),
+        "hora": time(9, 30, 15, 250000),
+        "decimal": Decimal('0.93'),
+        "float": 0.1,
+        "lista": [1, None, True],
+    }
+
+    def test_fallback_without_orjson_matches_json_renderer(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.DATA), JSONRenderer().render(self.DATA))
+
+    @unittest.skipIf(renderers.orjson is None, "orjson no esta instalado")
+    def test_orjson_output_matches_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.DATA), JSONRenderer().render(self.DATA))
+
+    def test_indented_output_uses_json_renderer(self):
+        context = {'indent': 4}
+
+        self.assertEqual(
+            FastJSONRenderer().render(self.DATA, 'application/json', context),
+            JSONRenderer().render(self.DATA, 'application/json', context),
+        )
@@ -0,0 +1,127 @@
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.application.feed_cache import FeedCache, check_shared_cache
+from core.tests.helpers import make_post, make_user, reset_singletons, stub_settings
+
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+FILE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/x'}}
+
+
+@stub_settings(FEED_CACHE=True)
+class FeedCacheTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        cache.clear()
+        FeedCache._instance = None
+        self.addCleanup(setattr, FeedCache, '_instance', None)
+        self.author = make_user()
+        make_post("un dia feliz", self.author, categories=(('Alegría', 0.9),))
+        make_post("un dia triste", self.author, categories=(('Tristeza', 0.9),))
+
+    def _key(self, **params):
+        return FeedCache.get_instance().make_key([(name, [value]) for name, value in params.items()])
+
+    def test_repeated_request_is_served_from_the_cache_with_an_etag(self):
+        first = self.client.get('/api/posts/')
+        second = self.client.get('/api/posts/')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['Cache-Control'], 'no-cache')
+        self.assertEqual(FeedCache.get_instance().stats()["hits"], 1)
+
+    def test_matching_if_none_match_returns_304_without_body(self):
+        etag = self.client.get('/api/posts/')['ETag']
+
+        response = self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=f'"otro", W/{etag}')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/posts/', HTTP_IF_NONE_MATCH='"otro"').status_code, 200)
+
+    def test_versions_change_only_when_the_write_commits(self):
+        all_key = self._key()
+        sad_key = self._key(category='Tristeza')
+        happy_key = self._key(category='Alegría')
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            make_post("otro dia feliz", self.author, categories=(('Alegría', 0.9),))
+        self.assertEqual(self._key(), all_key)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertNotEqual(self._key(), all_key)
+        self.assertNotEqual(self._key(category='Alegría'), happy_key)
+        self.assertEqual(self._key(category='Tristeza'), sad_key)
+
+    def test_new_post_changes_the_etag_of_its_feeds_only(self):
+        feed_etag = self.client.get('/api/posts/')['ETag']
+        sad_etag = self.client.get('/api/posts/', {'category': 'Tristeza'})['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_post("otro dia feliz", self.author, categories=(('Alegría', 0.9),))
+
+        feed = self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=feed_etag)
+        sad = self.client.get('/api/posts/', {'category': 'Tristeza'}, HTTP_IF_NONE_MATCH=sad_etag)
+        self.assertEqual(feed.status_code, 200)
+        self.assertEqual(len(feed.json()["results"]), 3)
+        self.assertEqual(sad.status_code, 304)
+
+    @override_settings(ALLOWED_HOSTS=['a.example.com', 'b.example.com'])
+    def test_pagination_links_point_to_the_requesting_host(self):
+        first = self.client.get('/api/posts/', {'page_size': 1}, HTTP_HOST='a.example.com').json()
+        second = self.client.get('/api/posts/', {'page_size': 1}, HTTP_HOST='b.example.com').json()
+
+        self.assertTrue(first["next"].startswith('http://a.example.com/'))
+        self.assertTrue(second["next"].startswith('http://b.example.com/'))
+
+    def test_own_posts_are_not_cached(self):
+        self.client.force_authenticate(self.author)
+
+        response = self.client.get('/api/posts/', {'mine': 'true'})
+
+        self.assertNotIn('ETag', response)
+
+
+@override_settings(FEED_CACHE=True, ASYNC_CLASSIFICATION=False)
+class CheckSharedCacheTests(SimpleTestCase):
+
+    @override_settings(CACHES=LOCMEM)
+    def test_locmem_is_rejected_with_several_workers(self):
+        check_shared_cache(1)
+        with self.assertRaisesMessage(ImproperlyConfigured, 'CACHE_BACKEND=file'):
+            check_shared_cache(2)
+
+    @override_settings(CACHES=LOCMEM, ASYNC_CLASSIFICATION=True)
+    def test_locmem_is_rejected_with_the_async_worker(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_shared_cache(1)
+
+    @override_settings(CACHES=FILE)
+    def test_shared_cache_is_accepted(self):
+        check_shared_cache(4)
+
+    @override_settings(CACHES=LOCMEM, FEED_CACHE=False)
+    def test_ignored_when_the_feed_cache_is_off(self):
+        check_shared_cache(4)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_gunicorn_refuses_to_start(self):
+        conf = runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+        server = mock.Mock()
+        server.cfg.workers = 3
+
+        with self.assertRaises(ImproperlyConfigured):
+            conf['on_starting'](server)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.tests.helpers import make_post, make_user, reset_singletons, stub_settings
+
+
+@stub_settings()
+class FeedCursorPaginationTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        self.author = make_user()
+        start = timezone.now() - timedelta(hours=1)
+        self.posts = [
+            make_post(f"post numero {i}", self.author, created_at=start + timedelta(minutes=i))
+            for i in range(25)
+        ]
+        self.newest_first = [post.id for post in reversed(self.posts)]
+
+    def _walk(self, url):
+        ids, pages = [], 0
+        while url:
+            body = self.client.get(url).json()
+            ids += [post["id"] for post in body["results"]]
+            url = body["next"]
+            pages += 1
+        return ids, pages
+
+    def test_pages_cover_the_feed_newest_first_without_duplicates(self):
+        ids, pages = self._walk('/api/posts/?page_size=10')
+
+        self.assertEqual(ids, self.newest_first)
+        self.assertEqual(pages, 3)
+
+    def test_posts_with_the_same_created_at_are_ordered_by_id(self):
+        moment = timezone.now()
+        tied = [make_post(f"empate {i}", self.author, created_at=moment) for i in range(3)]
+
+        ids, _ = self._walk('/api/posts/?page_size=2')
+
+        self.assertEqual(ids[:3], [post.id for post in reversed(tied)])
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_previous_link_returns_to_the_first_page(self):
+        first = self.client.get('/api/posts/?page_size=10').json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+
+        self.assertIsNone(first["previous"])
+        self.assertEqual([post["id"] for post in back["results"]], [post["id"] for post in first["results"]])
+
+    def test_since_returns_only_newer_posts(self):
+        anchor = self.posts[19]
+
+        body = self.client.get(f'/api/posts/?since={anchor.id}').json()
+
+        self.assertEqual([post["id"] for post in body["results"]], self.newest_first[:5])
+
+    def test_since_with_unknown_or_invalid_post_is_rejected(self):
+        self.assertEqual(self.client.get('/api/posts/?since=999999').status_code, 400)
+        self.assertEqual(self.client.get('/api/posts/?since=abc').status_code, 400)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        def queries(page_size):
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(self.client.get(f'/api/posts/?page_size={page_size}').status_code, 200)
+            return len(context)
+
+        self.assertEqual(queries(5), queries(25))
@@ -0,0 +1,51 @@
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from core.application.stub_engine import StubEngine
+from core.tests.helpers import stub_settings
+
+
+@stub_settings()
+class GunicornPostForkTests(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, StubEngine, '_warmup_error', None)
+        self.addCleanup(setattr, StubEngine, '_ready', StubEngine._ready)
+
+    def _load_conf(self):
+        # SHARED_MODEL activa preload_app y fija MODEL_WARMUP=preload en el entorno
+        with mock.patch.dict('os.environ', {'SHARED_MODEL': 'true'}):
+            return runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+
+    def test_failed_warmup_keeps_the_worker_alive_and_not_ready(self):
+        conf = self._load_conf()
+        worker = mock.Mock(pid=1234)
+        StubEngine._ready = False
+
+        with mock.patch.object(StubEngine, 'analyze_batch', side_effect=RuntimeError("pesos corruptos")):
+            conf['post_fork'](mock.Mock(), worker)
+
+        worker.log.error.assert_called_once()
+        self.assertFalse(StubEngine.is_ready())
+        self.assertEqual(StubEngine.readiness()["error"], "pesos corruptos")
+
+    def test_successful_warmup_marks_the_worker_ready(self):
+        conf = self._load_conf()
+        worker = mock.Mock(pid=1234)
+        StubEngine._ready = False
+
+        conf['post_fork'](mock.Mock(), worker)
+
+        worker.log.error.assert_not_called()
+        self.assertTrue(StubEngine.is_ready())
+
+    def test_worker_warmup_leaves_standby_models_to_the_master(self):
+        conf = self._load_conf()
+
+        with mock.patch.object(StubEngine, 'warmup') as warmup:
+            conf['post_fork'](mock.Mock(), mock.Mock(pid=1234))
+
+        warmup.assert_called_once_with(standby=False)
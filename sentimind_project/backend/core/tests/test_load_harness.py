@@ -0,0 +1,77 @@
+from django.test import TestCase, modify_settings
+from rest_framework.test import APITestCase
+
+import loadtest
+from core.application.engines import get_engine
+from core.application.stub_engine import StubEngine
+from core.tests.helpers import make_post, make_user, reset_singletons, stub_settings
+
+
+@stub_settings()
+class StubEngineTests(TestCase):
+
+    def test_is_selected_by_scoring_mode(self):
+        self.assertIs(get_engine(), StubEngine)
+
+    def test_scores_are_deterministic_and_keep_the_analyze_format(self):
+        first = StubEngine.analyze("Hoy me siento feliz")
+        again = StubEngine.analyze("Hoy me siento feliz")
+
+        self.assertEqual(first, again)
+        self.assertEqual(set(first), {"emotions", "main_sentiment", "confidence_score", "all_scores", "method"})
+        self.assertEqual(first["main_sentiment"], first["emotions"][0]["name"])
+        self.assertIn(first["main_sentiment"], StubEngine.TAXONOMY)
+
+    def test_batch_matches_single_analysis(self):
+        texts = ["primer texto", "segundo texto"]
+
+        self.assertEqual(StubEngine.analyze_batch(texts), [StubEngine.analyze(text) for text in texts])
+
+
+@stub_settings()
+@modify_settings(MIDDLEWARE={'prepend': 'core.infrastructure.middleware.QueryCountMiddleware'})
+class QueryCountMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        author = make_user()
+        for i in range(3):
+            make_post(f"post {i}", author)
+
+    def test_header_reports_the_queries_of_the_request(self):
+        response = self.client.get('/api/posts/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-DB-Queries']), 0)
+
+    def test_header_matches_the_queries_executed(self):
+        with self.assertNumQueries(int(self.client.get('/api/posts/')['X-DB-Queries'])):
+            self.client.get('/api/posts/')
+
+
+class LoadtestReportTests(TestCase):
+
+    def test_parse_mix_rejects_unknown_operations(self):
+        self.assertEqual(loadtest.parse_mix('feed=70,create'), {'feed': 70.0, 'create': 1.0})
+        with self.assertRaises(SystemExit):
+            loadtest.parse_mix('feed=70,borrar=30')
+
+    def test_histogram_puts_each_latency_in_its_bucket(self):
+        counts = loadtest.histogram([1, 5, 6, 7000])
+
+        self.assertEqual(counts["<=5ms"], 2)
+        self.assertEqual(counts["<=10ms"], 1)
+        self.assertEqual(counts[">5000ms"], 1)
+
+    def test_summary_counts_errors_and_queries(self):
+        recorder = loadtest.Recorder()
+        for sample in [(200, 10.0, 4), (200, 20.0, 6), (500, 30.0, None), (0, 40.0, None)]:
+            recorder.add('feed', sample)
+
+        report = loadtest.summarize(recorder, elapsed=2.0)
+
+        self.assertEqual(list(report), ['feed'])
+        self.assertEqual(report['feed']['errors'], 2)
+        self.assertEqual(report['feed']['avg_queries'], 5.0)
+        self.assertEqual(report['feed']['status_codes'], {'200': 2, '500': 1, '0': 1})
+        self.assertEqual(report['feed']['requests_per_second'], 2.0)
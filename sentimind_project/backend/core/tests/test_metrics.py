@@ -0,0 +1,181 @@
+import threading
+import time
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from core.application.ai_service import LoadedModel, MiningEngine, _instrument_pipeline
+from core.application.batching import InferenceBatcher
+from core.application.metrics import MetricsRegistry, end_request, start_request, timed
+from core.tests.helpers import make_user, reset_singletons, stub_settings
+
+
+def server_timing(response) -> dict:
+    """{etapa: ms} de la cabecera Server-Timing."""
+    entries = {}
+    for entry in response['Server-Timing'].split(', '):
+        stage, _, duration = entry.partition(';dur=')
+        entries[stage] = float(duration)
+    return entries
+
+
+class TimedEngine:
+    """Motor cuyo forward dura 20 ms y se mide como la etapa 'forward'."""
+
+    def __init__(self):
+        self.batches = []
+
+    def analyze_batch(self, texts):
+        with timed('forward'):
+            time.sleep(0.02)
+        self.batches.append(list(texts))
+        return [{"main_sentiment": text} for text in texts]
+
+
+class FakeZeroShotPipeline:
+    """Pipeline con las etapas de transformers (preprocess, _forward, postprocess)."""
+
+    tokenizer = None
+
+    def preprocess(self, text):
+        return text
+
+    def _forward(self, inputs):
+        return inputs
+
+    def postprocess(self, outputs, labels):
+        return {"labels": list(labels), "scores": [1.0 / (i + 1) for i in range(len(labels))]}
+
+    def __call__(self, texts, labels, **kwargs):
+        return [self.postprocess(self._forward(self.preprocess(text)), labels) for text in texts]
+
+
+class MetricsRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        MetricsRegistry.get_instance().reset()
+
+    def test_timed_records_the_stage_globally_and_in_the_current_request(self):
+        token = start_request()
+        with timed('db_write'):
+            pass
+        timings = end_request(token)
+
+        self.assertEqual(list(timings), ['db_write'])
+        self.assertIn('sentimind_stage_seconds_count{stage="db_write"} 1', MetricsRegistry.get_instance().render())
+
+    def test_stages_outside_a_request_only_reach_the_registry(self):
+        with timed('forward'):
+            pass
+
+        self.assertIn('sentimind_stage_seconds_count{stage="forward"} 1', MetricsRegistry.get_instance().render())
+
+    def test_pipeline_postprocess_and_result_build_are_separate_stages(self):
+        pipeline = _instrument_pipeline(FakeZeroShotPipeline())
+        labels = list(MiningEngine.TAXONOMY)
+        model = LoadedModel('fake', 'org/fake', pipeline, 'fp32', 'fake', '{}', labels, labels)
+
+        MiningEngine.analyze_with(model, ["uno", "dos"])
+
+        body = MetricsRegistry.get_instance().render()
+        self.assertIn('sentimind_stage_seconds_count{stage="postprocess"} 2', body)
+        self.assertIn('sentimind_stage_seconds_count{stage="result_build"} 1', body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry.get_instance()
+        registry.observe_request('GET', 'posts', 200, 0.003)
+        registry.observe_request('GET', 'posts', 200, 0.2)
+
+        body = registry.render()
+
+        self.assertIn('sentimind_http_requests_total{method="GET",view="posts",status="200"} 2', body)
+        self.assertIn('sentimind_http_request_seconds_bucket{method="GET",view="posts",le="0.005"} 1', body)
+        self.assertIn('sentimind_http_request_seconds_bucket{method="GET",view="posts",le="0.25"} 2', body)
+
+
+class BatchedTimingTests(SimpleTestCase):
+
+    def test_batch_stages_are_attributed_to_every_waiting_request(self):
+        engine = TimedEngine()
+        batcher = InferenceBatcher(engine=engine, max_batch_size=2, max_wait_ms=500)
+        timings = {}
+
+        def call(text):
+            token = start_request()
+            batcher.analyze(text, timeout=5)
+            timings[text] = end_request(token)
+
+        threads = [threading.Thread(target=call, args=(text,)) for text in ("uno", "dos")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual([sorted(batch) for batch in engine.batches], [["dos", "uno"]])
+        for text in ("uno", "dos"):
+            self.assertGreaterEqual(timings[text]['forward'], 0.02)
+
+    def test_caller_outside_a_request_is_not_affected(self):
+        batcher = InferenceBatcher(engine=TimedEngine(), max_batch_size=1)
+
+        self.assertEqual(batcher.analyze("suelto", timeout=5), {"main_sentiment": "suelto"})
+
+
+# MetricsMiddleware solo se instala con METRICS_ENABLED o SERVER_TIMING_HEADER
+# al cargar settings: los tests lo agregan detras de RequestIdMiddleware
+METRICS_MIDDLEWARE = [
+    settings.MIDDLEWARE[0], 'core.infrastructure.middleware.MetricsMiddleware', *settings.MIDDLEWARE[1:]
+]
+
+
+@stub_settings(SERVER_TIMING_HEADER=True, METRICS_ENABLED=True, METRICS_TOKEN='', MIDDLEWARE=METRICS_MIDDLEWARE)
+class MetricsMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+        MetricsRegistry.get_instance().reset()
+        self.client.force_authenticate(make_user())
+
+    def tearDown(self):
+        InferenceBatcher._instance = None
+
+    def test_server_timing_breaks_down_the_request(self):
+        response = self.client.post('/api/posts/', {"content": "Hoy me siento muy feliz"}, format='json')
+
+        stages = server_timing(response)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue({'forward', 'classification', 'db_write', 'total'} <= set(stages))
+        self.assertGreaterEqual(stages['total'], stages['classification'])
+
+    def test_server_timing_keeps_model_stages_with_batching(self):
+        with self.settings(INFERENCE_BATCHING=True):
+            response = self.client.post('/api/posts/', {"content": "Hoy me siento muy feliz"}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('forward', server_timing(response))
+
+    def test_metrics_endpoint_reports_requests_and_stages(self):
+        self.client.get('/api/posts/')
+
+        body = self.client.get('/metrics').content.decode()
+
+        self.assertIn('sentimind_http_requests_total{method="GET",view=', body)
+        self.assertIn('sentimind_stage_seconds_count{stage="serialize"}', body)
+        self.assertIn('sentimind_inference_cache_enabled 0', body)
+
+    def test_metrics_endpoint_can_be_disabled(self):
+        with self.settings(METRICS_ENABLED=False):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_metrics_endpoint_requires_the_token_when_configured(self):
+        with self.settings(METRICS_TOKEN='secreto'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer otro').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+
+    def test_inference_stats_are_admin_only(self):
+        self.assertEqual(self.client.get('/api/inference/stats/').status_code, 403)
+
+        self.client.force_authenticate(make_user('admin', is_staff=True))
+        self.assertEqual(self.client.get('/api/inference/stats/').status_code, 200)
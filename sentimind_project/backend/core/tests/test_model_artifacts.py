@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from core.application import model_artifacts
+
+
+class FakeModel:
+    def __init__(self, revision):
+        self.config = SimpleNamespace(_commit_hash=revision)
+
+    def save_pretrained(self, path):
+        with open(os.path.join(path, 'model.safetensors'), 'wb') as f:
+            f.write(b'pesos ' + self.config._commit_hash.encode())
+        with open(os.path.join(path, 'config.json'), 'w') as f:
+            f.write('{}')
+
+
+class FakeTokenizer:
+    is_fast = True
+
+    def save_pretrained(self, path):
+        with open(os.path.join(path, 'tokenizer.json'), 'w') as f:
+            f.write('{"vocab": []}')
+
+
+class ModelArtifactsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        override = override_settings(MODEL_ARTIFACTS_DIR=self.dir, MODEL_OFFLINE=False)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _write(self, revision='aaaa1111', name='xlm-roberta'):
+        return model_artifacts.write_artifact(
+            name, 'org/modelo', FakeModel(revision), FakeTokenizer(), 'zero-shot-classification'
+        )
+
+    def test_write_creates_a_current_version_with_a_manifest(self):
+        path = self._write()
+
+        current_path, manifest = model_artifacts.current_artifact('xlm-roberta')
+        self.assertEqual(current_path, path)
+        self.assertEqual(manifest["revision"], 'aaaa1111')
+        self.assertEqual(manifest["tokenizer"], 'fast')
+        self.assertEqual(set(manifest["files"]), {'config.json', 'model.safetensors', 'tokenizer.json'})
+        self.assertFalse([entry for entry in os.listdir(os.path.dirname(path)) if entry.endswith('.tmp')])
+
+    def test_resolve_prefers_the_local_artifact(self):
+        self.assertEqual(model_artifacts.resolve('xlm-roberta', 'org/modelo'), ('org/modelo', False, None))
+
+        path = self._write()
+
+        source, local_only, manifest = model_artifacts.resolve('xlm-roberta', 'org/modelo')
+        self.assertEqual((source, local_only), (path, True))
+        self.assertEqual(manifest["model"], 'org/modelo')
+
+    def test_offline_without_artifact_fails_fast(self):
+        with self.settings(MODEL_OFFLINE=True):
+            with self.assertRaisesMessage(RuntimeError, 'bundle_model xlm-roberta'):
+                model_artifacts.resolve('xlm-roberta', 'org/modelo')
+
+    def test_verify_reports_altered_and_missing_files(self):
+        path = self._write()
+        _, manifest = model_artifacts.current_artifact('xlm-roberta')
+        self.assertEqual(model_artifacts.verify(path, manifest), [])
+
+        with open(os.path.join(path, 'model.safetensors'), 'ab') as f:
+            f.write(b'corrupto')
+        os.remove(os.path.join(path, 'tokenizer.json'))
+
+        self.assertEqual(sorted(model_artifacts.verify(path, manifest)), ['model.safetensors', 'tokenizer.json'])
+
+    def test_prune_keeps_the_newest_versions_and_current(self):
+        oldest = os.path.basename(self._write('aaaa'))
+        middle = os.path.basename(self._write('bbbb'))
+        newest = os.path.basename(self._write('cccc'))
+        model_artifacts._write_current(os.path.join(self.dir, 'xlm-roberta'), oldest)
+
+        removed = model_artifacts.prune('xlm-roberta', keep=1)
+
+        self.assertEqual(removed, [middle])
+        self.assertEqual(
+            sorted(entry for entry in os.listdir(os.path.join(self.dir, 'xlm-roberta')) if entry != 'CURRENT'),
+            sorted([oldest, newest])
+        )
+
+    def test_verify_command_fails_on_missing_or_corrupt_artifacts(self):
+        with self.assertRaises(CommandError):
+            call_command('bundle_model', 'xlm-roberta', verify=True, stdout=StringIO())
+
+        path = self._write()
+        out = StringIO()
+        call_command('bundle_model', 'xlm-roberta', verify=True, stdout=out)
+        self.assertIn('[OK] xlm-roberta', out.getvalue())
+
+        os.remove(os.path.join(path, 'config.json'))
+        with self.assertRaises(CommandError):
+            call_command('bundle_model', 'xlm-roberta', verify=True, stdout=StringIO())
+
+    def test_bundle_refuses_to_download_in_offline_mode(self):
+        with self.settings(MODEL_OFFLINE=True):
+            with self.assertRaisesMessage(CommandError, 'MODEL_OFFLINE=False'):
+                call_command('bundle_model', 'xlm-roberta', stdout=StringIO())
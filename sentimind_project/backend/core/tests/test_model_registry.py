@@ -0,0 +1,181 @@
+import threading
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from core.application.ai_service import LoadedModel, MiningEngine
+from core.application.model_registry import ModelRegistry, select_model
+from core.models import ModelSelection
+from core.tests.helpers import make_user, stub_settings
+
+
+SPECS = {
+    "principal": {"model": "org/principal", "load": "eager", "fallback": "respaldo"},
+    "respaldo": {"model": "org/respaldo", "load": "lazy"},
+    "nuevo": {"model": "org/nuevo", "load": "lazy"},
+}
+
+
+class FakeEngine(MiningEngine):
+    """MiningEngine sin transformers: cada modelo responde con su nombre."""
+
+    _classifier = None
+    _model_name = None
+    _precision = None
+    _method = None
+    _active = None
+    _ready = False
+    _load_lock = threading.Lock()
+
+    broken = set()
+    loads = []
+    gate = None
+
+    @classmethod
+    def load_model(cls, name, spec):
+        if cls.gate is not None:
+            cls.gate.wait(5)
+        if name in cls.broken:
+            raise OSError(f"no se pudo descargar {spec['model']}")
+        cls.loads.append(name)
+        return LoadedModel(name, spec["model"], object(), 'fp32', f"{name}:fp32", '{}', [], [])
+
+    @classmethod
+    def analyze_with(cls, model, texts):
+        return [{"main_sentiment": "Alegría", "method": model.method} for _ in texts]
+
+
+class ModelRegistryTests(TestCase):
+
+    def setUp(self):
+        FakeEngine._classifier = FakeEngine._active = None
+        FakeEngine.broken = set()
+        FakeEngine.loads = []
+        FakeEngine.gate = None
+        self.registry = ModelRegistry(FakeEngine, SPECS)
+
+    def _start(self):
+        FakeEngine.swap(self.registry.load_initial())
+
+    def _wait_for_swap(self):
+        for _ in range(500):
+            if self.registry.status()["loading"] is None:
+                return
+            threading.Event().wait(0.01)
+        self.fail("El cambio de modelo no termino")
+
+    def test_loads_the_initial_model(self):
+        self._start()
+
+        self.assertEqual(self.registry.active, "principal")
+        self.assertEqual(FakeEngine.analyze_batch(["hola"])[0]["method"], "principal:fp32")
+
+    def test_falls_back_when_the_initial_model_does_not_load(self):
+        FakeEngine.broken = {"principal"}
+
+        self._start()
+
+        self.assertEqual(self.registry.active, "respaldo")
+
+    def test_raises_when_no_model_in_the_chain_loads(self):
+        FakeEngine.broken = {"principal", "respaldo"}
+
+        with self.assertRaises(RuntimeError):
+            self.registry.load_initial()
+
+    def test_selected_model_wins_over_the_initial_one(self):
+        ModelSelection.objects.create(pk=1, name="nuevo")
+
+        self._start()
+
+        self.assertEqual(self.registry.active, "nuevo")
+
+    def test_preload_standby_loads_eager_models_without_inference(self):
+        ModelSelection.objects.create(pk=1, name="nuevo")
+        self._start()
+
+        with mock.patch.object(FakeEngine, 'analyze_with') as analyze_with:
+            self.registry.preload_standby()
+
+        self.assertEqual(FakeEngine.loads, ["nuevo", "principal"])
+        self.assertEqual({model.name for model in self.registry.loaded_models()}, {"nuevo", "principal"})
+        analyze_with.assert_not_called()
+
+    def test_previous_model_serves_until_the_swap_finishes(self):
+        self._start()
+        FakeEngine.gate = threading.Event()
+
+        self.assertTrue(self.registry.activate("nuevo"))
+        self.assertFalse(self.registry.activate("respaldo"))
+        self.assertEqual(FakeEngine.analyze_batch(["hola"])[0]["method"], "principal:fp32")
+        self.assertEqual(self.registry.status()["loading"], "nuevo")
+
+        FakeEngine.gate.set()
+        self._wait_for_swap()
+
+        self.assertEqual(self.registry.active, "nuevo")
+        self.assertEqual(FakeEngine.analyze_batch(["hola"])[0]["method"], "nuevo:fp32")
+
+    def test_failed_swap_keeps_the_active_model(self):
+        self._start()
+        FakeEngine.broken = {"nuevo"}
+
+        self.registry.activate("nuevo", wait=True)
+
+        self.assertEqual(self.registry.active, "principal")
+        self.assertIn("nuevo", self.registry.status()["error"])
+
+    def test_lazy_model_is_released_after_being_replaced(self):
+        self._start()
+        self.registry.activate("nuevo", wait=True)
+        self.registry.activate("principal", wait=True)
+
+        models = self.registry.status()["models"]
+        self.assertTrue(models["principal"]["loaded"])
+        self.assertFalse(models["nuevo"]["loaded"])
+
+    def test_sync_activates_the_model_chosen_by_another_worker(self):
+        self._start()
+        ModelSelection.objects.create(pk=1, name="nuevo")
+
+        with self.settings(MODEL_SWITCH_POLL_SECONDS=0.001):
+            threading.Event().wait(0.01)
+            self.registry.sync()
+        self._wait_for_swap()
+
+        self.assertEqual(self.registry.active, "nuevo")
+
+    def test_invalid_registry_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ModelRegistry(FakeEngine, {"a": {"model": "x", "fallback": "b"}})
+        with self.assertRaises(ImproperlyConfigured):
+            ModelRegistry(FakeEngine, {"a": {"model": "x", "load": "siempre"}})
+        with self.assertRaises(ImproperlyConfigured):
+            ModelRegistry(FakeEngine, {"a": {"model": "x", "labels": {"Nostalgia": "nostalgia"}}})
+
+    def test_select_model_rejects_unknown_names(self):
+        ModelRegistry._instance = self.registry
+        self.addCleanup(setattr, ModelRegistry, '_instance', None)
+
+        self.assertEqual(select_model("respaldo"), "respaldo")
+        self.assertEqual(ModelSelection.objects.get(pk=1).name, "respaldo")
+        with self.assertRaises(ValueError):
+            select_model("inexistente")
+
+
+@stub_settings()
+class ModelRegistryViewTests(APITestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, ModelRegistry, '_instance', None)
+
+    def test_registry_status_is_admin_only(self):
+        self.client.force_authenticate(make_user())
+        self.assertEqual(self.client.get('/api/inference/models/').status_code, 403)
+
+        self.client.force_authenticate(make_user('admin', is_staff=True))
+        response = self.client.get('/api/inference/models/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('models', response.json())
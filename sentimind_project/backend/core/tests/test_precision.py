@@ -0,0 +1,110 @@
+import io
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+import evaluate_model
+from core.application import ai_service
+from core.application.ai_service import LoadedModel, MiningEngine
+from core.application.model_registry import ModelRegistry
+
+
+class BuildPipelineTests(SimpleTestCase):
+    """_build_pipeline sin descargar modelos: el modelo y el pipeline son mocks."""
+
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            ai_service,
+            AutoModelForSequenceClassification=mock.DEFAULT,
+            pipeline=mock.DEFAULT,
+        )
+        self.mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = self.mocks['AutoModelForSequenceClassification'].from_pretrained.return_value
+
+    def test_fp32_uses_the_original_model(self):
+        _, precision = MiningEngine._build_pipeline("modelo", mock.Mock(), "fp32")
+
+        self.assertEqual(precision, "fp32")
+        self.assertIs(self.mocks['pipeline'].call_args.kwargs['model'], self.model)
+
+    def test_unknown_precision_falls_back_to_fp32(self):
+        _, precision = MiningEngine._build_pipeline("modelo", mock.Mock(), "fp8")
+
+        self.assertEqual(precision, "fp32")
+
+    def test_int8_quantizes_linear_layers(self):
+        torch = mock.Mock()
+        with mock.patch.dict(sys.modules, {'torch': torch}):
+            _, precision = MiningEngine._build_pipeline("modelo", mock.Mock(), "int8")
+
+        self.assertEqual(precision, "int8")
+        quantize = torch.ao.quantization.quantize_dynamic
+        quantize.assert_called_once_with(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.assertIs(self.mocks['pipeline'].call_args.kwargs['model'], quantize.return_value)
+
+    def test_onnx_without_optimum_falls_back_to_int8(self):
+        torch = mock.Mock()
+        # None en sys.modules hace que el import falle con ImportError
+        with mock.patch.dict(sys.modules, {'torch': torch, 'optimum': None, 'optimum.onnxruntime': None}):
+            _, precision = MiningEngine._build_pipeline("modelo", mock.Mock(), "onnx")
+
+        self.assertEqual(precision, "int8")
+
+    def test_instrumented_pipeline_keeps_its_stages(self):
+        classifier, _ = MiningEngine._build_pipeline("modelo", mock.Mock(), "fp32")
+
+        self.assertIs(classifier, self.mocks['pipeline'].return_value)
+        self.assertTrue(callable(classifier.preprocess))
+        self.assertTrue(callable(classifier._forward))
+
+
+class PrecisionFingerprintTests(SimpleTestCase):
+
+    def test_precision_is_part_of_the_fingerprint(self):
+        with mock.patch.object(MiningEngine, '_precision', 'fp32'):
+            fp32 = MiningEngine.fingerprint()
+        with mock.patch.object(MiningEngine, '_precision', 'int8'):
+            int8 = MiningEngine.fingerprint()
+
+        self.assertNotEqual(fp32, int8)
+
+    def test_method_records_model_and_precision(self):
+        result = MiningEngine._build_result(
+            {"labels": ["Alegría", "Tristeza"], "scores": [0.9, 0.1]}, "xlm-roberta-local:int8"
+        )
+
+        self.assertEqual(result["method"], "xlm-roberta-local:int8")
+        self.assertEqual(result["main_sentiment"], "Alegría")
+
+
+class ComparePrecisionsTests(TestCase):
+    """compare_precisions fuerza la precision en la spec del registro y reporta la efectiva."""
+
+    def test_precision_overrides_the_registry_spec_and_reports_the_effective_one(self):
+        registry = ModelRegistry(MiningEngine, {"xlm": {"model": "org/xlm", "precision": "fp32"}})
+        effective = {"fp32": "fp32", "onnx": "int8"}
+        specs = []
+
+        def load_model(name, spec):
+            specs.append(spec)
+            precision = effective[spec["precision"]]
+            return LoadedModel(name, spec["model"], None, precision, f"{name}:{precision}", '{}', [], [])
+
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        with mock.patch.object(ModelRegistry, 'get_instance', return_value=registry), \
+                mock.patch.object(MiningEngine, 'load_model', side_effect=load_model), \
+                mock.patch.object(MiningEngine, 'analyze_with', return_value=[{"main_sentiment": "Alegría"}]), \
+                redirect_stdout(io.StringIO()):
+            rows = evaluate_model.compare_precisions(["fp32", "onnx"], output_dir=output_dir)
+
+        self.assertEqual([spec["precision"] for spec in specs], ["fp32", "onnx"])
+        self.assertEqual(
+            [(row["requested_precision"], row["precision"], row["method"]) for row in rows],
+            [("fp32", "fp32", "xlm:fp32"), ("onnx", "int8", "xlm:int8")],
+        )
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.apps import apps
+from django.test import TestCase
+
+from core.application.stub_engine import StubEngine
+from core.tests.helpers import stub_settings
+
+
+@stub_settings(MODEL_WARMUP='background')
+class ReadinessTests(TestCase):
+
+    def setUp(self):
+        self._reset_engine()
+        self.addCleanup(self._reset_engine)
+
+    @staticmethod
+    def _reset_engine():
+        StubEngine._ready = False
+        StubEngine._warmup_seconds = None
+        StubEngine._warmup_error = None
+
+    def test_ready_when_warmup_is_disabled(self):
+        with self.settings(MODEL_WARMUP='off'):
+            response = self.client.get('/ready/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["warmup"], "disabled")
+
+    def test_503_until_the_model_is_warm(self):
+        response = self.client.get('/ready/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "warming_up")
+
+    def test_ready_after_warmup(self):
+        StubEngine.warmup()
+
+        response = self.client.get('/ready/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ready")
+        self.assertIsNotNone(response.json()["warmup_seconds"])
+
+    def test_failed_warmup_reports_the_error(self):
+        with mock.patch.object(StubEngine, 'analyze_batch', side_effect=RuntimeError("pesos corruptos")):
+            with self.assertRaises(RuntimeError):
+                StubEngine.warmup()
+
+        response = self.client.get('/ready/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "error")
+        self.assertEqual(response.json()["error"], "pesos corruptos")
+
+    def test_background_warmup_swallows_the_error(self):
+        with mock.patch.object(StubEngine, 'analyze_batch', side_effect=RuntimeError("sin red")):
+            apps.get_app_config('core')._background_warmup(StubEngine)
+
+        self.assertFalse(StubEngine.is_ready())
+        self.assertEqual(StubEngine.readiness()["error"], "sin red")
@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from core.application import request_context
+from core.infrastructure.structured_logging import AsyncQueueHandler, JsonFormatter, RequestIdFilter
+from core.tests.helpers import reset_singletons, stub_settings
+
+
+def make_record(msg='mensaje', **extra):
+    record = logging.LogRecord('core.ai', logging.INFO, __file__, 1, msg, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class RequestIdFilterTests(SimpleTestCase):
+
+    def test_uses_the_request_in_progress(self):
+        token = request_context.begin('abc123')
+        try:
+            record = make_record()
+            RequestIdFilter().filter(record)
+        finally:
+            request_context.end(token)
+
+        self.assertEqual(record.request_id, 'abc123')
+
+    def test_falls_back_to_the_request_attached_to_the_record(self):
+        class Request:
+            request_id = 'de-django-request'
+
+        record = make_record(request=Request())
+        RequestIdFilter().filter(record)
+
+        self.assertEqual(record.request_id, 'de-django-request')
+
+    def test_outside_a_request_is_none(self):
+        record = make_record()
+        RequestIdFilter().filter(record)
+
+        self.assertIsNone(record.request_id)
+
+
+class JsonFormatterTests(SimpleTestCase):
+
+    def test_one_json_object_with_extra_fields(self):
+        line = JsonFormatter().format(make_record('hola %s', latency_ms=12.5, request_id='r1'))
+
+        payload = json.loads(line)
+        self.assertEqual(payload["message"], "hola %s")
+        self.assertEqual(payload["latency_ms"], 12.5)
+        self.assertEqual(payload["request_id"], "r1")
+        self.assertEqual(payload["logger"], "core.ai")
+
+
+class AsyncQueueHandlerTests(SimpleTestCase):
+
+    def test_writes_from_the_listener_thread(self):
+        stream = io.StringIO()
+        handler = AsyncQueueHandler(max_size=10, stream=stream)
+
+        handler.handle(make_record('escrito', request_id=None))
+        handler.close()
+
+        self.assertEqual(json.loads(stream.getvalue())["message"], "escrito")
+
+    def test_close_is_idempotent(self):
+        handler = AsyncQueueHandler(max_size=10, stream=io.StringIO())
+        handler.handle(make_record('escrito', request_id=None))
+
+        handler.close()
+        handler.close()
+
+        self.assertIsNone(handler._listener)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = AsyncQueueHandler(max_size=1, stream=io.StringIO())
+
+        handler.enqueue(make_record('uno'))
+        handler.enqueue(make_record('dos'))
+
+        self.assertEqual(handler.dropped, 1)
+
+
+@stub_settings()
+class RequestIdMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        reset_singletons()
+
+    def test_echoes_a_valid_incoming_request_id(self):
+        response = self.client.get('/api/posts/', HTTP_X_REQUEST_ID='proxy-42')
+
+        self.assertEqual(response['X-Request-ID'], 'proxy-42')
+
+    def test_replaces_an_invalid_incoming_request_id(self):
+        response = self.client.get('/api/posts/', HTTP_X_REQUEST_ID='no valido <script>')
+
+        self.assertRegex(response['X-Request-ID'], r'^[0-9a-f]{32}$')
+
+    def test_django_request_error_logs_carry_the_request_id(self):
+        with self.assertLogs('django.request', level='WARNING') as logs:
+            response = self.client.get('/api/posts/?since=abc', HTTP_X_REQUEST_ID='peticion-400')
+
+        self.assertEqual(response.status_code, 400)
+        record = logs.records[0]
+        RequestIdFilter().filter(record)
+        self.assertEqual(record.request_id, 'peticion-400')
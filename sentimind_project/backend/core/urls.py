@@ -1,7 +1,18 @@
 from django.urls import path
-from core.infrastructure.views import PostListCreateView, CategoryListView
+from core.infrastructure.views import (
+    PostListCreateView, PostBulkCreateView, PostExportView, PostDetailView, CategoryListView,
+    InferenceStatsView, ModelRegistryView, EmotionDistributionView, TopCategoriesView, AuthorEmotionProfileView
+)
 
 urlpatterns = [
     path('posts/', PostListCreateView.as_view(), name='post-list-create'),
+    path('posts/bulk/', PostBulkCreateView.as_view(), name='post-bulk-create'),
+    path('posts/export/', PostExportView.as_view(), name='post-export'),
+    path('posts/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
     path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('inference/stats/', InferenceStatsView.as_view(), name='inference-stats'),
+    path('inference/models/', ModelRegistryView.as_view(), name='inference-models'),
+    path('analytics/distribution/', EmotionDistributionView.as_view(), name='analytics-distribution'),
+    path('analytics/top-categories/', TopCategoriesView.as_view(), name='analytics-top-categories'),
+    path('analytics/authors/<int:author_id>/', AuthorEmotionProfileView.as_view(), name='analytics-author'),
 ]
@@ -1,22 +1,32 @@
 #!/bin/bash
 set -e
 
+# Worker de clasificacion asincrona (ASYNC_CLASSIFICATION): su propio
+# contenedor o proceso supervisado (servicio "worker" de docker-compose.yml).
+# Con exec recibe el SIGTERM del orquestador y termina el batch en curso
+if [ "$1" = "worker" ]; then
+    echo "🧠 Starting classification worker..."
+    exec python manage.py process_classification_jobs
+fi
+
 echo "🚀 Starting SentiMind Backend..."
 
-# Ejecutar migraciones
-echo "📦 Running database migrations..."
-python manage.py migrate --noinput
+# Ejecutar migraciones (con DATABASE_URL y varios contenedores, solo en uno:
+# MIGRATE_ON_START=false en el resto)
+MIGRATE_ON_START="${MIGRATE_ON_START:-true}"
+case "${MIGRATE_ON_START,,}" in
+    true|1|yes)
+        echo "📦 Running database migrations..."
+        python manage.py migrate --noinput
+        ;;
+esac
 
 # Colectar archivos estáticos
 echo "📁 Collecting static files..."
 python manage.py collectstatic --noinput
 
-# Iniciar gunicorn
+# Iniciar gunicorn (con warm-up del modelo en cada worker; ver /ready/)
+# Workers, threads y modelo compartido (SHARED_MODEL) se configuran en gunicorn.conf.py
+export MODEL_WARMUP="${MODEL_WARMUP:-background}"
 echo "🌐 Starting Gunicorn on port ${PORT:-8000}..."
-exec gunicorn sentimind.wsgi:application \
-    --bind 0.0.0.0:${PORT:-8000} \
-    --workers 2 \
-    --threads 2 \
-    --timeout 120 \
-    --access-logfile - \
-    --error-logfile -
+exec gunicorn sentimind.wsgi:application -c gunicorn.conf.py
@@ -1,10 +1,20 @@
 """
 Script de Evaluacion del Modelo de Clasificacion de Sentimientos.
 Genera metricas formales: Accuracy, Precision, Recall, F1-Score, Matriz de Confusion.
+
+Uso:
+    uv run python evaluate_model.py
+    uv run python evaluate_model.py --dataset posts.csv --workers 4 --batch-size 32
 """
 import sys
 import os
+import argparse
+import csv
+import gc
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from itertools import islice
 import json
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -237,8 +247,389 @@ def save_results(metrics, results, output_dir='evaluation_results'):
     print(f"   Metricas guardadas: {output_dir}/metrics.json")
 
 
+def current_rss_mb():
+    """Memoria residente actual del proceso en MB (Linux), o el pico si no hay /proc."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def compare_precisions(precisions, output_dir='evaluation_results'):
+    """
+    Compara accuracy vs latencia de cada precision de inferencia
+    (ver MiningEngine.PRECISIONS) sobre EVALUATION_DATASET.
+
+    Usa el modelo seleccionado del registro y carga una copia por precision
+    con la precision forzada en su spec (la del registro tiene prioridad
+    sobre MiningEngine.PRECISION). Cada fila reporta la precision efectiva:
+    un fallback (onnx -> int8, ...) no se confunde con la pedida.
+    """
+    from core.application.model_registry import ModelRegistry
+
+    print("=" * 80)
+    print("COMPARACION DE PRECISION DE INFERENCIA (accuracy vs latencia)")
+    print("=" * 80)
+    
+    registry = ModelRegistry.get_instance()
+    name = registry.selected()
+    spec = registry.specs[name]
+    MiningEngine.unload()
+
+    comparison = []
+    for requested in precisions:
+        rss_before = current_rss_mb()
+        
+        started = time.perf_counter()
+        model = MiningEngine.load_model(name, {**spec, 'precision': requested})
+        MiningEngine.analyze_with(model, [MiningEngine.WARMUP_TEXT])
+        load_seconds = time.perf_counter() - started
+        
+        latencies = []
+        correct = 0
+        for text, expected_category in EVALUATION_DATASET:
+            t0 = time.perf_counter()
+            analysis = MiningEngine.analyze_with(model, [text])[0]
+            latencies.append(time.perf_counter() - t0)
+            correct += analysis['main_sentiment'] == expected_category
+        
+        latencies.sort()
+        row = {
+            'model': name,
+            'requested_precision': requested,
+            'precision': model.precision,
+            'method': model.method,
+            'accuracy': correct / len(EVALUATION_DATASET),
+            'load_seconds': round(load_seconds, 2),
+            'mean_latency_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+            'p95_latency_ms': round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+            'model_rss_mb': round(current_rss_mb() - rss_before, 1),
+        }
+        comparison.append(row)
+        print(f"  {row['method']:32s} acc={row['accuracy']:.2%}  "
+              f"media={row['mean_latency_ms']:.0f}ms  p95={row['p95_latency_ms']:.0f}ms  "
+              f"rss=+{row['model_rss_mb']:.0f}MB")
+        # Liberar esta copia antes de cargar la siguiente
+        del model
+        gc.collect()
+    
+    os.makedirs(output_dir, exist_ok=True)
+    with open(f'{output_dir}/precision_comparison.json', 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'results': comparison}, f, indent=2)
+    print(f"   Comparacion guardada: {output_dir}/precision_comparison.json")
+    return comparison
+
+
+# ---------------------------------------------------------------------------
+# Evaluacion sobre datasets externos (CSV/JSONL), paralela y reanudable
+# ---------------------------------------------------------------------------
+
+def iter_dataset(path, text_field='text', label_field='label'):
+    """
+    Recorre un dataset CSV (con cabecera) o JSONL sin cargarlo en memoria.
+    Produce (indice, texto, etiqueta); omite filas sin texto o sin etiqueta.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                if row.get(text_field) and row.get(label_field):
+                    yield index, row[text_field], row[label_field]
+    else:
+        with open(path, encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row.get(text_field) and row.get(label_field):
+                    yield index, row[text_field], row[label_field]
+
+
+def _init_eval_worker(torch_threads):
+    """Inicializa un proceso del pool: hilos de torch y carga del modelo."""
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+    from core.application.engines import get_engine
+    get_engine().get_classifier()
+
+
+def _classify_chunk(chunk):
+    """
+    Clasifica un batch [(indice, texto, etiqueta)] y retorna sus predicciones.
+    Si el batch falla, cada fila se retorna con 'error' en lugar de 'predicted'.
+    """
+    from core.application.engines import get_engine
+    try:
+        analyses = get_engine().analyze_batch([text for _, text, _ in chunk])
+    except Exception as e:
+        print(f"[ERROR] Fallo el batch que empieza en la fila {chunk[0][0]}: {e}")
+        return [{'index': index, 'label': label, 'error': str(e)} for index, _, label in chunk]
+    return [
+        {'index': index, 'label': label,
+         'predicted': analysis['main_sentiment'], 'confidence': analysis['confidence_score']}
+        for (index, _, label), analysis in zip(chunk, analyses)
+    ]
+
+
+class StreamingMetrics:
+    """
+    Accuracy, precision/recall/F1 (por etiqueta, macro y weighted) y matriz
+    de confusion acumuladas prediccion a prediccion: la memoria depende del
+    numero de etiquetas, no del tamaño del dataset.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.correct = 0
+        self.confusion = {}
+
+    def add(self, label, predicted):
+        self.total += 1
+        self.correct += label == predicted
+        row = self.confusion.setdefault(label, {})
+        row[predicted] = row.get(predicted, 0) + 1
+
+    def labels(self):
+        labels = set(self.confusion)
+        for row in self.confusion.values():
+            labels.update(row)
+        return sorted(labels)
+
+    def compute(self):
+        labels = self.labels()
+        per_label = {}
+        for label in labels:
+            tp = self.confusion.get(label, {}).get(label, 0)
+            support = sum(self.confusion.get(label, {}).values())
+            predicted = sum(row.get(label, 0) for row in self.confusion.values())
+            precision = tp / predicted if predicted else 0.0
+            recall = tp / support if support else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            per_label[label] = {'precision': precision, 'recall': recall, 'f1': f1, 'support': support}
+
+        with_support = [m for m in per_label.values() if m['support']]
+        total_support = sum(m['support'] for m in with_support)
+
+        def weighted(key):
+            return sum(m[key] * m['support'] for m in with_support) / total_support if total_support else 0.0
+
+        def macro(key):
+            return sum(m[key] for m in with_support) / len(with_support) if with_support else 0.0
+
+        return {
+            'samples': self.total,
+            'accuracy': self.correct / self.total if self.total else 0.0,
+            'precision_weighted': weighted('precision'),
+            'recall_weighted': weighted('recall'),
+            'f1_weighted': weighted('f1'),
+            'precision_macro': macro('precision'),
+            'recall_macro': macro('recall'),
+            'f1_macro': macro('f1'),
+            'per_label': per_label,
+            'labels': labels,
+            'confusion_matrix': [
+                [self.confusion.get(true, {}).get(pred, 0) for pred in labels] for true in labels
+            ],
+        }
+
+
+def _checkpoint_header(path, text_field, label_field, fingerprint):
+    """Cabecera del checkpoint: identifica el dataset, sus campos y el modelo."""
+    return {
+        'dataset': os.path.abspath(path),
+        'text_field': text_field,
+        'label_field': label_field,
+        'fingerprint': fingerprint,
+    }
+
+
+def _read_checkpoint(path, header):
+    """
+    Indices ya clasificados en el checkpoint (vacio si no existe). Termina
+    con error si el checkpoint es de otro dataset, otros campos u otro modelo.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        stored = json.loads(f.readline() or '{}')
+        mismatched = [key for key in header if stored.get(key) != header[key]]
+        if mismatched:
+            raise SystemExit(
+                f"El checkpoint {path} no corresponde a esta evaluacion "
+                f"(difiere: {', '.join(mismatched)}); usa --restart o --checkpoint para otro archivo"
+            )
+        for line in f:
+            try:
+                done.add(json.loads(line)['index'])
+            except (ValueError, KeyError):
+                # Linea truncada por una interrupcion: se vuelve a clasificar
+                continue
+    return done
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _iter_checkpoint(path):
+    with open(path, encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def evaluate_dataset(path, workers=1, batch_size=32, checkpoint=None, restart=False,
+                     text_field='text', label_field='label', torch_threads=None,
+                     output_dir='evaluation_results'):
+    """
+    Evalua el modelo sobre un dataset CSV/JSONL etiquetado.
+
+    Las filas se leen en streaming y se clasifican en batches de batch_size
+    repartidos entre workers procesos (cada uno con su copia del modelo).
+    Cada prediccion se agrega al checkpoint (JSONL) en cuanto llega, asi
+    que una ejecucion interrumpida continua donde quedo. Las filas de un
+    batch que fallo no se guardan: se cuentan en 'failed', quedan fuera de
+    las metricas y se reintentan al reanudar. Las metricas se calculan
+    recorriendo el checkpoint, sin cargar las predicciones en memoria.
+    """
+    from core.application.engines import get_engine
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = checkpoint or os.path.join(output_dir, 'predictions.jsonl')
+    # La huella depende del modelo efectivamente cargado (registro, modelo
+    # seleccionado, fallback): se carga antes de escribir o comparar la cabecera.
+    # Con workers > 1 los procesos del pool lo heredan por fork
+    engine = get_engine()
+    engine.get_classifier()
+    header = _checkpoint_header(path, text_field, label_field, engine.fingerprint())
+
+    if restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    done = _read_checkpoint(checkpoint, header)
+
+    print("=" * 80)
+    print("EVALUACION SOBRE DATASET")
+    print("=" * 80)
+    print(f"Dataset: {path}")
+    print(f"Checkpoint: {checkpoint} ({len(done)} predicciones previas)")
+    print(f"Procesos: {workers}  |  Batch: {batch_size}")
+    print("=" * 80)
+
+    pending_rows = (row for row in iter_dataset(path, text_field, label_field) if row[0] not in done)
+    chunks = iter(lambda: list(islice(pending_rows, batch_size)), [])
+
+    new_file = not os.path.exists(checkpoint)
+    started = time.perf_counter()
+    classified = 0
+    failed = 0
+    with open(checkpoint, 'a', encoding='utf-8') as out:
+        if new_file:
+            out.write(json.dumps(header, ensure_ascii=False) + "\n")
+        elif out.tell() and not _ends_with_newline(checkpoint):
+            # La ejecucion anterior se corto a mitad de linea
+            out.write("\n")
+
+        def write(predictions):
+            nonlocal classified, failed
+            for prediction in predictions:
+                if 'error' in prediction:
+                    failed += 1
+                    continue
+                out.write(json.dumps(prediction, ensure_ascii=False) + "\n")
+                classified += 1
+            out.flush()
+            rate = classified / (time.perf_counter() - started)
+            print(f"  {len(done) + classified:>8,} clasificados ({rate:.1f} textos/s)", end='\r')
+
+        if workers <= 1:
+            _init_eval_worker(torch_threads)
+            for chunk in chunks:
+                write(_classify_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_eval_worker, initargs=(torch_threads,)
+            ) as pool:
+                # Como maximo 2 batches en vuelo por proceso: el dataset nunca
+                # se materializa completo en la cola del pool
+                in_flight = set()
+                for chunk in chunks:
+                    in_flight.add(pool.submit(_classify_chunk, chunk))
+                    if len(in_flight) >= workers * 2:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(future.result())
+                for future in in_flight:
+                    write(future.result())
+    print()
+
+    metrics = StreamingMetrics()
+    for prediction in _iter_checkpoint(checkpoint):
+        metrics.add(prediction['label'], prediction['predicted'])
+    result = metrics.compute()
+    result['dataset'] = path
+    result['failed'] = failed
+    result['elapsed_seconds'] = round(time.perf_counter() - started, 2)
+    result['timestamp'] = datetime.now().isoformat()
+
+    print("\n" + "=" * 80)
+    print("METRICAS DE EVALUACION")
+    print("=" * 80)
+    print(f"\nMuestras:  {result['samples']:,}")
+    if failed:
+        print(f"Fallidas:  {failed:,} (fuera de las metricas; se reintentan al reanudar)")
+    print(f"ACCURACY:  {result['accuracy']:.4f}")
+    print(f"F1 weighted: {result['f1_weighted']:.4f}  |  F1 macro: {result['f1_macro']:.4f}")
+    print(f"\n{'Categoria':15s} {'Precision':>10s} {'Recall':>10s} {'F1':>10s} {'Soporte':>10s}")
+    for label, m in result['per_label'].items():
+        print(f"{label:15s} {m['precision']:10.4f} {m['recall']:10.4f} {m['f1']:10.4f} {m['support']:10d}")
+
+    with open(f'{output_dir}/dataset_metrics.json', 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\n   Metricas guardadas: {output_dir}/dataset_metrics.json")
+    return result
+
+
 def main():
     """Funcion principal."""
+    parser = argparse.ArgumentParser(description="Evaluacion del modelo de clasificacion")
+    parser.add_argument(
+        '--compare-precision', metavar='LISTA',
+        help="Compara precisiones de inferencia, p. ej. fp32,int8,onnx"
+    )
+    parser.add_argument('--dataset', help="Dataset etiquetado CSV o JSONL (en lugar de EVALUATION_DATASET)")
+    parser.add_argument('--text-field', default='text', help="Columna/campo con el texto")
+    parser.add_argument('--label-field', default='label', help="Columna/campo con la etiqueta esperada")
+    parser.add_argument('--workers', type=int, default=1, help="Procesos de clasificacion")
+    parser.add_argument('--batch-size', type=int, default=32, help="Textos por batch")
+    parser.add_argument('--torch-threads', type=int, help="Hilos de torch por proceso")
+    parser.add_argument('--checkpoint', help="Archivo JSONL de predicciones (por defecto evaluation_results/predictions.jsonl)")
+    parser.add_argument('--restart', action='store_true', help="Descarta el checkpoint y empieza de cero")
+    args = parser.parse_args()
+    
+    if args.compare_precision:
+        compare_precisions([p.strip() for p in args.compare_precision.split(',')])
+        return
+    
+    if args.dataset:
+        evaluate_dataset(
+            args.dataset, workers=args.workers, batch_size=args.batch_size,
+            checkpoint=args.checkpoint, restart=args.restart,
+            text_field=args.text_field, label_field=args.label_field,
+            torch_threads=args.torch_threads
+        )
+        return
+    
     if not HAS_SKLEARN:
         print("Error: Se requiere scikit-learn y matplotlib")
         return
@@ -0,0 +1,73 @@
+"""
+Configuracion de gunicorn para SentiMind.
+Uso: gunicorn sentimind.wsgi:application -c gunicorn.conf.py
+
+Con SHARED_MODEL=True el modelo se carga una sola vez en el proceso master
+(preload_app) y los workers lo heredan por fork. Los pesos no se modifican
+durante la inferencia, asi que sus paginas de memoria quedan compartidas
+(copy-on-write): cada worker adicional solo cuesta la memoria de atender
+peticiones, no otra copia del modelo.
+"""
+import gc
+import os
+
+
+def _env_flag(name, default='False'):
+    return os.environ.get(name, default).lower() in ('true', '1', 'yes')
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '2'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+# La app ya registra cada peticion en JSON (sentimind.request, con request id
+# y latencia): GUNICORN_ACCESSLOG= (vacio) desactiva el access log duplicado
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-') or None
+errorlog = '-'
+
+# Modelo compartido entre workers
+preload_app = _env_flag('SHARED_MODEL')
+
+if preload_app:
+    # El master solo carga los pesos (sin hilos ni inferencia antes del fork)
+    os.environ['MODEL_WARMUP'] = 'preload'
+
+
+def on_starting(server):
+    # FEED_CACHE con locmem y varios workers serviria feeds ya invalidados.
+    # Solo lee settings: django.setup() en el master haria el warm-up antes del fork
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentimind.settings')
+    from core.application.feed_cache import check_shared_cache
+    check_shared_cache(server.cfg.workers)
+
+
+def when_ready(server):
+    if preload_app:
+        # Los workers abren sus propias conexiones (y pools) a la base
+        from sentimind.database import close_connections
+        close_connections()
+
+        # Mover los objetos ya creados a la generacion permanente: el GC de
+        # los workers no los recorre y no ensucia sus paginas compartidas
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+
+    num_threads = os.environ.get('TORCH_NUM_THREADS')
+    if num_threads:
+        import torch
+        torch.set_num_threads(int(num_threads))
+
+    # Inferencia de prueba en el worker (inicializa los kernels en este proceso).
+    # Los modelos en espera ya los cargo el master: no se cargan por worker
+    from core.application.engines import get_engine
+    try:
+        get_engine().warmup(standby=False)
+    except Exception as e:
+        # El worker sigue atendiendo sin estar listo (/ready/ responde 503 con
+        # el error). Relanzar haria que gunicorn lo reemplace por otro worker
+        # que fallaria igual, en bucle
+        worker.log.error("Fallo el warm-up del modelo en el worker %s: %s", worker.pid, e)
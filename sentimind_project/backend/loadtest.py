@@ -0,0 +1,399 @@
+"""
+Prueba de carga HTTP de la API de posts.
+
+Arranca gunicorn contra una base SQLite temporal (no toca data/db.sqlite3),
+con el motor stub en lugar de XLM-RoBERTa, y lanza una mezcla de lecturas
+del feed (con filtros), creacion de posts e ingesta masiva con la
+concurrencia indicada. Reporta por endpoint: histograma de latencias,
+p50/p95/p99, tasa de errores y consultas SQL por peticion (X-DB-Queries).
+
+Uso:
+    uv run python loadtest.py --workers 2 --threads 4 --concurrency 16 --duration 30
+    uv run python loadtest.py --mix feed=70,feed_category=20,create=10 --stub-latency-ms 40
+    uv run python loadtest.py --engine nli        # modelo real (lento)
+"""
+import sys
+import os
+import argparse
+import base64
+import json
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentimind.settings')
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+USERNAME = 'loadtest'
+PASSWORD = 'loadtest-password'
+
+DEFAULT_MIX = 'feed=55,feed_category=15,feed_primary=5,categories=5,create=15,bulk=5'
+
+# Limites superiores (ms) de los buckets del histograma
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+SAMPLE_TEXTS = [
+    "Hoy me siento increiblemente feliz, consegui el trabajo que tanto queria",
+    "No puedo creer que me hayan cancelado el vuelo otra vez, que desastre",
+    "Extraño mucho a mi abuela, ya van dos años sin ella",
+    "Jajaja mi perro se comio mis zapatos y ahora me mira con cara de inocente",
+    "Cada dia es una oportunidad para ser mejor persona",
+    "Que maravilla, otra vez lunes. Justo lo que necesitaba",
+    "Tengo mucho miedo de la entrevista de mañana",
+    "Me pregunto si estamos usando bien nuestro tiempo",
+]
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Operacion desconocida en --mix: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# ---------------------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------------------
+
+def server_env(args, db_path):
+    env = dict(os.environ)
+    env.update({
+        'SQLITE_PATH': db_path,
+        'SCORING_MODE': args.engine,
+        'STUB_ENGINE_LATENCY_MS': str(args.stub_latency_ms),
+        'QUERY_COUNT_HEADER': 'True',
+        'MODEL_WARMUP': 'off',
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'PORT': str(args.port),
+        'GUNICORN_WORKERS': str(args.workers),
+        'GUNICORN_THREADS': str(args.threads),
+        'DB_WRITE_QUEUE': str(args.write_queue),
+    })
+    return env
+
+
+def prepare_database(seed_posts):
+    """Migra la base temporal, crea el usuario de la prueba y siembra posts."""
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from core.application.engines import get_engine
+    from core.application.post_service import bulk_create_posts
+
+    call_command('migrate', verbosity=0)
+    author = User.objects.create_user(USERNAME, password=PASSWORD)
+
+    engine = get_engine()
+    rng = random.Random(7)
+    for offset in range(0, seed_posts, 200):
+        contents = [
+            f"{rng.choice(SAMPLE_TEXTS)} #{i}"
+            for i in range(offset, min(offset + 200, seed_posts))
+        ]
+        bulk_create_posts(contents, author, engine.analyze_batch(contents))
+
+
+def start_server(env, log_path):
+    log = open(log_path, 'w')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'sentimind.wsgi:application', '-c', 'gunicorn.conf.py'],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    return process, log
+
+
+def wait_until_up(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("gunicorn termino antes de aceptar peticiones (ver log del servidor)")
+        try:
+            with urllib.request.urlopen(f"{base_url}/", timeout=2):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.25)
+    raise SystemExit(f"gunicorn no respondio en {timeout}s")
+
+
+# ---------------------------------------------------------------------------
+# Cliente
+# ---------------------------------------------------------------------------
+
+class Client:
+    def __init__(self, base_url, bulk_size):
+        self.base_url = base_url
+        self.bulk_size = bulk_size
+        token = base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode()
+        self.auth_header = f"Basic {token}"
+
+    def request(self, method, path, body=None, content_type='application/json', auth=False):
+        """Retorna (status, latencia_ms, consultas SQL o None)."""
+        headers = {'Accept': 'application/json'}
+        data = None
+        if body is not None:
+            data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = content_type
+        if auth:
+            headers['Authorization'] = self.auth_header
+
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                status, queries = response.status, response.headers.get('X-DB-Queries')
+        except urllib.error.HTTPError as e:
+            e.read()
+            status, queries = e.code, e.headers.get('X-DB-Queries')
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            status, queries = 0, None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return status, elapsed_ms, int(queries) if queries is not None else None
+
+
+def op_feed(client, rng, categories):
+    return client.request('GET', '/api/posts/')
+
+
+def op_feed_category(client, rng, categories):
+    return client.request('GET', '/api/posts/?' + urllib.parse.urlencode({'category': rng.choice(categories)}))
+
+
+def op_feed_primary(client, rng, categories):
+    return client.request('GET', '/api/posts/?' + urllib.parse.urlencode({'primary_category': rng.choice(categories)}))
+
+
+def op_categories(client, rng, categories):
+    return client.request('GET', '/api/categories/')
+
+
+def op_create(client, rng, categories):
+    content = f"{rng.choice(SAMPLE_TEXTS)} ({rng.randrange(10**9)})"
+    return client.request('POST', '/api/posts/', {'content': content})
+
+
+def op_bulk(client, rng, categories):
+    lines = "\n".join(
+        json.dumps({'content': f"{rng.choice(SAMPLE_TEXTS)} ({rng.randrange(10**9)})"})
+        for _ in range(client.bulk_size)
+    )
+    return client.request(
+        'POST', '/api/posts/bulk/', lines.encode('utf-8'),
+        content_type='application/x-ndjson', auth=True
+    )
+
+
+OPERATIONS = {
+    'feed': op_feed,
+    'feed_category': op_feed_category,
+    'feed_primary': op_feed_primary,
+    'categories': op_categories,
+    'create': op_create,
+    'bulk': op_bulk,
+}
+
+
+class Recorder:
+    """Acumula (status, latencia, consultas) por operacion."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {name: [] for name in OPERATIONS}
+
+    def add(self, name, sample):
+        with self._lock:
+            self.samples[name].append(sample)
+
+
+def run_load(client, mix, concurrency, duration, max_requests, categories):
+    recorder = Recorder()
+    names, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+    issued = [0]
+    issued_lock = threading.Lock()
+
+    def user(seed):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            if max_requests:
+                with issued_lock:
+                    if issued[0] >= max_requests:
+                        return
+                    issued[0] += 1
+            name = rng.choices(names, weights=weights)[0]
+            recorder.add(name, OPERATIONS[name](client, rng, categories))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(user, seed) for seed in range(concurrency)]:
+            future.result()
+    return recorder, time.perf_counter() - started
+
+
+# ---------------------------------------------------------------------------
+# Reporte
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def histogram(latencies):
+    counts = {f"<={limit}ms": 0 for limit in BUCKETS_MS}
+    counts[f">{BUCKETS_MS[-1]}ms"] = 0
+    for value in latencies:
+        for limit in BUCKETS_MS:
+            if value <= limit:
+                counts[f"<={limit}ms"] += 1
+                break
+        else:
+            counts[f">{BUCKETS_MS[-1]}ms"] += 1
+    return counts
+
+
+def summarize(recorder, elapsed):
+    report = {}
+    for name, samples in recorder.samples.items():
+        if not samples:
+            continue
+        latencies = sorted(latency for _, latency, _ in samples)
+        errors = sum(1 for status, _, _ in samples if status == 0 or status >= 400)
+        queries = [q for _, _, q in samples if q is not None]
+        statuses = {}
+        for status, _, _ in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        report[name] = {
+            'requests': len(samples),
+            'requests_per_second': round(len(samples) / elapsed, 2),
+            'errors': errors,
+            'error_rate': round(errors / len(samples), 4),
+            'status_codes': statuses,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2),
+            'avg_queries': round(sum(queries) / len(queries), 2) if queries else None,
+            'max_queries': max(queries) if queries else None,
+            'histogram': histogram(latencies),
+        }
+    return report
+
+
+def print_report(report, elapsed):
+    total = sum(stats['requests'] for stats in report.values())
+    print("=" * 96)
+    print(f"{'Operacion':15s} {'Peticiones':>10s} {'req/s':>8s} {'Errores':>8s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s} {'SQL prom':>9s}")
+    print("=" * 96)
+    for name, stats in report.items():
+        avg_queries = f"{stats['avg_queries']:.1f}" if stats['avg_queries'] is not None else '-'
+        print(f"{name:15s} {stats['requests']:10d} {stats['requests_per_second']:8.1f} "
+              f"{stats['error_rate']:7.1%} {stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f} "
+              f"{stats['p99_ms']:8.1f} {stats['max_ms']:8.1f} {avg_queries:>9s}")
+    print(f"\nTotal: {total} peticiones en {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+
+    print("\nHistograma de latencias:")
+    for name, stats in report.items():
+        buckets = "  ".join(f"{bucket}:{count}" for bucket, count in stats['histogram'].items() if count)
+        print(f"   {name:15s} {buckets}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP de la API de posts")
+    parser.add_argument('--workers', type=int, default=2, help="Workers de gunicorn")
+    parser.add_argument('--threads', type=int, default=2, help="Hilos por worker de gunicorn")
+    parser.add_argument('--concurrency', type=int, default=8, help="Usuarios concurrentes")
+    parser.add_argument('--duration', type=float, default=20, help="Duracion en segundos")
+    parser.add_argument('--requests', type=int, default=0, help="Tope de peticiones (0 = sin tope)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="Pesos por operacion")
+    parser.add_argument('--bulk-size', type=int, default=20, help="Posts por peticion de ingesta masiva")
+    parser.add_argument('--seed-posts', type=int, default=2000, help="Posts iniciales en la base")
+    parser.add_argument('--engine', default='stub', choices=['stub', 'nli', 'embedding'])
+    parser.add_argument('--stub-latency-ms', type=float, default=0, help="Latencia simulada por texto del motor stub")
+    parser.add_argument('--write-queue', action='store_true', help="Escrituras por el hilo escritor (DB_WRITE_QUEUE)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', default='benchmark_results/loadtest.json')
+    parser.add_argument('--keep-db', action='store_true', help="No borrar la base temporal al terminar")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    tmp_dir = tempfile.mkdtemp(prefix='sentimind-load-')
+    db_path = os.path.join(tmp_dir, 'load.sqlite3')
+    log_path = os.path.join(tmp_dir, 'gunicorn.log')
+    env = server_env(args, db_path)
+    # La siembra usa la misma base y el mismo motor que el servidor
+    os.environ.update({key: env[key] for key in ('SQLITE_PATH', 'SCORING_MODE', 'STUB_ENGINE_LATENCY_MS')})
+
+    print(f"Base temporal: {db_path}")
+    print(f"Sembrando {args.seed_posts} posts (motor {args.engine})...")
+    prepare_database(args.seed_posts)
+
+    from core.application.ai_service import MiningEngine
+    categories = MiningEngine.TAXONOMY
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"Arrancando gunicorn ({args.workers} workers x {args.threads} hilos) en {base_url}")
+    process, log = start_server(env, log_path)
+    try:
+        wait_until_up(base_url, process)
+        print(f"Carga: {args.concurrency} usuarios durante {args.duration:.0f}s, mezcla {mix}")
+        client = Client(base_url, args.bulk_size)
+        recorder, elapsed = run_load(
+            client, mix, args.concurrency, args.duration, args.requests, categories
+        )
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        log.close()
+
+    report = summarize(recorder, elapsed)
+    print_report(report, elapsed)
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'workers': args.workers, 'threads': args.threads,
+            'concurrency': args.concurrency, 'duration': args.duration,
+            'engine': args.engine, 'stub_latency_ms': args.stub_latency_ms,
+            'mix': mix, 'bulk_size': args.bulk_size, 'seed_posts': args.seed_posts,
+            'write_queue': args.write_queue,
+        },
+        'elapsed_seconds': round(elapsed, 2),
+        'endpoints': report,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados guardados: {args.output}")
+
+    if args.keep_db:
+        print(f"Base y log del servidor conservados en {tmp_dir}")
+    else:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
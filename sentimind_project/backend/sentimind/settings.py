@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from sentimind.database import is_server_url, replica_databases, server_database, sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -107,9 +109,125 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Tamaño de pagina por defecto del feed (PostCursorPagination)
+FEED_PAGE_SIZE = int(os.environ.get('PAGE_SIZE', '20'))
+
+# Feed serializado desde filas .values() y renderizado con orjson (si esta
+# instalado), con el mismo JSON que PostSerializer; False usa PostSerializer
+FEED_FAST_SERIALIZER = os.environ.get('FEED_FAST_SERIALIZER', 'True').lower() in ('true', '1', 'yes')
+
+# Cache de respuestas del feed con ETag (core.application.feed_cache): las
+# escrituras invalidan solo el feed completo y las categorias afectadas.
+# Con varios workers (o ASYNC_CLASSIFICATION) exige CACHE_BACKEND=file para
+# compartir las invalidaciones: gunicorn no arranca con locmem
+FEED_CACHE = os.environ.get('FEED_CACHE', 'False').lower() in ('true', '1', 'yes')
+FEED_CACHE_TTL = int(os.environ.get('FEED_CACHE_TTL', '300'))
+
 # JWT Configuration
 
 
+# Inferencia (MiningEngine)
+# Motor de clasificacion: nli (zero-shot XLM-RoBERTa, 12 pasadas por texto)
+# | embedding (bi-encoder con hipotesis precalculadas, 1 pasada por texto)
+# | stub (scores deterministas sin modelo, para pruebas de carga)
+# | cascade (lexico primero; solo los textos dudosos pasan por el modelo)
+SCORING_MODE = os.environ.get('SCORING_MODE', 'nli').lower()
+
+# Warm-up del modelo al arrancar cada worker: off | background | blocking | preload
+# (entrypoint.sh lo activa solo para gunicorn, no para migrate/collectstatic;
+# gunicorn.conf.py fija 'preload' cuando SHARED_MODEL esta activo)
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', 'off').lower()
+
+# Registro de modelos zero-shot (JSON {nombre: spec}, ver core.application.model_registry);
+# sin archivo: XLM-RoBERTa con BART como respaldo. ACTIVE_MODEL elige el inicial
+# y cada worker consulta el modelo elegido con activate_model cada
+# MODEL_SWITCH_POLL_SECONDS (0 desactiva la consulta)
+MODEL_REGISTRY_FILE = os.environ.get('MODEL_REGISTRY_FILE', '')
+ACTIVE_MODEL = os.environ.get('ACTIVE_MODEL', '')
+MODEL_SWITCH_POLL_SECONDS = float(os.environ.get('MODEL_SWITCH_POLL_SECONDS', '10'))
+
+# Artefactos locales de modelos (python manage.py bundle_model). Con MODEL_OFFLINE
+# los modelos solo se cargan desde ahi y el hub de Hugging Face no se consulta
+MODEL_ARTIFACTS_DIR = os.environ.get('MODEL_ARTIFACTS_DIR', str(BASE_DIR / 'model_artifacts'))
+MODEL_OFFLINE = os.environ.get('MODEL_OFFLINE', 'False').lower() in ('true', '1', 'yes')
+if MODEL_OFFLINE:
+    os.environ.setdefault('HF_HUB_OFFLINE', '1')
+    os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+# Micro-batching: agrupa los analisis concurrentes de un worker en un solo forward
+INFERENCE_BATCHING = os.environ.get('INFERENCE_BATCHING', 'False').lower() in ('true', '1', 'yes')
+INFERENCE_BATCH_MAX_SIZE = int(os.environ.get('INFERENCE_BATCH_MAX_SIZE', '8'))
+INFERENCE_BATCH_MAX_WAIT_MS = float(os.environ.get('INFERENCE_BATCH_MAX_WAIT_MS', '25'))
+
+# Cache de clasificacion por contenido: LRU en memoria (0 la desactiva) y,
+# opcionalmente, una tabla en la base de datos compartida por todos los workers
+CLASSIFICATION_CACHE_SIZE = int(os.environ.get('CLASSIFICATION_CACHE_SIZE', '2048'))
+CLASSIFICATION_CACHE_PERSISTENT = os.environ.get('CLASSIFICATION_CACHE_PERSISTENT', 'False').lower() in ('true', '1', 'yes')
+
+# Clasificacion asincrona: el POST guarda el post como 'pending' y el worker
+# (python manage.py process_classification_jobs) completa la clasificacion
+ASYNC_CLASSIFICATION = os.environ.get('ASYNC_CLASSIFICATION', 'False').lower() in ('true', '1', 'yes')
+CLASSIFICATION_WORKER_BATCH_SIZE = int(os.environ.get('CLASSIFICATION_WORKER_BATCH_SIZE', '16'))
+CLASSIFICATION_WORKER_POLL_SECONDS = float(os.environ.get('CLASSIFICATION_WORKER_POLL_SECONDS', '1'))
+CLASSIFICATION_WORKER_MAX_ATTEMPTS = int(os.environ.get('CLASSIFICATION_WORKER_MAX_ATTEMPTS', '3'))
+
+# Ingesta masiva (POST /api/posts/bulk/ y python manage.py import_posts)
+BULK_INGEST_BATCH_SIZE = int(os.environ.get('BULK_INGEST_BATCH_SIZE', '64'))
+BULK_INGEST_MAX_ITEMS = int(os.environ.get('BULK_INGEST_MAX_ITEMS', '10000'))
+
+# Exportacion en streaming (GET /api/posts/export/ y python manage.py export_posts):
+# posts leidos por chunk con .iterator(), memoria constante
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '2000'))
+
+# Cabecera X-DB-Queries con el numero de consultas SQL de cada peticion
+# (loadtest.py la usa para detectar regresiones de N+1)
+QUERY_COUNT_HEADER = os.environ.get('QUERY_COUNT_HEADER', 'False').lower() in ('true', '1', 'yes')
+if QUERY_COUNT_HEADER:
+    MIDDLEWARE.insert(0, 'core.infrastructure.middleware.QueryCountMiddleware')
+
+# Metricas por etapa (tokenizacion, forward, post-proceso, BD, serializacion)
+# expuestas en /metrics; SERVER_TIMING_HEADER las agrega a cada respuesta.
+# /metrics publica modelos, latencias y colas del worker: desactivado por
+# defecto y, con METRICS_TOKEN, solo con "Authorization: Bearer <token>"
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False').lower() in ('true', '1', 'yes')
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'False').lower() in ('true', '1', 'yes')
+if METRICS_ENABLED or SERVER_TIMING_HEADER:
+    MIDDLEWARE.insert(0, 'core.infrastructure.middleware.MetricsMiddleware')
+
+# Logging estructurado: un JSON por linea (LOG_FORMAT=text para desarrollo),
+# escrito a stdout desde un hilo QueueListener y no desde la peticion.
+# LOG_TEXT_SAMPLE_RATE: fraccion de textos analizados que se registran (DEBUG)
+# LOG_REQUEST_SAMPLE_RATE: fraccion de peticiones registradas (los 5xx siempre)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+LOG_REQUEST_SAMPLE_RATE = float(os.environ.get('LOG_REQUEST_SAMPLE_RATE', '1.0'))
+
+# X-Request-ID: la mas externa, para que todos los logs lleven el request id
+MIDDLEWARE.insert(0, 'core.infrastructure.middleware.RequestIdMiddleware')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'core.infrastructure.structured_logging.RequestIdFilter'},
+    },
+    'handlers': {
+        'async': {
+            '()': 'core.infrastructure.structured_logging.AsyncQueueHandler',
+            'log_format': LOG_FORMAT,
+            'max_size': LOG_QUEUE_SIZE,
+            'filters': ['request_id'],
+        },
+    },
+    'root': {'handlers': ['async'], 'level': LOG_LEVEL},
+    'loggers': {
+        'django': {'handlers': ['async'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+
 ROOT_URLCONF = 'sentimind.urls'
 
 TEMPLATES = [
@@ -137,12 +255,48 @@ WSGI_APPLICATION = 'sentimind.wsgi.application'
 DATA_DIR = BASE_DIR / 'data'
 DATA_DIR.mkdir(exist_ok=True)
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': DATA_DIR / 'db.sqlite3',
+# DATABASE_URL (postgres://...): servidor compartido por varios contenedores,
+# con pool de conexiones por worker (DB_POOL_*). Sin ella, SQLite con WAL,
+# synchronous=NORMAL, mmap, cache y busy timeout en cada conexion (ver
+# sentimind/database.py; SQLITE_TUNING=False vuelve a los valores de SQLite).
+# SQLITE_PATH fuerza SQLite en otra base (benchmarks, pruebas de carga)
+DATABASE_URL = os.environ.get('DATABASE_URL', '')
+if is_server_url(DATABASE_URL) and not os.environ.get('SQLITE_PATH'):
+    DATABASES = {'default': server_database(DATABASE_URL)}
+    # Replicas de solo lectura para el feed (GET /api/posts/)
+    DATABASES.update(replica_databases(os.environ.get('DATABASE_REPLICA_URLS', '')))
+else:
+    DATABASES = {
+        'default': sqlite_database(os.environ.get('SQLITE_PATH', DATA_DIR / 'db.sqlite3')),
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.infrastructure.db_router.ReplicaRouter'] if DATABASE_REPLICAS else []
+
+# Todas las escrituras de posts pasan por un unico hilo escritor por worker
+# (core.application.db_writer): los hilos de peticion nunca esperan el lock
+# de escritura de SQLite entre si (sin efecto util con DATABASE_URL)
+DB_WRITE_QUEUE = os.environ.get('DB_WRITE_QUEUE', 'False').lower() in ('true', '1', 'yes')
+
+# Cache de Django: locmem (por proceso) | file (compartida por los procesos del nodo)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem').lower()
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '5000'))
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(DATA_DIR / 'cache')),
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sentimind',
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
     }
-}
 
 
 # Password validation
@@ -14,9 +14,12 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import hmac
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, Http404
 
 
 def health_check(request):
@@ -24,8 +27,54 @@ def health_check(request):
     return JsonResponse({"status": "ok", "message": "SentiMind API is running"})
 
 
+def readiness_check(request):
+    """Readiness endpoint: 503 hasta que el modelo del worker este cargado y caliente"""
+    from core.application.engines import get_engine
+
+    if settings.MODEL_WARMUP == 'off':
+        return JsonResponse({"status": "ready", "warmup": "disabled"})
+
+    state = get_engine().readiness()
+    if state["ready"]:
+        return JsonResponse({"status": "ready", **state})
+    return JsonResponse(
+        {"status": "error" if state["error"] else "warming_up", **state},
+        status=503
+    )
+
+
+def metrics(request):
+    """Metricas del worker en formato de texto de Prometheus"""
+    from core.application.classification import inference_stats
+    from core.application.db_writer import DatabaseWriter
+    from core.application.feed_cache import FeedCache
+    from core.application.metrics import MetricsRegistry
+
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+
+    gauges = {}
+    for group, stats in inference_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (bool, int, float)):
+                gauges[f"sentimind_inference_{group}_{key}"] = int(value) if isinstance(value, bool) else value
+    for key, value in DatabaseWriter.stats().items():
+        gauges[f"sentimind_db_writer_{key}"] = value
+    feed_cache = FeedCache.get_instance()
+    if feed_cache is not None:
+        for key, value in feed_cache.stats().items():
+            gauges[f"sentimind_feed_cache_{key}"] = value
+    body = MetricsRegistry.get_instance().render(gauges)
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 urlpatterns = [
     path('', health_check, name='health-check'),
+    path('ready/', readiness_check, name='readiness-check'),
+    path('metrics', metrics, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
 ]
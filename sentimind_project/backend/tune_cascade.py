@@ -0,0 +1,160 @@
+"""
+Ajuste de umbrales de la cascada lexico -> modelo (SCORING_MODE=cascade).
+
+Para cada etiqueta elige el umbral mas bajo con el que las respuestas del
+lexico alcanzan la accuracy objetivo sobre el dataset de evaluacion. Las
+etiquetas que no la alcanzan (o con menos de --min-support aciertos
+posibles) nunca responden desde el lexico.
+
+Uso:
+    uv run python tune_cascade.py --target-accuracy 0.95
+    uv run python tune_cascade.py --dataset posts.csv --predictions evaluation_results/predictions.jsonl
+
+--predictions es el checkpoint de evaluate_model.py --dataset (ejecutado con
+SCORING_MODE=nli): con el, la accuracy de extremo a extremo de la cascada se
+estima sin volver a ejecutar el modelo.
+
+Genera evaluation_results/cascade_thresholds.json, que se usa con
+CASCADE_THRESHOLDS_FILE.
+"""
+import sys
+import os
+import argparse
+import json
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentimind.settings')
+
+import django
+django.setup()
+
+from core.application.lexicon import LexiconScorer
+from evaluate_model import EVALUATION_DATASET, iter_dataset, _iter_checkpoint
+
+
+# Umbral que el lexico nunca alcanza (sus scores son < 1)
+NEVER = 1.01
+
+
+def score_rows(rows):
+    """[(indice, etiqueta, etiqueta del lexico, score del lexico)]"""
+    scored = []
+    for index, text, label in rows:
+        ranked = LexiconScorer.score(text)
+        scored.append((index, label, ranked["labels"][0], ranked["scores"][0]))
+    return scored
+
+
+def tune(scored, target_accuracy, min_support):
+    """Umbral por etiqueta: el mas bajo cuyas respuestas alcanzan target_accuracy."""
+    thresholds = {}
+    by_label = {}
+    for _, label, predicted, score in scored:
+        if score > 0:
+            by_label.setdefault(predicted, []).append((score, predicted == label))
+
+    for predicted, answers in sorted(by_label.items()):
+        threshold = NEVER
+        for candidate in sorted({score for score, _ in answers}):
+            answered = [correct for score, correct in answers if score >= candidate]
+            if len(answered) < min_support:
+                break
+            if sum(answered) / len(answered) >= target_accuracy:
+                threshold = candidate
+                break
+        thresholds[predicted] = threshold
+    return thresholds
+
+
+def summarize(scored, thresholds, predictions=None):
+    """Cobertura y accuracy del lexico; con predictions, tambien de la cascada completa."""
+    answered = [
+        (label, predicted) for _, label, predicted, score in scored
+        if score > 0 and score >= thresholds.get(predicted, NEVER)
+    ]
+    summary = {
+        "texts": len(scored),
+        "lexicon_answered": len(answered),
+        "coverage": round(len(answered) / len(scored), 4) if scored else 0.0,
+        "lexicon_accuracy": (
+            round(sum(label == predicted for label, predicted in answered) / len(answered), 4)
+            if answered else None
+        ),
+    }
+    if predictions is None:
+        return summary
+
+    correct = model_correct = evaluated = 0
+    for index, label, predicted, score in scored:
+        model_prediction = predictions.get(index)
+        if model_prediction is None:
+            continue
+        evaluated += 1
+        model_correct += model_prediction == label
+        if score > 0 and score >= thresholds.get(predicted, NEVER):
+            correct += predicted == label
+        else:
+            correct += model_prediction == label
+    summary.update({
+        "evaluated_with_model": evaluated,
+        "model_accuracy": round(model_correct / evaluated, 4) if evaluated else None,
+        "cascade_accuracy": round(correct / evaluated, 4) if evaluated else None,
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste de umbrales de la cascada lexico -> modelo")
+    parser.add_argument('--dataset', help="Dataset etiquetado CSV o JSONL (en lugar de EVALUATION_DATASET)")
+    parser.add_argument('--text-field', default='text', help="Columna/campo con el texto")
+    parser.add_argument('--label-field', default='label', help="Columna/campo con la etiqueta esperada")
+    parser.add_argument('--predictions', help="Checkpoint JSONL de evaluate_model.py con las predicciones del modelo")
+    parser.add_argument('--target-accuracy', type=float, default=0.95, help="Accuracy minima de las respuestas del lexico")
+    parser.add_argument('--min-support', type=int, default=3, help="Respuestas minimas para fijar el umbral de una etiqueta")
+    parser.add_argument('--output', default='evaluation_results/cascade_thresholds.json')
+    args = parser.parse_args()
+
+    if args.dataset:
+        rows = iter_dataset(args.dataset, args.text_field, args.label_field)
+    else:
+        rows = ((index, text, label) for index, (text, label) in enumerate(EVALUATION_DATASET))
+    scored = score_rows(rows)
+
+    predictions = None
+    if args.predictions:
+        predictions = {row['index']: row['predicted'] for row in _iter_checkpoint(args.predictions) if 'index' in row}
+
+    thresholds = tune(scored, args.target_accuracy, args.min_support)
+    summary = summarize(scored, thresholds, predictions)
+
+    print("=" * 60)
+    print(f"UMBRALES DE LA CASCADA (accuracy objetivo {args.target_accuracy:.0%})")
+    print("=" * 60)
+    for label, threshold in sorted(thresholds.items()):
+        shown = "nunca" if threshold >= NEVER else f"{threshold:.3f}"
+        print(f"  {label:<14} {shown}")
+    print(f"\nCobertura del lexico: {summary['coverage']:.1%} de {summary['texts']} textos")
+    if summary['lexicon_accuracy'] is not None:
+        print(f"Accuracy del lexico:  {summary['lexicon_accuracy']:.1%}")
+    if summary.get('cascade_accuracy') is not None:
+        print(f"Accuracy del modelo:  {summary['model_accuracy']:.1%}")
+        print(f"Accuracy cascada:     {summary['cascade_accuracy']:.1%} ({summary['evaluated_with_model']} textos)")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            # Las etiquetas sin umbral ajustado nunca responden desde el lexico
+            "default": NEVER,
+            "labels": thresholds,
+            "lexicon_version": LexiconScorer.VERSION,
+            "target_accuracy": args.target_accuracy,
+            "dataset": args.dataset or "EVALUATION_DATASET",
+            "generated_at": datetime.now().isoformat(),
+            "summary": summary,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nUmbrales guardados en {args.output} (CASCADE_THRESHOLDS_FILE)")
+
+
+if __name__ == "__main__":
+    main()
@@ -73,11 +73,18 @@ export interface Post {
   created_at: string;
 }
 
+// Respuesta paginada por cursor de GET /posts/
+export interface PostPage {
+  next: string | null;
+  previous: string | null;
+  results: Post[];
+}
+
 export const postService = {
   async getAll(category: string | null = null): Promise<Post[]> {
     const url = category ? `/posts/?category=${category}` : `/posts/`;
-    const response = await api.get<Post[]>(url);
-    return response.data;
+    const response = await api.get<PostPage>(url);
+    return response.data.results;
   },
 
   async create(content: string): Promise<Post> {